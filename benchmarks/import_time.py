@@ -0,0 +1,65 @@
+"""
+Checks the import time of the pack modules against a budget, so startup regressions are caught.
+
+Run from the repository root:
+
+    python -m benchmarks.import_time [--budget-ms 400] [--repeat 5] [--module src.presentation]
+
+Each module is imported in a fresh interpreter under `python -X importtime` and the best cumulative time of
+`--repeat` runs is compared with the budget. Modules that should only be imported when an input needs them,
+such as pandas, must not be imported at all. Exits with status 1 if any check fails.
+"""
+
+import argparse
+import re
+import subprocess
+import sys
+
+DEFAULT_MODULES = ["src.presentation", "src.template", "src.batch"]
+DEFAULT_BUDGET_MS = 400.0
+
+# Imported lazily, only for inputs that need them
+LAZY_MODULES = ["pandas", "numpy"]
+
+_IMPORT_TIME = re.compile(r"import time:\s+\d+ \|\s+(\d+) \| (\s*)(\S+)")
+
+def import_profile(module: str) -> tuple[float, set[str]]:
+    """Imports a module in a fresh interpreter and returns its cumulative import time in milliseconds and every module imported."""
+
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"], capture_output=True, text=True, check=True,
+    )
+
+    total, imported = 0.0, set()
+    for match in _IMPORT_TIME.finditer(process.stderr):
+        cumulative, indent, name = match.groups()
+        imported.add(name)
+        if name == module and not indent:
+            total = int(cumulative) / 1000
+    return total, imported
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--module", action="append", dest="modules", help="module to check (default: the main pack modules)")
+    args = parser.parse_args()
+
+    failures = []
+    print(f"{'module':>20} {'import (ms)':>12}")
+    for module in args.modules or DEFAULT_MODULES:
+        profiles = [import_profile(module) for _ in range(args.repeat)]
+        best = min(total for total, _ in profiles)
+        print(f"{module:>20} {best:>12.1f}")
+
+        if best > args.budget_ms:
+            failures.append(f"{module} took {best:.1f}ms to import, over the {args.budget_ms:.0f}ms budget")
+        eager = [name for name in LAZY_MODULES if name in profiles[0][1]]
+        if eager:
+            failures.append(f"{module} imports {', '.join(eager)} eagerly")
+
+    if failures:
+        raise SystemExit("\n".join(failures))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+Compares building a pack from images and CSV tables held in memory with writing them to temporary files first.
+
+Run from the repository root:
+
+    python -m benchmarks.memory_inputs [--slides 20] [--megapixels 4] [--repeat 3]
+
+The inputs are generated as bytes, the way a pipeline that renders its own charts and tables holds them. The
+temporary file build writes each one out and passes its path, as callers had to before frames accepted bytes;
+the in-memory builds pass the bytes, a memoryview of them, or a memory-mapped file. Time and peak traced memory
+are reported for each.
+"""
+
+import argparse
+import io
+import json
+import mmap
+import os
+import tempfile
+import time
+import tracemalloc
+
+from typing import Callable, Dict
+
+import numpy as np
+
+from PIL import Image
+from pptx.dml.color import RGBColor
+
+from src.frame.new import NewSlide
+from src.frame.title import TitleSlide
+from src.helper.json_helpers import BulletPointStore
+from src.presentation import BriefingPack
+
+CELL_COLOURS = [RGBColor(255, 0, 0), RGBColor(255, 128, 0), RGBColor(255, 255, 0)]
+
+def make_inputs(slides: int, megapixels: float) -> Dict[str, bytes]:
+    """One PNG image and one CSV table per slide, as bytes."""
+
+    side = int((megapixels * 1_000_000) ** 0.5)
+    inputs = {}
+    for i in range(slides):
+        pixels = np.random.default_rng(i).integers(0, 255, (side, side, 3), dtype=np.uint8)
+        image = io.BytesIO()
+        Image.fromarray(pixels).save(image, "PNG", compress_level=1)
+        inputs[f"image{i}.png"] = image.getvalue()
+
+        rows = "\n".join(f"Item {row},{row * i},{row / 7:.3f}" for row in range(8))
+        inputs[f"table{i}.csv"] = f"Name,Value,Share\n{rows}\n".encode("utf-8")
+    return inputs
+
+def build(store: BulletPointStore, slides: int, source: Callable[[str], object]) -> bytes:
+    briefing_pack = BriefingPack("REF", "OFFICIAL", "bench", "bench")
+    briefing_pack.add_frame(TitleSlide("Title", "1 Jan", source("image0.png")))
+    for i in range(slides):
+        briefing_pack.add_frame(NewSlide(f"Slide {i}", "Table", source(f"table{i}.csv"), CELL_COLOURS, "points", "points", "points", source(f"image{i}.png"), store))
+    return briefing_pack.save()
+
+def via_temp_files(store: BulletPointStore, inputs: Dict[str, bytes], slides: int) -> bytes:
+    with tempfile.TemporaryDirectory() as directory:
+        for name, data in inputs.items():
+            with open(os.path.join(directory, name), 'wb') as file:
+                file.write(data)
+        return build(store, slides, lambda name: os.path.join(directory, name))
+
+def via_mmap(store: BulletPointStore, inputs: Dict[str, bytes], slides: int) -> bytes:
+    with tempfile.TemporaryFile() as file:
+        offsets = {}
+        for name, data in inputs.items():
+            offsets[name] = (file.tell(), len(data))
+            file.write(data)
+        file.flush()
+
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            with memoryview(mapped) as view:
+                blob = build(store, slides, lambda name: view[offsets[name][0]:sum(offsets[name])])
+        return blob
+
+def measure(run: Callable[..., bytes], store: BulletPointStore, inputs: Dict[str, bytes], slides: int, repeat: int) -> tuple[float, int, int]:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run(store, inputs, slides)
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    blob = run(store, inputs, slides)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return best, peak, len(blob)
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--slides", type=int, default=20)
+    parser.add_argument("--megapixels", type=float, default=4)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    inputs = make_inputs(args.slides, args.megapixels)
+    print(f"{len(inputs)} inputs, {sum(map(len, inputs.values())) / 2**20:.1f} MB")
+
+    runs = {
+        "temp files": via_temp_files,
+        "bytes": lambda store, inputs, slides: build(store, slides, inputs.__getitem__),
+        "memoryview": lambda store, inputs, slides: build(store, slides, lambda name: memoryview(inputs[name])),
+        "mmap": via_mmap,
+    }
+
+    # Bullet points come from the same JSON file in every build, so only the images and tables differ
+    with tempfile.TemporaryDirectory() as directory:
+        store_path = os.path.join(directory, "bullet_points.json")
+        with open(store_path, 'w') as file:
+            json.dump({"points": ["A point describing the scenario in a sentence or two."]}, file)
+        store = BulletPointStore(store_path)
+
+        print(f"{'inputs':>12} {'time (s)':>9} {'peak (MB)':>10} {'pack (MB)':>10}")
+        for name, run in runs.items():
+            elapsed, peak, size = measure(run, store, inputs, args.slides, args.repeat)
+            print(f"{name:>12} {elapsed:>9.3f} {peak / 2**20:>10.1f} {size / 2**20:>10.1f}")
+
+if __name__ == "__main__":
+    main()
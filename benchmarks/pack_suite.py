@@ -0,0 +1,307 @@
+"""
+Times each stage of building a briefing pack on synthetic inputs and checks the results against a baseline.
+
+Run from the repository root:
+
+    python -m benchmarks.pack_suite [--repeat 5] [--output results.json] [--baseline benchmarks/pack_suite_baseline.json]
+    python -m benchmarks.pack_suite --update-baseline
+
+Inputs are generated into a temporary directory: CSV tables from 5 to 5,000 rows, bullet point JSON with
+nested lists, and images at several resolutions. `TitleSlide`, `NewSlide` and `SummarySlide` slide building
+(including `NewSlide` with its table auto-fitted to its content, and with a native chart in place of its image),
+`add_slide_template`, `number_slides`, `save` and a 60-slide pack added serially and in parallel (on
+`PARALLEL_WORKERS` processes, whatever the CPU count) are timed separately. Every case records its best and median
+time, the peak memory Python allocated while it ran (from tracemalloc, in a separate untimed run) and the size
+of the saved pack.
+
+With a baseline, a case fails if its best time grows by more than `--time-threshold`, its peak memory by more
+than `--memory-threshold` or its output by more than `--size-threshold` (all relative). Cases the baseline
+timed at under `SHORT_CASE_S` are noisier, so their times are held to `--short-time-threshold` instead. Exits
+with status 1 if any case fails. The baseline records the machine it was run on (Python and python-pptx
+versions, platform and CPU count); timings are only comparable on the same machine, so they are not compared
+when that context differs, though memory and output size still are.
+"""
+
+import argparse
+import csv
+import json
+import os
+import platform
+import statistics
+import tempfile
+import time
+import tracemalloc
+
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+import pptx
+
+from PIL import Image
+from pptx.dml.color import RGBColor
+
+from src.frame.new import NewSlide
+from src.frame.summary import SummarySlide
+from src.frame.title import TitleSlide
+from src.helper.chart_helpers import ChartSpec
+from src.helper.json_helpers import BulletPointStore
+from src.helper.package_helpers import package_bytes
+from src.presentation import BriefingPack
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "pack_suite_baseline.json")
+
+TABLE_ROWS = [5, 50, 500, 5000]
+BULLET_VOLUMES = {"small": 4, "large": 60}
+IMAGE_SIZES = [(640, 480), (1920, 1080), (4000, 3000)]
+TEMPLATE_SLIDES = 50
+PARALLEL_WORKERS = 2
+SHORT_CASE_S = 0.05
+
+CELL_COLOURS = [RGBColor(255, 0, 0), RGBColor(255, 128, 0), RGBColor(255, 255, 0)]
+
+class Inputs:
+    """Synthetic input files, written once into a directory and shared by every case."""
+
+    def __init__(self, directory: str) -> None:
+        self.directory = directory
+
+        self.tables = {rows: self._write_table(rows) for rows in TABLE_ROWS}
+        self.images = {size: self._write_image(*size) for size in IMAGE_SIZES}
+
+        self.bullet_points_path = os.path.join(directory, "bullet_points.json")
+        with open(self.bullet_points_path, 'w') as file:
+            json.dump({volume: _nested_bullet_points(count) for volume, count in BULLET_VOLUMES.items()}, file)
+        self.store = BulletPointStore(self.bullet_points_path)
+
+    def _write_table(self, rows: int) -> str:
+        path = os.path.join(self.directory, f"table_{rows}.csv")
+        with open(path, 'w', newline="") as file:
+            writer = csv.writer(file)
+            writer.writerow(["Name", "Description", "Value", "Share"])
+            writer.writerows([f"Item {i}", f"Description of item {i}", i * 10, f"{i / 3:.2f}"] for i in range(rows))
+        return path
+
+    def _write_image(self, width: int, height: int) -> str:
+        """Writes a gradient with noise, which compresses roughly like a chart export or photo."""
+
+        rng = np.random.default_rng(width)
+        gradient = np.linspace(0, 200, width, dtype=np.float32)[None, :, None]
+        pixels = (gradient + rng.integers(0, 55, (height, width, 3))).astype(np.uint8)
+
+        path = os.path.join(self.directory, f"image_{width}x{height}.png")
+        Image.fromarray(pixels).save(path)
+        return path
+
+def _nested_bullet_points(count: int) -> List[Any]:
+    """Returns `count` bullet points, every third followed by a nested list of two sub-points."""
+
+    points: List[Any] = []
+    for i in range(count):
+        points.append(f"Bullet point {i} describing part of the scenario in a sentence or so.")
+        if i % 3 == 2:
+            points.append([f"Detail {i}.1 qualifying the point above.", f"Detail {i}.2 with a further caveat."])
+    return points
+
+def _new_pack() -> BriefingPack:
+    return BriefingPack("REF-0001", "OFFICIAL", "bench", "bench")
+
+def _frame_case(frame: Any) -> Callable[[], tuple[Callable[[], Any], BriefingPack]]:
+    """A case that times a frame building its slide, without the header and footer."""
+
+    def setup() -> tuple[Callable[[], Any], BriefingPack]:
+        briefing_pack = _new_pack()
+        return (lambda: frame.add_slide(briefing_pack)), briefing_pack
+    return setup
+
+def _template_case() -> tuple[Callable[[], Any], BriefingPack]:
+    briefing_pack = _new_pack()
+    slides = [briefing_pack.prs.slides.add_slide(briefing_pack.slide_layout) for _ in range(TEMPLATE_SLIDES)]
+
+    def run() -> None:
+        for index, slide in enumerate(slides):
+            briefing_pack.add_slide_template(slide, f"Slide {index}")
+    return run, briefing_pack
+
+def _number_slides_case() -> tuple[Callable[[], Any], BriefingPack]:
+    briefing_pack = _new_pack()
+    for index in range(TEMPLATE_SLIDES):
+        briefing_pack.add_slide_template(briefing_pack.prs.slides.add_slide(briefing_pack.slide_layout), f"Slide {index}")
+    return briefing_pack.number_slides, briefing_pack
+
+def _save_case(inputs: Inputs) -> Callable[[], tuple[Callable[[], Any], Optional[BriefingPack]]]:
+    """A case that times saving a pack of every frame type, with mid-sized tables and images."""
+
+    def setup() -> tuple[Callable[[], Any], Optional[BriefingPack]]:
+        briefing_pack = _new_pack()
+        for frame in _mixed_frames(inputs):
+            briefing_pack.add_frame(frame)
+        return briefing_pack.save, None # save returns the pack's bytes
+    return setup
+
+def _add_frames_case(inputs: Inputs, parallel: bool) -> Callable[[], tuple[Callable[[], Any], Optional[BriefingPack]]]:
+    """A case that times adding every frame type to one pack, one at a time or rendered by `add_frames` on `PARALLEL_WORKERS` processes."""
+
+    def setup() -> tuple[Callable[[], Any], Optional[BriefingPack]]:
+        briefing_pack = _new_pack()
+        frames = _mixed_frames(inputs) * 5
+
+        def run() -> None:
+            if parallel:
+                briefing_pack.add_frames(frames, max_workers = PARALLEL_WORKERS)
+            else:
+                for frame in frames:
+                    briefing_pack.add_frame(frame)
+        return run, briefing_pack
+    return setup
+
+def _mixed_frames(inputs: Inputs) -> List[Any]:
+    image, table = inputs.images[(1920, 1080)], inputs.tables[50]
+    return [
+        TitleSlide("Title", "1 January 2025", image),
+        NewSlide("New", "Table", table, CELL_COLOURS, "small", "small", "small", image, inputs.store),
+        SummarySlide("Summary", "small", "Comments", "Table 1", inputs.tables[5], CELL_COLOURS, "Table 2", inputs.tables[5], CELL_COLOURS, image, image, inputs.store),
+    ] * 4
+
+def build_cases(inputs: Inputs) -> Dict[str, Callable[[], tuple[Callable[[], Any], Optional[BriefingPack]]]]:
+    """
+    Returns every case by name. A case's setup builds whatever it needs untimed and returns the function to time,
+    along with the pack whose saved size is recorded (or None if the timed function returns the bytes itself).
+    """
+
+    image = inputs.images[(1920, 1080)]
+    cases = {}
+
+    for size, path in inputs.images.items():
+        cases[f"title_slide/image={size[0]}x{size[1]}"] = _frame_case(TitleSlide("Title", "1 January 2025", path))
+
+    for rows, path in inputs.tables.items():
+        cases[f"new_slide/rows={rows}"] = _frame_case(NewSlide("New", "Table", path, CELL_COLOURS, "small", "small", "small", image, inputs.store))
+        cases[f"summary_slide/rows={rows}"] = _frame_case(
+            SummarySlide("Summary", "small", "Comments", "Table 1", path, CELL_COLOURS, "Table 2", path, CELL_COLOURS, image, image, inputs.store)
+        )
+        cases[f"new_slide/autofit/rows={rows}"] = _frame_case(
+            NewSlide("New", "Table", path, CELL_COLOURS, "small", "small", "small", image, inputs.store, autofit_table = True)
+        )
+
+    chart = ChartSpec(inputs.tables[50], "bar", series = ("Value",))
+    cases["new_slide/image"] = _frame_case(NewSlide("New", "Table", inputs.tables[5], CELL_COLOURS, "small", "small", "small", image, inputs.store))
+    cases["new_slide/chart"] = _frame_case(NewSlide("New", "Table", inputs.tables[5], CELL_COLOURS, "small", "small", "small", chart, inputs.store))
+
+    for volume in BULLET_VOLUMES:
+        cases[f"new_slide/bullets={volume}"] = _frame_case(NewSlide("New", "Table", inputs.tables[5], CELL_COLOURS, volume, volume, volume, image, inputs.store))
+        cases[f"summary_slide/bullets={volume}"] = _frame_case(
+            SummarySlide("Summary", volume, "Comments", "Table 1", inputs.tables[5], CELL_COLOURS, "Table 2", None, [], image, None, inputs.store)
+        )
+
+    cases[f"add_slide_template/slides={TEMPLATE_SLIDES}"] = _template_case
+    cases[f"number_slides/slides={TEMPLATE_SLIDES}"] = _number_slides_case
+    cases["save/mixed"] = _save_case(inputs)
+    cases["add_frames/serial"] = _add_frames_case(inputs, parallel = False)
+    cases[f"add_frames/workers={PARALLEL_WORKERS}"] = _add_frames_case(inputs, parallel = True)
+    return cases
+
+def run_case(setup: Callable[[], tuple[Callable[[], Any], Optional[BriefingPack]]], repeat: int) -> Dict[str, float]:
+    """Times a case `repeat` times, then runs it once more under tracemalloc for its peak memory."""
+
+    times, output_bytes = [], 0
+    for _ in range(repeat):
+        run, briefing_pack = setup()
+        start = time.perf_counter()
+        result = run()
+        times.append(time.perf_counter() - start)
+        output_bytes = len(result) if briefing_pack is None else len(package_bytes(briefing_pack.prs))
+
+    run, _ = setup()
+    tracemalloc.start()
+    try:
+        run()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    return {"best_s": min(times), "median_s": statistics.median(times), "peak_kb": peak / 1024, "output_kb": output_bytes / 1024}
+
+def environment() -> Dict[str, Any]:
+    """The machine context results are recorded with, which timings are only comparable within."""
+
+    return {"python": platform.python_version(), "python-pptx": pptx.__version__, "platform": platform.platform(), "cpus": os.cpu_count()}
+
+def compare(
+    results: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]], thresholds: Dict[str, float], short_time_threshold: float
+) -> List[str]:
+    """
+    Returns a description of every metric that regressed past its threshold relative to the baseline.
+
+    The time threshold of a case the baseline timed at under `SHORT_CASE_S` is raised to `short_time_threshold`.
+    """
+
+    regressions = []
+    for name, metrics in results.items():
+        if name not in baseline:
+            continue
+        for metric, threshold in thresholds.items():
+            before, after = baseline[name][metric], metrics[metric]
+            if metric == "best_s" and before < SHORT_CASE_S:
+                threshold = max(threshold, short_time_threshold)
+            if before and (after - before) / before > threshold:
+                regressions.append(f"{name}: {metric} {before:.4g} -> {after:.4g} (+{(after - before) / before:.0%}, threshold {threshold:.0%})")
+    return regressions
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--case", action="append", dest="cases", help="only run cases whose name starts with this (repeatable)")
+    parser.add_argument("--output", default=None, help="write the results as JSON to this file")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="baseline JSON to compare against")
+    parser.add_argument("--update-baseline", action="store_true", help="write the results to the baseline instead of comparing")
+    parser.add_argument("--time-threshold", type=float, default=0.25)
+    parser.add_argument("--short-time-threshold", type=float, default=1.0, help=f"time threshold for cases under {SHORT_CASE_S * 1000:.0f} ms")
+    parser.add_argument("--memory-threshold", type=float, default=0.25)
+    parser.add_argument("--size-threshold", type=float, default=0.05)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        cases = build_cases(Inputs(directory))
+        if args.cases:
+            cases = {name: setup for name, setup in cases.items() if name.startswith(tuple(args.cases))}
+
+        results = {}
+        print(f"{'case':>36} {'best (s)':>10} {'median (s)':>11} {'peak (KB)':>10} {'size (KB)':>10}")
+        for name, setup in cases.items():
+            results[name] = run_case(setup, args.repeat)
+            metrics = results[name]
+            print(f"{name:>36} {metrics['best_s']:>10.4f} {metrics['median_s']:>11.4f} {metrics['peak_kb']:>10.0f} {metrics['output_kb']:>10.1f}")
+
+    report = {
+        "environment": environment(),
+        "repeat": args.repeat,
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(report, file, indent=2)
+
+    if args.update_baseline:
+        with open(args.baseline, 'w') as file:
+            json.dump(report, file, indent=2)
+        print(f"Baseline written to {args.baseline}")
+        return
+
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --update-baseline to record one")
+        return
+
+    with open(args.baseline, 'r') as file:
+        baseline = json.load(file)
+
+    thresholds = {"best_s": args.time_threshold, "peak_kb": args.memory_threshold, "output_kb": args.size_threshold}
+    if baseline.get("environment") != report["environment"]:
+        print(f"The baseline was recorded on another machine ({baseline.get('environment')}); not comparing timings")
+        del thresholds["best_s"]
+    regressions = compare(results, baseline["results"], thresholds, args.short_time_threshold)
+    if regressions:
+        raise SystemExit("Regressions against the baseline:\n" + "\n".join(regressions))
+    print(f"No regressions against {args.baseline}")
+
+if __name__ == "__main__":
+    main()
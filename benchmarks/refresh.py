@@ -0,0 +1,122 @@
+"""
+Compares refreshing a saved pack in place with building it again, when only a few values have changed.
+
+Run from the repository root:
+
+    python -m benchmarks.refresh [--slides 40] [--rows 400] [--repeat 3]
+
+A refreshable pack of summary slides and a long paginated table is built and saved. It is then built again, and
+refreshed with unchanged data, with a new value in one summary slide's table and with new metadata. Time and the
+number of slides changed are reported for each, along with how many slides stayed byte-identical in the file.
+"""
+
+import argparse
+import io
+import json
+import os
+import tempfile
+import time
+import zipfile
+
+from typing import Callable, Dict, List
+
+import numpy as np
+import pandas as pd
+
+from PIL import Image
+from pptx.dml.color import RGBColor
+
+from src.frame.base import BaseSlide
+from src.frame.summary import SummarySlide
+from src.frame.table import PaginatedTableSlide
+from src.helper.json_helpers import BulletPointStore
+from src.presentation import BriefingPack
+from src.refresh import refresh_pack
+
+CELL_COLOURS = [RGBColor(255, 0, 0), RGBColor(255, 128, 0), RGBColor(255, 255, 0)]
+METADATA = ("REF", "OFFICIAL", "bench", "bench")
+
+def make_frames(slides: int, rows: int, input_dir: str, changed_value: int = 0) -> List[BaseSlide]:
+    """The pack's frames, with `changed_value` added to one cell of the middle summary slide's table."""
+
+    store = BulletPointStore(os.path.join(input_dir, "bullet_points.json"))
+    long_table = pd.DataFrame({
+        "Region": [f"Region {i % 12}" for i in range(rows)],
+        "Site": [f"Site {i}" for i in range(rows)],
+        "Count": np.arange(rows) * 7 % 1000,
+    })
+
+    frames = []
+    for i in range(slides):
+        table = pd.DataFrame({"Name": [f"Item {row}" for row in range(8)], "Value": [row * 10 + i for row in range(8)]})
+        if i == slides // 2:
+            table.loc[0, "Value"] += changed_value
+        image = os.path.join(input_dir, f"image{i % 2}.png")
+        frames.append(SummarySlide(f"Slide {i}", "summary", "Comments", "Table 1", table, CELL_COLOURS, "Table 2", table, CELL_COLOURS, image, None, store))
+    frames.append(PaginatedTableSlide("Sites", "All sites", long_table, CELL_COLOURS * (rows // 3 + 1)))
+    return frames
+
+def build(frames: List[BaseSlide], metadata: tuple = METADATA) -> bytes:
+    briefing_pack = BriefingPack(*metadata, refreshable = True)
+    for frame in frames:
+        briefing_pack.add_frame(frame)
+    return briefing_pack.save()
+
+def slide_entries(blob: bytes) -> Dict[str, tuple]:
+    """Each slide's stored form in a saved pack: its compression, CRC and compressed size."""
+
+    archive = zipfile.ZipFile(io.BytesIO(blob))
+    return {
+        info.filename: (info.compress_type, info.CRC, info.compress_size)
+        for info in archive.infolist() if info.filename.startswith("ppt/slides/slide")
+    }
+
+def measure(run: Callable[[], tuple], repeat: int) -> tuple:
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = run()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--slides", type=int, default=40)
+    parser.add_argument("--rows", type=int, default=400)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as input_dir:
+        with open(os.path.join(input_dir, "bullet_points.json"), 'w') as file:
+            json.dump({"summary": [f"Summary point {i} describing the scenario in a sentence or two." for i in range(4)]}, file)
+        for i in range(2):
+            pixels = np.random.default_rng(i).integers(0, 255, (300, 400, 3), dtype=np.uint8)
+            Image.fromarray(pixels).save(os.path.join(input_dir, f"image{i}.png"))
+
+        frames = make_frames(args.slides, args.rows, input_dir)
+        changed_frames = make_frames(args.slides, args.rows, input_dir, changed_value = 1)
+        saved = build(frames)
+        new_metadata = ("REF", "OFFICIAL", "bench", "bench-2")
+
+        def refresh(frames: List[BaseSlide], metadata: tuple = METADATA) -> tuple:
+            refreshed_pack = refresh_pack(saved, frames, *metadata)
+            return refreshed_pack.save(), len(refreshed_pack.changed_slides)
+
+        runs = {
+            "full build": lambda: (build(changed_frames), None),
+            "refresh, unchanged": lambda: refresh(frames),
+            "refresh, one value": lambda: refresh(changed_frames),
+            "refresh, metadata": lambda: refresh(frames, new_metadata),
+        }
+
+        saved_slides = slide_entries(saved)
+        print(f"{len(saved_slides)} slides, {len(saved) / 1024:.0f} KB")
+        print(f"{'run':>20} {'time (s)':>9} {'changed':>8} {'identical slides':>17}")
+        for name, run in runs.items():
+            elapsed, (blob, changed) = measure(run, args.repeat)
+            slides = slide_entries(blob)
+            identical = sum(slides.get(name) == entry for name, entry in saved_slides.items())
+            print(f"{name:>20} {elapsed:>9.3f} {'-' if changed is None else changed:>8} {identical:>17}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""
+Compares save time and file size of `BriefingPack.save` across compression settings.
+
+Run from the repository root:
+
+    python -m benchmarks.save_compression [--slides 20] [--repeat 3]
+
+A pack of summary slides with generated tables and images is built once, then saved
+with python-pptx's own writer and with each compression setting, all in memory.
+
+For each setting the time spent deflating parts of at least LARGE_PART_BYTES is also
+reported. `write_package` deflates parts one after another, so this is the most that
+compressing the large parts in parallel could save.
+"""
+
+import argparse
+import io
+import json
+import os
+import tempfile
+import time
+import zipfile
+import zlib
+
+import numpy as np
+import pandas as pd
+
+from PIL import Image
+from pptx.dml.color import RGBColor
+
+from src.frame.summary import SummarySlide
+from src.helper.json_helpers import BulletPointStore
+from src.helper.package_helpers import COMPRESSION_LEVELS, STORED_EXTENSIONS, compression_level, package_bytes, package_members, write_package
+from src.presentation import BriefingPack
+
+CELL_COLOURS = [RGBColor(255, 0, 0), RGBColor(255, 128, 0), RGBColor(255, 255, 0)]
+
+LARGE_PART_BYTES = 64 * 1024
+
+def make_image(path: str, seed: int) -> None:
+    """Writes a noisy 1600x1200 PNG, which compresses about as badly as a real photo or chart export."""
+
+    pixels = np.random.default_rng(seed).integers(0, 255, (1200, 1600, 3), dtype=np.uint8)
+    Image.fromarray(pixels).save(path)
+
+def build_pack(slides: int, input_dir: str) -> BriefingPack:
+    bullet_points_path = os.path.join(input_dir, "bullet_points.json")
+    with open(bullet_points_path, 'w') as file:
+        json.dump({"summary": [f"Summary point {i} describing the scenario in a sentence or two." for i in range(4)]}, file)
+    store = BulletPointStore(bullet_points_path)
+
+    table = pd.DataFrame({
+        "Name": [f"Item {i}" for i in range(8)],
+        "Value": [i * 10 for i in range(8)],
+        "Share": [round(i / 3, 2) for i in range(8)],
+    })
+
+    briefing_pack = BriefingPack("REF", "OFFICIAL", "bench", "bench")
+    for i in range(slides):
+        image = os.path.join(input_dir, f"image{i % 4}.png")
+        briefing_pack.add_frame(SummarySlide(f"Slide {i}", "summary", "Comments", "Table 1", table, CELL_COLOURS, "Table 2", table, CELL_COLOURS, image, None, store))
+
+    briefing_pack.number_slides()
+    return briefing_pack
+
+def time_save(save, repeat: int) -> tuple[float, int]:
+    best, size = float("inf"), 0
+    for _ in range(repeat):
+        stream = io.BytesIO()
+        start = time.perf_counter()
+        save(stream)
+        best = min(best, time.perf_counter() - start)
+        size = len(stream.getvalue())
+    return best, size
+
+def time_large_deflates(members: list[tuple[str, bytes]], compression: str, repeat: int) -> float:
+    """Returns the best time to deflate every large part that `write_package` deflates at a compression setting."""
+
+    level = compression_level(compression)
+    large = [data for name, data in members if len(data) >= LARGE_PART_BYTES and name.rpartition(".")[2].lower() not in STORED_EXTENSIONS]
+    if level is None or not large:
+        return 0.0
+
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for data in large:
+            compressor = zlib.compressobj(level, zlib.DEFLATED, -15)
+            compressor.compress(data)
+            compressor.flush()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--slides", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as input_dir:
+        for i in range(4):
+            make_image(os.path.join(input_dir, f"image{i}.png"), i)
+        briefing_pack = build_pack(args.slides, input_dir)
+
+    results = {"python-pptx": time_save(briefing_pack.prs.save, args.repeat)}
+    deflates = {"python-pptx": None}
+    members = package_members(briefing_pack.prs)
+    for compression in COMPRESSION_LEVELS:
+        results[compression] = time_save(lambda stream: write_package(briefing_pack.prs, stream, compression), args.repeat)
+        deflates[compression] = time_large_deflates(members, compression, args.repeat)
+
+    # Every setting must produce an archive with the same parts as python-pptx
+    reference = io.BytesIO()
+    briefing_pack.prs.save(reference)
+    expected = zipfile.ZipFile(reference)
+    for compression in COMPRESSION_LEVELS:
+        archive = zipfile.ZipFile(io.BytesIO(package_bytes(briefing_pack.prs, compression)))
+        if any(archive.read(name) != expected.read(name) for name in expected.namelist()):
+            raise SystemExit(f"Compression {compression} produced different parts")
+
+    print(f"{'setting':>12} {'save (s)':>10} {'size (KB)':>10} {'large deflate (s)':>18}")
+    for setting, (seconds, size) in results.items():
+        deflate = "" if deflates[setting] is None else f"{deflates[setting]:.4f}"
+        print(f"{setting:>12} {seconds:>10.4f} {size / 1024:>10.1f} {deflate:>18}")
+
+if __name__ == "__main__":
+    main()
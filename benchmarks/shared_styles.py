@@ -0,0 +1,125 @@
+"""
+Compares packs written with and without shared styles: slide XML size, file size and build, save, open and resave time.
+
+Run from the repository root:
+
+    python -m benchmarks.shared_styles [--slides 20] [--rows 400] [--repeat 3]
+
+A pack of summary slides and a long paginated table is built with explicit formatting on every cell and run,
+then with `BriefingPack(shared_styles=True)`, and each is saved to memory and opened again with python-pptx. The
+opened pack is then saved again, as a refreshed pack is, after checking it still has the shared styles it was built
+with. Save and open times are also reported relative to explicit formatting.
+"""
+
+import argparse
+import io
+import json
+import os
+import tempfile
+import time
+import zipfile
+
+import numpy as np
+import pandas as pd
+
+from PIL import Image
+from pptx import Presentation
+from pptx.dml.color import RGBColor
+
+from src.frame.summary import SummarySlide
+from src.frame.table import PaginatedTableSlide
+from src.helper.json_helpers import BulletPointStore
+from src.helper.package_helpers import package_bytes
+from src.helper.style_helpers import shared_font_size
+from src.presentation import BriefingPack
+
+CELL_COLOURS = [RGBColor(255, 0, 0), RGBColor(255, 128, 0), RGBColor(255, 255, 0)]
+
+def build_pack(slides: int, rows: int, input_dir: str, shared_styles: bool) -> BriefingPack:
+    store = BulletPointStore(os.path.join(input_dir, "bullet_points.json"))
+    table = pd.DataFrame({
+        "Name": [f"Item {i}" for i in range(8)],
+        "Value": [i * 10 for i in range(8)],
+        "Share": [round(i / 3, 2) for i in range(8)],
+    })
+    long_table = pd.DataFrame({
+        "Region": [f"Region {i % 12}" for i in range(rows)],
+        "Site": [f"Site {i}" for i in range(rows)],
+        "Count": np.arange(rows) * 7 % 1000,
+        "Rate": np.round(np.arange(rows) / rows, 3),
+    })
+
+    briefing_pack = BriefingPack("REF", "OFFICIAL", "bench", "bench", shared_styles = shared_styles)
+    for i in range(slides):
+        image = os.path.join(input_dir, f"image{i % 2}.png")
+        briefing_pack.add_frame(SummarySlide(f"Slide {i}", "summary", "Comments", "Table 1", table, CELL_COLOURS, "Table 2", table, CELL_COLOURS, image, None, store))
+    briefing_pack.add_frame(PaginatedTableSlide("Sites", "All sites", long_table, CELL_COLOURS * (rows // 3 + 1)))
+
+    briefing_pack.number_slides()
+    return briefing_pack
+
+def slide_xml_bytes(blob: bytes) -> int:
+    """The uncompressed size of the slide parts in a saved pack."""
+
+    archive = zipfile.ZipFile(io.BytesIO(blob))
+    return sum(info.file_size for info in archive.infolist() if info.filename.startswith("ppt/slides/slide"))
+
+def measure(slides: int, rows: int, input_dir: str, shared_styles: bool, repeat: int) -> dict:
+    build = save = load = resave = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        briefing_pack = build_pack(slides, rows, input_dir, shared_styles)
+        build = min(build, time.perf_counter() - start)
+
+        start = time.perf_counter()
+        blob = briefing_pack.save()
+        save = min(save, time.perf_counter() - start)
+
+        start = time.perf_counter()
+        prs = Presentation(io.BytesIO(blob))
+        # Parse every slide, as opening the pack to read or update it would
+        for slide in prs.slides:
+            slide.shapes
+        load = min(load, time.perf_counter() - start)
+
+        if (shared_font_size(prs.part) is not None) != shared_styles:
+            raise SystemExit(f"The opened pack {'lost' if shared_styles else 'gained'} its shared styles")
+        start = time.perf_counter()
+        package_bytes(prs)
+        resave = min(resave, time.perf_counter() - start)
+
+    return {"slides": len(prs.slides), "xml": slide_xml_bytes(blob), "file": len(blob), "build": build, "save": save, "open": load, "resave": resave}
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--slides", type=int, default=20)
+    parser.add_argument("--rows", type=int, default=400)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as input_dir:
+        with open(os.path.join(input_dir, "bullet_points.json"), 'w') as file:
+            json.dump({"summary": [f"Summary point {i} describing the scenario in a sentence or two." for i in range(4)]}, file)
+        for i in range(2):
+            pixels = np.random.default_rng(i).integers(0, 255, (300, 400, 3), dtype=np.uint8)
+            Image.fromarray(pixels).save(os.path.join(input_dir, f"image{i}.png"))
+
+        results = {
+            "explicit": measure(args.slides, args.rows, input_dir, False, args.repeat),
+            "shared": measure(args.slides, args.rows, input_dir, True, args.repeat),
+        }
+
+    print(f"{'formatting':>10} {'slides':>7} {'slide XML (KB)':>15} {'file (KB)':>10} {'build (s)':>10} {'save (s)':>9} {'open (s)':>9} {'resave (s)':>11}")
+    for name, result in results.items():
+        print(
+            f"{name:>10} {result['slides']:>7} {result['xml'] / 1024:>15.1f} {result['file'] / 1024:>10.1f} "
+            f"{result['build']:>10.4f} {result['save']:>9.4f} {result['open']:>9.4f} {result['resave']:>11.4f}"
+        )
+
+    explicit, shared = results["explicit"], results["shared"]
+    print(f"Slide XML is {1 - shared['xml'] / explicit['xml']:.0%} smaller with shared styles")
+    for metric in ("save", "open", "resave"):
+        print(f"{metric.capitalize()} takes {shared[metric] / explicit[metric]:.0%} of the time with shared styles")
+
+if __name__ == "__main__":
+    main()
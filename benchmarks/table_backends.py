@@ -0,0 +1,66 @@
+"""
+Compares the "pptx" and "xml" table backends of `add_table` across table sizes.
+
+Run from the repository root:
+
+    python -m benchmarks.table_backends [--rows 5 50 200 1000] [--repeat 3]
+
+For every size the script checks that both backends produce identical slide XML,
+then prints the best time of each and the speedup.
+"""
+
+import argparse
+import time
+
+import pandas as pd
+
+from lxml import etree
+from pptx import Presentation
+from pptx.dml.color import RGBColor
+from pptx.util import Inches
+
+from src.helper.table_helpers import add_table
+
+CELL_COLOURS = [RGBColor(255, 0, 0), RGBColor(255, 64, 0), RGBColor(255, 128, 0), RGBColor(255, 191, 0), RGBColor(255, 255, 0)]
+
+def make_table(rows: int) -> pd.DataFrame:
+    return pd.DataFrame({
+        "Name": [f"Item {i}" for i in range(rows)],
+        "Description": [f"Description of item {i}" for i in range(rows)],
+        "Value": [i * 10 for i in range(rows)],
+        "Share": [round(i / 3, 2) for i in range(rows)],
+    })
+
+def build(df: pd.DataFrame, backend: str) -> tuple[float, bytes]:
+    prs = Presentation()
+    slide = prs.slides.add_slide(prs.slide_layouts[6])
+
+    start = time.perf_counter()
+    add_table(slide, "Table", df, CELL_COLOURS, Inches(1), Inches(0.2), Inches(3), backend=backend)
+    elapsed = time.perf_counter() - start
+
+    return elapsed, etree.tostring(slide._element)
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[5, 50, 200, 1000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'rows':>6} {'pptx (s)':>10} {'xml (s)':>10} {'speedup':>8}")
+    for rows in args.rows:
+        df = make_table(rows)
+        best = {}
+        xml = {}
+        for backend in ("pptx", "xml"):
+            runs = [build(df, backend) for _ in range(args.repeat)]
+            best[backend] = min(elapsed for elapsed, _ in runs)
+            xml[backend] = runs[0][1]
+
+        if xml["pptx"] != xml["xml"]:
+            raise SystemExit(f"Backends produced different XML for {rows} rows")
+
+        print(f"{rows:>6} {best['pptx']:>10.4f} {best['xml']:>10.4f} {best['pptx'] / best['xml']:>7.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Compares the per-glyph text measurement of `measurement_helpers` with the fixed character width estimate it replaced.
+
+Run from the repository root:
+
+    python -m benchmarks.text_measurement [--bullets 50] [--repeat 5]
+
+A box of generated bullet points is measured with the original estimate, which took every character to be half
+an em wide, and with `estimate_bullet_point_textbox_height`, both cold (with the memoised line counts cleared)
+and warm. The line counts the two give are compared for text of narrow, average and wide characters, where a
+fixed width over- or under-estimates the lines the text wraps to.
+"""
+
+import argparse
+import time
+
+from typing import Callable, List
+
+from src.helper.measurement_helpers import count_lines
+from src.helper.text_helpers import estimate_bullet_point_textbox_height
+
+FONT_SIZE = 9
+BOX_WIDTH = 4.6
+
+SAMPLES = {
+    "narrow": " ".join(["fill it in, little by little, till it is filled"] * 2),
+    "average": " ".join(["Bullet point describing part of the scenario in a sentence or so."] * 2),
+    "wide": " ".join(["WHOLE MAXIMUM WORKLOAD MOVEMENT OVERNIGHT"] * 3),
+}
+
+def fixed_width_lines(text: str, font_size_pt: int, max_width_inch: float) -> int:
+    """The line count of the original estimate, which took every character to be half an em wide."""
+
+    avg_char_width_inch = (font_size_pt * 0.5) / 72
+    lines, current_line = 0, ""
+    for word in text.split():
+        test_line = current_line + " " + word if current_line else word
+        if len(test_line) * avg_char_width_inch > max_width_inch:
+            lines += 1
+            current_line = word
+        else:
+            current_line = test_line
+    return lines + (1 if current_line else 0)
+
+def fixed_width_height(bullet_points: List[str], font_size_pt: int, max_width_inch: float) -> float:
+    line_height_inch = (font_size_pt * 1.25) / 72
+    return sum(fixed_width_lines(point, font_size_pt, max_width_inch) * line_height_inch for point in bullet_points)
+
+def best_time(function: Callable[[], object], repeat: int, before: Callable[[], object] = lambda: None) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        before()
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--bullets", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    bullet_points = [f"• Bullet point {i} describing part of the scenario in a sentence or so, with a caveat or two." for i in range(args.bullets)]
+
+    fixed = best_time(lambda: fixed_width_height(bullet_points, FONT_SIZE, BOX_WIDTH), args.repeat)
+    cold = best_time(lambda: estimate_bullet_point_textbox_height(bullet_points, FONT_SIZE, BOX_WIDTH), args.repeat, count_lines.cache_clear)
+    warm = best_time(lambda: estimate_bullet_point_textbox_height(bullet_points, FONT_SIZE, BOX_WIDTH), args.repeat)
+
+    print(f"{'estimate':>12} {'time (ms)':>10} {'speedup':>8}")
+    for name, seconds in (("fixed width", fixed), ("glyph cold", cold), ("glyph warm", warm)):
+        print(f"{name:>12} {seconds * 1000:>10.3f} {fixed / seconds:>7.1f}x")
+
+    print(f"\n{'text':>12} {'fixed width':>12} {'per glyph':>10}")
+    for name, text in SAMPLES.items():
+        print(f"{name:>12} {fixed_width_lines(text, FONT_SIZE, BOX_WIDTH):>12} {count_lines(text, FONT_SIZE, BOX_WIDTH):>10}")
+
+if __name__ == "__main__":
+    main()
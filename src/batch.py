@@ -0,0 +1,290 @@
+import argparse
+import contextlib
+import json
+import os
+import sys
+import time
+import traceback
+
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional
+
+from pptx.dml.color import RGBColor
+from pptx.presentation import Presentation as PresentationType
+
+from .presentation import BriefingPack
+from .slide_cache import SlideCache
+from .tracing import Tracer
+from .frame.base import BaseSlide
+from .frame.title import TitleSlide
+from .frame.new import NewSlide
+from .frame.summary import SummarySlide
+from .frame.table import PaginatedTableSlide
+from .helper.chart_helpers import chart_spec_from_dict
+from .helper.table_style_helpers import table_style_from_dict
+
+FRAME_TYPES = {
+    "TitleSlide": TitleSlide,
+    "NewSlide": NewSlide,
+    "SummarySlide": SummarySlide,
+    "PaginatedTableSlide": PaginatedTableSlide,
+}
+
+@dataclass
+class PackSpec:
+    """
+    Describes a single briefing pack to be built by a batch run.
+
+    Holds the pack metadata, the frames to add in order and the file the finished pack is saved to.
+    """
+
+    reference_number: str
+    classification: str
+    code_version: str
+    job_id: str
+    frames: List[BaseSlide]
+    output_path: str
+
+@dataclass
+class PackResult:
+    """The outcome of building one pack: where it was saved, how long it took, or why it failed."""
+
+    job_id: str
+    output_path: str
+    seconds: float
+    error: Optional[str] = None
+    cache_hits: int = 0
+    cache_misses: int = 0
+    refreshed: bool = False
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+@dataclass
+class BatchSummary:
+    """Aggregated results of a batch run, including throughput and the list of failed jobs."""
+
+    results: List[PackResult] = field(default_factory=list)
+    wall_seconds: float = 0.0
+    workers: int = 0
+
+    @property
+    def failures(self) -> List[PackResult]:
+        return [result for result in self.results if not result.ok]
+
+    @property
+    def packs_per_second(self) -> float:
+        return len(self.results) / self.wall_seconds if self.wall_seconds else 0.0
+
+    def report(self) -> str:
+        """Returns a short human readable summary of the run."""
+
+        lines = [
+            f"Built {len(self.results) - len(self.failures)}/{len(self.results)} packs "
+            f"in {self.wall_seconds:.2f}s with {self.workers} workers ({self.packs_per_second:.2f} packs/s)"
+        ]
+        cache_hits = sum(result.cache_hits for result in self.results)
+        cache_misses = sum(result.cache_misses for result in self.results)
+        if cache_hits or cache_misses:
+            lines.append(f"Slide cache: {cache_hits} hits, {cache_misses} misses")
+        refreshed = sum(result.refreshed for result in self.results)
+        if refreshed:
+            lines.append(f"Refreshed {refreshed} saved packs in place")
+
+        for failure in self.failures:
+            lines.append(f"FAILED {failure.job_id}: {failure.error.strip().splitlines()[-1]}")
+        return "\n".join(lines)
+
+def assemble_pack(spec: PackSpec, slide_cache: Optional[SlideCache] = None, presentation: Optional[PresentationType] = None, render_workers: Optional[int] = None, shared_styles: bool = False, refreshable: bool = False) -> BriefingPack:
+    """
+    Creates a briefing pack from a spec and adds its frames, without saving it.
+
+    A blank `presentation` to build on, such as a copy of one parsed ahead of time, saves loading the default template.
+    With `render_workers` the slides are rendered in parallel on that many processes (see `BriefingPack.add_frames`).
+    With `shared_styles` tables and text reference styles registered once in the pack instead of formatting every cell and run.
+    With `refreshable` the pack records what it was built from, so it can later be refreshed in place (see `refresh.refresh_pack`).
+    """
+
+    briefing_pack = BriefingPack(spec.reference_number, spec.classification, spec.code_version, spec.job_id, presentation = presentation, slide_cache = slide_cache, shared_styles = shared_styles, refreshable = refreshable)
+    if render_workers:
+        briefing_pack.add_frames(spec.frames, render_workers)
+    else:
+        for frame in spec.frames:
+            briefing_pack.add_frame(frame)
+    return briefing_pack
+
+def refresh_saved_pack(spec: PackSpec, shared_styles: bool = False) -> bool:
+    """
+    Refreshes the pack saved at a spec's output path in place with the spec's frames and metadata, touching only
+    the slides that changed. Returns False, leaving the file alone, if it cannot be refreshed and must be built again:
+    it was not built refreshable, with the same `shared_styles`, or from frames with the same structure.
+    """
+
+    from .refresh import PackMismatchError, refresh_pack # Only imported when refreshing
+
+    try:
+        refreshed_pack = refresh_pack(spec.output_path, spec.frames, spec.reference_number, spec.classification, spec.code_version, spec.job_id, shared_styles = shared_styles)
+    except PackMismatchError:
+        return False
+    refreshed_pack.save(spec.output_path)
+    return True
+
+def build_pack(spec: PackSpec, slide_cache_dir: Optional[str] = None, trace_dir: Optional[str] = None, render_workers: Optional[int] = None, prefetch: bool = False, shared_styles: bool = False, refresh: bool = False) -> PackResult:
+    """
+    Builds and saves a single briefing pack.
+
+    Any exception raised while building is captured in the result rather than propagated,
+    so one bad job cannot take down the rest of a batch. With a `slide_cache_dir` unchanged slides
+    are copied from the slide cache there. With a `trace_dir` the build is traced and its Chrome trace
+    and summary are written there as `<job_id>.trace.json` and `<job_id>.trace.txt`. With `render_workers`
+    the pack's slides are rendered in parallel on that many processes. With `prefetch` every input file is read
+    concurrently before rendering starts or the saved pack is refreshed, and a pack with missing inputs fails before
+    any slide is built; slides rendered on `render_workers` are sent the files they read. With `shared_styles` the pack is written with shared table and text styles (see `BriefingPack`).
+    With `refresh` the pack is built refreshable, and a pack already saved at the output path is refreshed in place
+    instead of being built again where it can be (see `refresh_saved_pack`).
+    """
+
+    start = time.perf_counter()
+    slide_cache = SlideCache(slide_cache_dir) if slide_cache_dir else None
+    tracer = Tracer() if trace_dir else None
+    refreshed = False
+    try:
+        with tracer or contextlib.nullcontext():
+            inputs = contextlib.nullcontext()
+            if prefetch:
+                from .prefetch import prefetch_inputs # Only imported, along with asyncio, when prefetching
+
+                inputs = prefetch_inputs(spec.frames)
+
+            with inputs:
+                if refresh and os.path.exists(spec.output_path):
+                    refreshed = refresh_saved_pack(spec, shared_styles)
+                if not refreshed:
+                    briefing_pack = assemble_pack(spec, slide_cache, render_workers = render_workers, shared_styles = shared_styles, refreshable = refresh)
+
+            if not refreshed:
+                output_dir = os.path.dirname(spec.output_path)
+                if output_dir:
+                    os.makedirs(output_dir, exist_ok=True)
+                briefing_pack.save(spec.output_path)
+
+        if tracer:
+            os.makedirs(trace_dir, exist_ok=True)
+            tracer.write_chrome_trace(os.path.join(trace_dir, f"{spec.job_id}.trace.json"))
+            with open(os.path.join(trace_dir, f"{spec.job_id}.trace.txt"), 'w') as file:
+                file.write(tracer.summary() + "\n")
+    except Exception:
+        return PackResult(spec.job_id, spec.output_path, time.perf_counter() - start, traceback.format_exc())
+
+    if slide_cache:
+        return PackResult(spec.job_id, spec.output_path, time.perf_counter() - start, cache_hits = slide_cache.hits, cache_misses = slide_cache.misses, refreshed = refreshed)
+    return PackResult(spec.job_id, spec.output_path, time.perf_counter() - start, refreshed = refreshed)
+
+def build_packs(specs: Iterable[PackSpec], max_workers: Optional[int] = None, max_in_flight: Optional[int] = None, slide_cache_dir: Optional[str] = None, trace_dir: Optional[str] = None, render_workers: Optional[int] = None, prefetch: bool = False, shared_styles: bool = False, refresh: bool = False) -> BatchSummary:
+    """
+    Builds many briefing packs in parallel across a process pool.
+
+    At most `max_in_flight` specs are submitted to the pool at any one time (twice the worker count by default),
+    so large batches do not pickle every spec up front. Results are returned in the order the specs were given.
+    `render_workers` also spreads the slides of each pack over that many processes, which suits a few large
+    packs better than many small ones. With `prefetch` each pack's input files are read concurrently up front,
+    with `shared_styles` every pack is written with shared table and text styles, and with `refresh` packs already
+    saved are refreshed in place where they can be.
+    """
+
+    max_workers = max_workers or os.cpu_count() or 1
+    max_in_flight = max(max_in_flight or max_workers * 2, 1)
+
+    start = time.perf_counter()
+    results: Dict[int, PackResult] = {}
+    pending: Dict[Future, tuple[int, PackSpec]] = {}
+
+    def collect(done: Iterable[Future]) -> None:
+        for future in done:
+            index, spec = pending.pop(future)
+            try:
+                results[index] = future.result()
+            except Exception:
+                # The worker itself died (or the spec could not be pickled)
+                results[index] = PackResult(spec.job_id, spec.output_path, 0.0, traceback.format_exc())
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        for index, spec in enumerate(specs):
+            if len(pending) >= max_in_flight:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                collect(done)
+            pending[executor.submit(build_pack, spec, slide_cache_dir, trace_dir, render_workers, prefetch, shared_styles, refresh)] = (index, spec)
+
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            collect(done)
+
+    ordered = [results[index] for index in sorted(results)]
+    return BatchSummary(ordered, time.perf_counter() - start, max_workers)
+
+def frame_from_dict(data: Dict[str, Any]) -> BaseSlide:
+    """
+    Creates a frame from its JSON description.
+
+    The `type` key names the frame class and the remaining keys are passed to its constructor.
+    Cell colour lists are given as hex strings, e.g. "FF0000", and table styles as described in
+    `table_style_from_dict`. An image path may instead be a chart, as described in `chart_spec_from_dict`.
+    """
+
+    kwargs = dict(data)
+    frame_class = FRAME_TYPES[kwargs.pop("type")]
+
+    for key, value in kwargs.items():
+        if key.endswith("cell_colours") and value:
+            kwargs[key] = [RGBColor.from_string(colour) for colour in value]
+        elif key.endswith("_style") and value:
+            kwargs[key] = table_style_from_dict(value)
+        elif key.startswith("image") and isinstance(value, dict):
+            kwargs[key] = chart_spec_from_dict(value)
+
+    return frame_class(**kwargs)
+
+def pack_spec_from_dict(data: Dict[str, Any]) -> PackSpec:
+    """Creates a pack spec from its JSON description."""
+
+    return PackSpec(
+        data["reference_number"],
+        data["classification"],
+        data["code_version"],
+        data["job_id"],
+        [frame_from_dict(frame) for frame in data["frames"]],
+        data["output_path"],
+    )
+
+def load_pack_specs(json_file_path: str) -> List[PackSpec]:
+    """Loads a list of pack specs from a JSON file containing either a list of packs or {"packs": [...]}."""
+
+    with open(json_file_path, 'r') as file:
+        data = json.load(file)
+
+    if isinstance(data, dict):
+        data = data["packs"]
+    return [pack_spec_from_dict(pack) for pack in data]
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Build many briefing packs in parallel.")
+    parser.add_argument("specs", help="JSON file describing the packs to build")
+    parser.add_argument("-w", "--workers", type=int, default=None, help="number of worker processes (default: CPU count)")
+    parser.add_argument("--max-in-flight", type=int, default=None, help="maximum number of packs queued at once (default: 2x workers)")
+    parser.add_argument("--slide-cache", default=None, metavar="DIR", help="reuse slides whose inputs have not changed from a slide cache in DIR")
+    parser.add_argument("--trace", default=None, metavar="DIR", help="write a Chrome trace and timing summary of each pack to DIR")
+    parser.add_argument("--render-workers", type=int, default=None, help="also render the slides of each pack on this many processes")
+    parser.add_argument("--prefetch", action="store_true", help="read every input file of a pack concurrently before rendering it")
+    parser.add_argument("--shared-styles", action="store_true", help="reference shared table and text styles instead of formatting every cell and run")
+    parser.add_argument("--refresh", action="store_true", help="update packs already saved in place, changing only the slides whose data changed")
+    args = parser.parse_args(argv)
+
+    summary = build_packs(load_pack_specs(args.specs), args.workers, args.max_in_flight, args.slide_cache, args.trace, args.render_workers, args.prefetch, args.shared_styles, args.refresh)
+    print(summary.report())
+
+    return 1 if summary.failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,11 +1,111 @@
+import copyreg
+import os
+
+from dataclasses import dataclass, fields
+from typing import Any, Iterable, List
+
+from pptx.dml.color import RGBColor
+from pptx.slide import Slide
+from pptx.util import Centipoints, Cm, Emu, Inches, Length, Mm, Pt
+
+from ..helper.chart_helpers import ChartSpec
+from ..helper.input_helpers import InputSource, is_process_local_input
+from ..renderer import render_frame
+from ..slide_cache import fingerprint, visual_content
+
+# RGBColor is a tuple subclass whose __new__ takes three arguments, so the default tuple pickling
+# cannot recreate it. Frames carry lists of them and have to be sent to worker processes.
+copyreg.pickle(RGBColor, lambda colour: (RGBColor, tuple(colour)))
+
+# Length subclasses are constructed from their own unit but pickle their EMU value, so they are
+# recreated as plain EMU lengths instead of being scaled a second time.
+for length_type in (Inches, Cm, Mm, Pt, Centipoints):
+    copyreg.pickle(length_type, lambda length: (Emu, (int(length),)))
+
+@dataclass(slots=True, eq=False)
 class BaseSlide:
     """
     A base class for creating slides in a PowerPoint presentation with consistent
     formatting.
+
+    Frames are specifications: slotted dataclasses holding their arguments, which read no files when they are created
+    and keep no references to the presentation or the shapes built from them. `render_frame` turns a frame's layout
+    into a slide, so frames are cheap to hold in bulk and can be pickled to worker processes.
     """
 
-    def __init__(self, slide_title: str) -> None: 
-        self.slide_title = slide_title
+    slide_title: str
+
+    def add_slide(self, briefing_pack) -> Slide:
+        """Adds the frame's slide to the briefing pack, without the header and footer, and returns it."""
+
+        return render_frame(self, briefing_pack)
+
+    def pages(self, briefing_pack) -> Iterable['BaseSlide']:
+        """
+        Returns the frames that add this frame's slides, in order. A frame is normally a single slide, and is its own
+        only page; frames that spread over several slides, such as a paginated table, return one frame per slide.
+        """
+
+        return [self]
+
+    def layout(self, slide_width: Length, slide_height: Length) -> 'FrameLayout':
+        """Returns the geometry of the frame's content, measured without creating any shapes."""
+        raise NotImplementedError("Subclasses should implement this!")
+
+    def fingerprint_inputs(self) -> List[Any]:
+        """
+        Returns everything the frame's slide depends on: its arguments, with the resolved bullet points in place of
+        their keys and the contents of the files it reads (see `file_content`) in place of their paths.
+        """
+        raise NotImplementedError("Subclasses should implement this!")
+
+    def fingerprint(self, briefing_pack, metadata: bool = True) -> str:
+        """
+        Returns a digest that changes whenever the slide this frame adds to `briefing_pack` would.
+
+        Without `metadata` changes to the pack's header and footer text are left out, so only the frame's own content counts.
+        """
+
+        return fingerprint(type(self).__module__, type(self).__qualname__, self.fingerprint_inputs(), briefing_pack.fingerprint_inputs(metadata))
+
+    def is_portable(self) -> bool:
+        """
+        Returns whether the frame can be sent to a worker process: none of its inputs is tied to this process, like a
+        memoryview, a memory-mapped file or an open file object (see `is_process_local_input`).
+        """
+
+        for field in fields(self):
+            value = getattr(self, field.name)
+            if is_process_local_input(value.data if isinstance(value, ChartSpec) else value):
+                return False
+        return True
+
+    def is_detachable(self) -> bool:
+        """
+        Returns whether the frame's slide can be detached from the pack it is rendered in (see `detach_slide`), so it
+        can be rendered in a worker process: slides showing native charts relate to chart parts and cannot be.
+        """
+
+        return not any(isinstance(getattr(self, field.name), ChartSpec) for field in fields(self))
+
+    def input_paths(self) -> List[str]:
+        """Returns the path of every file the frame reads when it is rendered: its CSV files, images and bullet point files."""
+
+        return []
+
+    def image_boxes(self, briefing_pack) -> List[tuple[InputSource, Length, Length]]:
+        """
+        Returns the (path, width, height) of each image whose display size is known before the slide is built,
+        so the briefing pack can start preparing them early. A height of 0 keeps the image's aspect ratio.
+        """
+
+        return []
+
+def file_paths(*sources: Any) -> List[str]:
+    """
+    Returns the sources that are file paths, skipping in-memory data, such as image bytes and DataFrames, and missing optional inputs (None or "").
+    Charts stand for the file their data is read from, if any.
+    """
 
-    def add_slide(self):
-        raise NotImplementedError("Subclasses should implement this!")
\ No newline at end of file
+    sources = tuple(source.data if isinstance(source, ChartSpec) else source for source in sources)
+    return [os.fspath(source) for source in sources if isinstance(source, (str, os.PathLike)) and source]
\ No newline at end of file
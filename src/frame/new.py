@@ -1,54 +1,75 @@
-from .base import BaseSlide
-from typing import List
+from .base import BaseSlide, file_paths, visual_content
 
-from pptx.util import Inches
+from dataclasses import dataclass
+from typing import Any, List, Optional, Union
+
+from pptx.util import Inches, Length
 from pptx.dml.color import RGBColor
-from pptx.slide import Slide
 
-from ..helper.text_helpers import add_info_box, add_bullet_points, estimate_bullet_point_textbox_height
-from ..helper.shape_helpers import add_line
-from ..helper.json_helpers import load_bullet_points
-from ..helper.image_helpers import add_image
-from ..helper.table_helpers import add_table
+from ..helper.chart_helpers import ChartSpec
+from ..helper.input_helpers import InputSource
+from ..helper.json_helpers import BulletPointStore, bullet_point_paths, resolve_bullet_points
+from ..helper.table_helpers import TableSource
+from ..helper.table_style_helpers import TableStyle
+from ..layout import BulletListBlock, FrameLayout, InfoBoxBlock, LineBlock, TableBlock, place, stack, visual_block
+from ..slide_cache import file_content
 
+@dataclass(slots=True, eq=False)
 class NewSlide(BaseSlide):
     """
     Represents a slide with a table, bullet points, and an image.
 
     This class handles the creation of a slide that includes:
-    - A table populated with data from a CSV file.
+    - A table populated with data from a CSV file (a path or CSV bytes held in memory) or an in-memory DataFrame, optionally formatted and coloured by `table_style`
+      and, with `autofit_table`, sized to its content (see `fit_table`).
     - Bullet points for the table, scenario, and assumptions.
-    - An image inserted into the slide.
-    """
+    - An image inserted into the slide, from a path or held in memory (see `open_input`), or a native chart if `image_path` is a `ChartSpec`.
 
-    def __init__(self, slide_title: str, table_header: str, table_csv: str, table_cell_colours: List[RGBColor], table_bullet_points_key: str, scenario_bullet_points_key: str, assumptions_bullet_points_key: str, image_path: str) -> None:
-        super().__init__(slide_title)
+    Bullet points are looked up by key in `bullet_point_store`, or the shared default store, when the slide is laid out.
+    """
 
-        self.table_header = table_header
-        self.table_csv, self.table_cell_colours = table_csv, table_cell_colours
+    table_header: str
+    table_csv: TableSource
+    table_cell_colours: List[RGBColor]
+    table_bullet_points_key: str
+    scenario_bullet_points_key: str
+    assumptions_bullet_points_key: str
+    image_path: Union[InputSource, ChartSpec]
+    bullet_point_store: Optional[BulletPointStore] = None
+    table_style: Optional[TableStyle] = None
+    autofit_table: bool = False
 
-        self.table_bullet_points = load_bullet_points("input/bullet_points.json", table_bullet_points_key)
-        self.scenario_bullet_points= load_bullet_points("input/bullet_points.json", scenario_bullet_points_key)
-        self.assumptions_bullet_points = load_bullet_points("input/bullet_points.json", assumptions_bullet_points_key)
+    def layout(self, slide_width: Length, slide_height: Length) -> FrameLayout:
+        """The table, its bullet points and the scenario and assumption boxes are stacked on the right, beside the image."""
 
-        self.image_path = image_path
-    
-    def add_slide(self, briefing_pack) -> Slide:
-        """Adds a slide to the briefing pack with a table, bullet points, and an image."""
-        
-        self.prs = briefing_pack.prs
-        self.slide = self.prs.slides.add_slide(self.prs.slide_layouts[6]) # Create an empty slide
+        table_bullet_points, scenario_bullet_points, assumptions_bullet_points = self._bullet_points()
+        content = stack(Inches(5.02), Inches(1), Inches(4.78), [
+            TableBlock(self.table_header, self.table_csv, self.table_cell_colours, Inches(3.9), self.table_style, self.autofit_table),
+            BulletListBlock(table_bullet_points, 8, space_before = Inches(0.05)),
+            LineBlock(Inches(9.78), indent = Inches(0.095), space_before = Inches(0.07)),
+            InfoBoxBlock("Scenario", scenario_bullet_points, 8, indent = Inches(0.05), width = Inches(4.72), space_before = Inches(0.07)),
+            InfoBoxBlock("Assumptions", assumptions_bullet_points, 8, indent = Inches(0.05), width = Inches(4.72), space_before = Inches(0.1)),
+        ])
+        image = place(visual_block(self.image_path, Inches(5.9)), Inches(0.2), Inches(1.1), Inches(4.7))
 
-        content_left = Inches(5.02)
+        return FrameLayout(content + [image])
 
-        table, table_shape = add_table(self.slide, self.table_header, self.table_csv, self.table_cell_colours, Inches(1), content_left, Inches(3.9))
+    def fingerprint_inputs(self) -> List[Any]:
+        return [
+            self.slide_title, self.table_header, file_content(self.table_csv), self.table_cell_colours, self.table_style, self.autofit_table,
+            *self._bullet_points(), visual_content(self.image_path),
+        ]
 
-        table_text_box, table_text_frame = add_bullet_points(self.slide, self.table_bullet_points, content_left, table_shape.top + table.height + Inches(0.05), Inches(4.78), Inches(estimate_bullet_point_textbox_height(self.table_bullet_points, 8, 4.78)), 8)
-        line = add_line(self.slide, content_left + Inches(0.095), Inches(9.78), table_text_box.top + table_text_box.height + Inches(0.07))
+    def input_paths(self) -> List[str]:
+        return file_paths(self.table_csv, self.image_path, *bullet_point_paths(self.bullet_point_store))
 
-        _, _, sc_p_box, _ = add_info_box(self.slide, content_left + Inches(0.05), line.top + Inches(0.07), Inches(4.72), "Scenario", self.scenario_bullet_points, 8)
-        add_info_box(self.slide, content_left + Inches(0.05), sc_p_box.top + sc_p_box.height + Inches(0.1), Inches(4.72), "Assumptions", self.assumptions_bullet_points, 8)
+    def image_boxes(self, briefing_pack) -> List[tuple[InputSource, Length, Length]]:
+        if isinstance(self.image_path, ChartSpec):
+            return []
+        return [(self.image_path, Inches(4.7), Inches(5.9))]
 
-        add_image(self.slide, Inches(0.2), Inches(1.1), Inches(4.7), self.image_path, Inches(5.9))
+    def _bullet_points(self) -> tuple[List[str], List[str], List[str]]:
+        """The table, scenario and assumptions bullet points."""
 
-        return self.slide
\ No newline at end of file
+        keys = self.table_bullet_points_key, self.scenario_bullet_points_key, self.assumptions_bullet_points_key
+        return tuple(resolve_bullet_points(key, self.bullet_point_store) for key in keys)
\ No newline at end of file
@@ -0,0 +1,114 @@
+from .base import BaseSlide, file_paths
+
+from dataclasses import dataclass
+from typing import Any, Iterable, Iterator, List, Optional, Sequence, Union
+
+from pptx.util import Inches, Length
+from pptx.dml.color import RGBColor
+
+from ..helper.csv_helpers import CsvTable, is_dataframe, iter_csv_rows
+from ..helper.input_helpers import InputSource, is_memory_input, is_path
+from ..helper.table_style_helpers import TableStyle
+from ..helper.table_helpers import TABLE_FONT_SIZE, TABLE_INDENT, TABLE_TITLE_OFFSET, measure_table_row, table_column_widths
+from ..layout import FrameLayout, TableBlock, place
+
+# Where the table sits on every page, below the slide title and dividing line
+TABLE_LEFT = Inches(0.2)
+TABLE_TOP = Inches(0.85)
+
+CONTINUATION_SUFFIX = " (cont.)"
+
+# A CSV file, given by its path or held in memory, which is streamed, an in-memory DataFrame or CsvTable, or any iterable of rows whose first row is the header
+PaginatedTableSource = Union[InputSource, CsvTable, Iterable[Sequence[Any]]]
+
+@dataclass(slots=True, eq=False)
+class TablePageSlide(BaseSlide):
+    """One slide of a paginated table: a titled table holding some of its rows."""
+
+    table_title: str
+    data: CsvTable
+    table_cell_colours: List[RGBColor]
+    table_width: Length
+    table_style: Optional[TableStyle] = None
+
+    def layout(self, slide_width: Length, slide_height: Length) -> FrameLayout:
+        table = TableBlock(self.table_title, self.data, self.table_cell_colours, self.table_width, self.table_style)
+        return FrameLayout([place(table, TABLE_LEFT, TABLE_TOP, slide_width - 2 * TABLE_LEFT)])
+
+    def fingerprint_inputs(self) -> List[Any]:
+        return [self.slide_title, self.table_title, self.data, self.table_cell_colours, self.table_width, self.table_style]
+
+@dataclass(slots=True, eq=False)
+class PaginatedTableSlide(BaseSlide):
+    """
+    Represents a table spread over as many slides as its rows need.
+
+    Rows are read one at a time, CSV files included, and each slide is filled with as many rows as fit between
+    the top of the table and the footer, measuring how far each row's cells wrap. The header row is repeated on
+    every slide and the titles of the slides after the first end in " (cont.)". Only one slide's rows are held
+    at a time, so memory does not grow with the size of the source.
+
+    Cells are shown as they are written in the CSV file, without the type conversion `add_table` applies.
+    `table_cell_colours` colour the rows in order, continuing across slides, and `table_style` formats and colours
+    the cells of each slide. Rows are measured before they are formatted. A source with a header and no rows is
+    shown as one slide holding the header; an empty source raises ValueError.
+    """
+
+    table_title: str
+    table_csv: PaginatedTableSource
+    table_cell_colours: Optional[List[RGBColor]] = None
+    table_width: Optional[Length] = None
+    table_style: Optional[TableStyle] = None
+
+    def input_paths(self) -> List[str]:
+        return file_paths(self.table_csv)
+
+    def pages(self, briefing_pack) -> Iterator[TablePageSlide]:
+        """Yields a frame for each slide of the table, reading the rows for each one only when it is needed."""
+
+        prs = briefing_pack.prs
+        table_width = self.table_width or prs.slide_width - 2 * TABLE_LEFT - TABLE_INDENT
+        available = (briefing_pack.content_bottom - TABLE_TOP - TABLE_TITLE_OFFSET) / Inches(1)
+
+        rows = _iter_rows(self.table_csv)
+        header = [str(cell) for cell in next(rows, [])]
+        if not header:
+            raise ValueError(f"Paginated table '{self.slide_title}' has no header row")
+        # The first column of every table is left empty for the row colours
+        column_widths = table_column_widths(len(header) + 1, table_width)[1:]
+        header_height = measure_table_row(header, column_widths, TABLE_FONT_SIZE)
+
+        page_rows: List[tuple] = []
+        height = header_height
+        first_row = 0
+        for row in rows:
+            row = tuple(str(cell) for cell in row)
+            row_height = measure_table_row(row, column_widths, TABLE_FONT_SIZE)
+
+            # A row too tall for any slide still gets one of its own
+            if page_rows and height + row_height > available:
+                yield self._page(header, page_rows, first_row, table_width)
+                first_row += len(page_rows)
+                page_rows, height = [], header_height
+
+            page_rows.append(row)
+            height += row_height
+
+        if page_rows or not first_row:
+            yield self._page(header, page_rows, first_row, table_width)
+
+    def _page(self, header: List[str], rows: List[tuple], first_row: int, table_width: Length) -> TablePageSlide:
+        title = self.slide_title if first_row == 0 else f"{self.slide_title}{CONTINUATION_SUFFIX}"
+        colours = (self.table_cell_colours or [])[first_row:first_row + len(rows)]
+        return TablePageSlide(title, self.table_title, CsvTable(header, rows), colours, table_width, self.table_style)
+
+def _iter_rows(source: PaginatedTableSource) -> Iterator[Sequence[Any]]:
+    """Yields the header and then each row of a table source."""
+
+    if is_path(source) or is_memory_input(source):
+        yield from iter_csv_rows(source)
+    elif isinstance(source, CsvTable) or is_dataframe(source):
+        yield list(source.columns)
+        yield from source.itertuples(index=False)
+    else:
+        yield from source
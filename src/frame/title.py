@@ -1,34 +1,42 @@
-from .base import BaseSlide
+from .base import BaseSlide, file_paths, visual_content
 
-from pptx.util import Inches
-from pptx.slide import Slide
+from dataclasses import dataclass
+from typing import Any, List, Union
 
-from ..helper.text_helpers import add_textbox
-from ..helper.image_helpers import add_image
+from pptx.util import Inches, Length
 
+from ..helper.chart_helpers import ChartSpec
+from ..helper.input_helpers import InputSource
+from ..layout import FrameLayout, TextBlock, place, visual_block
+
+@dataclass(slots=True, eq=False)
 class TitleSlide(BaseSlide):
     """
     Represents a title slide with an issue date and an image.
 
     This class handles the creation of a title slide that includes:
     - A textbox displaying the issue date.
-    - An image positioned at a specific location with a defined width.
+    - An image, from a path or held in memory (see `open_input`), or a native chart for a `ChartSpec`, positioned at a specific location with a defined width.
     """
 
-    def __init__(self, slide_title: str, issue_date: str, image_path: str, image_x: Inches = Inches(3.5), image_width: Inches = Inches(6)) -> None:
-        super().__init__(slide_title)
-        self.issue_date, self.image_path = issue_date, image_path
-        self.image_x, self.image_width = image_x, image_width
-    
-    def add_slide(self, briefing_pack) -> Slide:
-        """
-        Adds a title slide to the briefing pack, including the issue date and image.
-        """
+    issue_date: str
+    image_path: Union[InputSource, ChartSpec]
+    image_x: Inches = Inches(3.5)
+    image_width: Inches = Inches(6)
+
+    def layout(self, slide_width: Length, slide_height: Length) -> FrameLayout:
+        return FrameLayout([
+            place(TextBlock(f"Issued On: {self.issue_date}", 12, Inches(0.5)), Inches(0.5), Inches(2), Inches(3)),
+            place(visual_block(self.image_path), self.image_x, Inches(2), self.image_width),
+        ])
 
-        self.prs = briefing_pack.prs
-        self.slide = self.prs.slides.add_slide(self.prs.slide_layouts[6]) # Create an empty slide
+    def fingerprint_inputs(self) -> List[Any]:
+        return [self.slide_title, self.issue_date, visual_content(self.image_path), self.image_x, self.image_width]
 
-        add_textbox(self.slide, Inches(0.5), Inches(2), Inches(3), Inches(0.5), f"Issued On: {self.issue_date}", 12)
-        add_image(self.slide, self.image_x, Inches(2), self.image_width, self.image_path)
+    def input_paths(self) -> List[str]:
+        return file_paths(self.image_path)
 
-        return self.slide
\ No newline at end of file
+    def image_boxes(self, briefing_pack) -> List[tuple[InputSource, Length, Length]]:
+        if isinstance(self.image_path, ChartSpec):
+            return []
+        return [(self.image_path, self.image_width, Inches(0))]
\ No newline at end of file
@@ -0,0 +1,172 @@
+import datetime
+import math
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Mapping, Optional, Tuple, Type
+
+from pptx.enum.chart import XL_CHART_TYPE, XL_LEGEND_POSITION
+from pptx.shapes.graphfrm import GraphicFrame
+from pptx.slide import Slide
+from pptx.util import Inches, Pt
+
+from .table_helpers import TableSource, load_table_data
+from ..tracing import traced
+
+if TYPE_CHECKING:
+    from pptx.chart.data import CategoryChartData
+
+# Chart types by the kind a chart spec names
+CHART_TYPES = {
+    "bar": XL_CHART_TYPE.COLUMN_CLUSTERED,
+    "stacked": XL_CHART_TYPE.COLUMN_STACKED,
+    "horizontal_bar": XL_CHART_TYPE.BAR_CLUSTERED,
+    "horizontal_stacked": XL_CHART_TYPE.BAR_STACKED,
+    "line": XL_CHART_TYPE.LINE_MARKERS,
+}
+
+CHART_FONT_SIZE = 7
+
+# Creation time written into every chart's embedded workbook, so that identical packs produce identical files
+_WORKBOOK_CREATED = datetime.datetime(2000, 1, 1)
+
+@dataclass(frozen=True, eq=False)
+class ChartSpec:
+    """
+    A native PowerPoint chart of table data, which can take the place of an image.
+
+    `data` is anything a table accepts: a CSV path, a DataFrame, a CsvTable or a list of rows. The `categories` column
+    (the first by default) labels the categories and each of the `series` columns (every other numeric column by
+    default) is plotted as a series, as the `kind` of chart named in CHART_TYPES. Values that are not numbers are
+    left as gaps.
+    """
+
+    data: TableSource
+    kind: str = "bar"
+    categories: Optional[str] = None
+    series: Optional[Tuple[str, ...]] = None
+    title: Optional[str] = None
+    number_format: Optional[str] = None
+
+    def __post_init__(self) -> None:
+        if self.kind not in CHART_TYPES:
+            raise ValueError(f"Unknown chart kind: {self.kind}, expected one of {', '.join(CHART_TYPES)}")
+
+# Chart data class writing workbooks with a fixed creation time, defined when the first chart is drawn
+_chart_data_type: Optional[Type['CategoryChartData']] = None
+
+def _chart_data(number_format: Optional[str]) -> 'CategoryChartData':
+    """
+    Returns empty chart data whose embedded workbook is created at a fixed time instead of the current time.
+    XlsxWriter, which writes the workbook, is only imported the first time.
+    """
+
+    global _chart_data_type
+
+    if _chart_data_type is None:
+        from pptx.chart.data import CategoryChartData
+        from pptx.chart.xlsx import CategoryWorkbookWriter
+
+        class WorkbookWriter(CategoryWorkbookWriter):
+            def _populate_worksheet(self, workbook: Any, worksheet: Any) -> None:
+                super()._populate_worksheet(workbook, worksheet)
+                workbook.set_properties({"created": _WORKBOOK_CREATED})
+
+        class ChartData(CategoryChartData):
+            @property
+            def _workbook_writer(self) -> WorkbookWriter:
+                return WorkbookWriter(self)
+
+        _chart_data_type = ChartData
+
+    return _chart_data_type(number_format = number_format) if number_format else _chart_data_type()
+
+@traced
+def chart_data(spec: ChartSpec) -> 'CategoryChartData':
+    """Loads a chart's data and returns its categories and series."""
+
+    data = load_table_data(spec.data)
+    columns = [str(column) for column in data.columns]
+    rows = list(data.itertuples(index=False))
+
+    category_index = columns.index(spec.categories) if spec.categories else 0
+    values = {name: [_number(row[index]) for row in rows] for index, name in enumerate(columns) if index != category_index}
+    if spec.series is not None:
+        missing = [name for name in spec.series if name not in values]
+        if missing:
+            raise ValueError(f"Chart series not found in the data: {', '.join(missing)}")
+        series = list(spec.series)
+    else:
+        # Every column holding at least one number and nothing but numbers and gaps
+        series = [
+            name for index, name in enumerate(columns)
+            if index != category_index and any(value is not None for value in values[name])
+            and all(value is not None or _is_blank(row[index]) for value, row in zip(values[name], rows))
+        ]
+
+    result = _chart_data(spec.number_format)
+    result.categories = [str(row[category_index]) for row in rows]
+    for name in series:
+        result.add_series(name, values[name])
+    return result
+
+@traced
+def add_chart(slide: Slide, spec: ChartSpec, left: Inches, top: Inches, width: Inches, height: Inches) -> GraphicFrame:
+    """Adds a native chart to a slide, with its text at the table font size and a legend below it when it has several series."""
+
+    data = chart_data(spec)
+    shape = slide.shapes.add_chart(CHART_TYPES[spec.kind], left, top, width, height, data)
+    _format_chart(shape, spec, len(data))
+    return shape
+
+@traced
+def replace_chart(shape: GraphicFrame, spec: ChartSpec) -> None:
+    """Replaces the data and title of a chart created by `add_chart`, which must be of the same kind."""
+
+    chart = shape.chart
+    if chart.chart_type != CHART_TYPES[spec.kind]:
+        raise ValueError(f"Cannot change a {chart.chart_type} chart into a {spec.kind} chart")
+
+    data = chart_data(spec)
+    chart.replace_data(data)
+    _format_chart(shape, spec, len(data))
+
+def _format_chart(shape: GraphicFrame, spec: ChartSpec, series_count: int) -> None:
+    """Sets a chart's font size, title and legend."""
+
+    chart = shape.chart
+    chart.font.size = Pt(CHART_FONT_SIZE)
+
+    chart.has_title = bool(spec.title)
+    if spec.title:
+        chart.chart_title.text_frame.text = spec.title
+        chart.chart_title.text_frame.paragraphs[0].font.size = Pt(CHART_FONT_SIZE + 2)
+
+    chart.has_legend = series_count > 1
+    if chart.has_legend:
+        chart.legend.position = XL_LEGEND_POSITION.BOTTOM
+        chart.legend.include_in_layout = False
+
+def _number(value: Any) -> Optional[float]:
+    """Returns a cell as a number, or None if it is empty or not a number."""
+
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return None
+    return None if math.isnan(number) else number
+
+def _is_blank(value: Any) -> bool:
+    """Returns whether a cell is empty: None, an empty string or NaN."""
+
+    return value is None or value == "" or value != value
+
+def chart_spec_from_dict(data: Mapping[str, Any]) -> ChartSpec:
+    """
+    Creates a chart spec from its JSON description, e.g.
+    {"data": "sales.csv", "kind": "stacked", "categories": "Month", "series": ["North", "South"], "title": "Sales"}.
+    """
+
+    kwargs = dict(data)
+    if kwargs.get("series") is not None:
+        kwargs["series"] = tuple(kwargs["series"])
+    return ChartSpec(**kwargs)
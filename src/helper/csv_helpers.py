@@ -0,0 +1,117 @@
+import csv
+import io
+import re
+import sys
+
+from typing import Any, Iterator, List, Optional, Sequence
+
+from .input_helpers import InputSource, open_input
+from ..tracing import traced
+
+# Cells pandas reads as missing values or booleans by default; CSVs containing them are left to pandas
+_PANDAS_SPECIAL_VALUES = {
+    "", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan", "1.#IND", "1.#QNAN", "<NA>", "N/A",
+    "NA", "NULL", "NaN", "None", "n/a", "nan", "null", "True", "TRUE", "true", "False", "FALSE", "false",
+}
+
+# Numbers whose value pandas and Python parse identically: integers that fit in an int64, and decimals with
+# few enough digits to round the same way. pandas' parser counts every digit, leading zeros included
+_INTEGER = re.compile(r"-?\d{1,18}")
+_DECIMAL = re.compile(r"-?(\d+\.\d*|\.\d+)")
+_MAX_DECIMAL_DIGITS = 15
+
+class CsvTable:
+    """
+    Table data read from a plain CSV file without pandas.
+
+    Offers the part of the DataFrame interface the table helpers use (`columns`, `shape` and `itertuples`), with
+    cells converted the way `pandas.read_csv` converts them, so a table renders identically either way.
+    """
+
+    def __init__(self, columns: List[str], rows: List[tuple]) -> None:
+        self.columns = columns
+        self.rows = rows
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        return len(self.rows), len(self.columns)
+
+    def itertuples(self, index: bool = True) -> Iterator[tuple]:
+        """Yields each row as a tuple of cells, preceded by its position if `index` is true."""
+
+        if index:
+            return ((position, *row) for position, row in enumerate(self.rows))
+        return iter(self.rows)
+
+def is_dataframe(value: Any) -> bool:
+    """Returns whether a value is a pandas DataFrame, without importing pandas if nothing has yet."""
+
+    pandas = sys.modules.get("pandas")
+    return pandas is not None and isinstance(value, pandas.DataFrame)
+
+def iter_csv_rows(path: InputSource) -> Iterator[List[str]]:
+    """Yields the rows of a CSV file, given by its path or held in memory, one at a time, header first, skipping blank lines, without reading the whole file."""
+
+    with io.TextIOWrapper(open_input(path), encoding="utf-8-sig", newline="") as file:
+        for record in csv.reader(file):
+            if record:
+                yield record
+
+@traced
+def read_plain_csv(path: InputSource) -> Optional[CsvTable]:
+    """
+    Reads a CSV file with the standard library, or returns None if it needs pandas to be read faithfully.
+
+    A plain CSV has a header of unique, non-empty names, the same number of cells on every row, no missing or boolean
+    values, and numbers that pandas and Python parse the same way. Columns of integers become ints, columns of
+    numbers with any decimal become floats and everything else is kept as text, as `pandas.read_csv` would.
+    """
+
+    try:
+        records = list(iter_csv_rows(path)) # Blank lines are skipped, as pandas skips them
+    except (UnicodeDecodeError, csv.Error):
+        return None
+
+    if not records:
+        return None
+    columns, rows = records[0], records[1:]
+    if len(set(columns)) != len(columns) or not all(columns) or any(len(row) != len(columns) for row in rows):
+        return None
+
+    converted = []
+    for cells in zip(*rows):
+        column = _convert_column(cells)
+        if column is None:
+            return None
+        converted.append(column)
+
+    return CsvTable(columns, list(zip(*converted)) if converted else [() for _ in rows])
+
+def _convert_column(cells: Sequence[str]) -> Optional[List[Any]]:
+    """Returns a column's cells as pandas would type them, or None if any cell could be read differently by pandas."""
+
+    integers = decimals = 0
+    for cell in cells:
+        if cell.strip() in _PANDAS_SPECIAL_VALUES:
+            return None
+        if _INTEGER.fullmatch(cell):
+            integers += 1
+        elif _DECIMAL.fullmatch(cell) and sum(character.isdigit() for character in cell) <= _MAX_DECIMAL_DIGITS:
+            decimals += 1
+        elif _is_number(cell):
+            # Exponents, signs, infinities and very long numbers are parsed by pandas' own reader
+            return None
+
+    if integers == len(cells):
+        return [int(cell) for cell in cells]
+    if integers + decimals == len(cells):
+        return [float(cell) for cell in cells]
+    # A column with any text keeps every cell as text, numbers included
+    return list(cells)
+
+def _is_number(cell: str) -> bool:
+    try:
+        float(cell)
+    except ValueError:
+        return False
+    return True
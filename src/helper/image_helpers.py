@@ -1,15 +1,187 @@
-from pptx.util import Inches
+import hashlib
+import os
+import threading
+
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Iterable, Optional
+
+from PIL import Image
+
+from pptx.util import Emu, Inches, Length
+from pptx.opc.constants import RELATIONSHIP_TYPE as RT
+from pptx.shapes.base import BaseShape
 from pptx.slide import Slide
 from pptx.shapes.shapetree import SlideShapes
 
-def add_image(slide: Slide, left: Inches, top: Inches, width: Inches, path: str, height: Inches = Inches(0)) -> 'SlideShapes._Shape':
+from .input_helpers import InputSource, input_digest, input_name, is_path, open_input
+from ..tracing import traced
+
+class ImagePreprocessor:
+    """
+    Downscales and recompresses images to the size they are displayed at before they are embedded.
+
+    Each image is resized to fit its display box at `dpi` (images are never upscaled) and re-encoded:
+    JPEG sources stay JPEG, other images become optimised PNGs, or JPEGs when `lossy` is set and the image
+    has no transparency. Results are written to `cache_dir` under a name derived from the image content and
+    target size, so later packs that use the same image at the same size reuse the file. Images held in memory
+    are read in place and only written out when they are resized or re-encoded.
+    Work is done on a thread pool, so independent images can be prepared concurrently. The pool is shut down by
+    `shutdown`, or on leaving the preprocessor when it is used as a context manager.
+    """
+
+    def __init__(self, cache_dir: str = ".image_cache", dpi: int = 200, lossy: bool = False, jpeg_quality: int = 85, max_workers: Optional[int] = None) -> None:
+        self.cache_dir = cache_dir
+        self.dpi = dpi
+        self.lossy = lossy
+        self.jpeg_quality = jpeg_quality
+
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="image-preprocessor")
+        self._futures: Dict[tuple[str, int, int], Future] = {}
+        self._lock = threading.Lock()
+
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def submit(self, path: InputSource, width: Length, height: Length = Inches(0)) -> Future:
+        """
+        Queues an image for preprocessing and returns a future for the path of the prepared file, or for the image
+        itself if it needs no preparing.
+
+        Submitting the same image and size again returns the existing future. Images held in memory are the same
+        image when their bytes are.
+        """
+
+        key = (os.path.abspath(path) if is_path(path) else input_digest(path), int(width), int(height))
+        with self._lock:
+            if key not in self._futures:
+                self._futures[key] = self._executor.submit(self._prepare, path, width, height)
+            return self._futures[key]
+
+    def submit_many(self, images: Iterable[tuple[InputSource, Length, Length]]) -> None:
+        """Queues several (path, width, height) images so they are processed concurrently."""
+
+        for path, width, height in images:
+            self.submit(path, width, height)
+
+    @traced
+    def prepare(self, path: InputSource, width: Length, height: Length = Inches(0)) -> InputSource:
+        """Returns the path of the prepared image, or the image itself if it needs no preparing, processing it now if it has not been submitted already."""
+
+        return self.submit(path, width, height).result()
+
+    def __enter__(self) -> 'ImagePreprocessor':
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.shutdown()
+
+    def shutdown(self) -> None:
+        """Waits for queued images to be prepared and stops the thread pool."""
+
+        self._executor.shutdown(wait=True)
+
+    @traced
+    def _prepare(self, path: InputSource, width: Length, height: Length) -> InputSource:
+        """Resizes and re-encodes one image, or returns the cached copy if it has been prepared before."""
+
+        with open_input(path) as file:
+            digest = hashlib.file_digest(file, "sha256").hexdigest()
+            file.seek(0)
+            with Image.open(file) as image:
+                target_size = self._target_size(image.size, width, height)
+                is_jpeg = image.format == "JPEG"
+                has_alpha = image.mode in ("RGBA", "LA", "PA") or (image.mode == "P" and "transparency" in image.info)
+
+                use_jpeg = is_jpeg or (self.lossy and not has_alpha)
+                extension = "jpg" if use_jpeg else "png"
+
+                quality = f"-q{self.jpeg_quality}" if use_jpeg else ""
+                cached_path = os.path.join(self.cache_dir, f"{digest}-{target_size[0]}x{target_size[1]}{quality}.{extension}")
+                if os.path.exists(cached_path):
+                    return cached_path
+
+                # Nothing to gain from re-encoding an image that is already the right size and format
+                if target_size == image.size and (is_jpeg or not use_jpeg) and image.format in ("JPEG", "PNG"):
+                    return path
+
+                resized = image.resize(target_size, Image.LANCZOS) if target_size != image.size else image.copy()
+
+        # Write to a temporary name first so concurrent builds never see a partly written file
+        temp_path = f"{cached_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        if use_jpeg:
+            resized.convert("RGB").save(temp_path, "JPEG", quality=self.jpeg_quality, optimize=True)
+        else:
+            resized.save(temp_path, "PNG", optimize=True)
+        os.replace(temp_path, cached_path)
+
+        return cached_path
+
+    def _target_size(self, size: tuple[int, int], width: Length, height: Length) -> tuple[int, int]:
+        """Returns the pixel size for an image shown at `width` x `height` (or `width` with its own aspect ratio)."""
+
+        image_width, image_height = size
+        target_width = min(image_width, max(1, round(width / Inches(1) * self.dpi)))
+
+        if height:
+            target_height = min(image_height, max(1, round(height / Inches(1) * self.dpi)))
+        else:
+            target_height = max(1, round(image_height * target_width / image_width))
+
+        return target_width, target_height
+
+@traced
+def add_image(slide: Slide, left: Inches, top: Inches, width: Inches, path: InputSource, height: Inches = Inches(0), preprocessor: Optional[ImagePreprocessor] = None) -> 'SlideShapes._Shape':
     """
     Adds an image to a slide at the specified position and size.
 
     If a height is provided, both width and height are used to scale the image. 
     Otherwise, only the width is used, and the height is scaled automatically.
+    If a preprocessor is given, the image is first downscaled to the size it is shown at.
+    The image can be a path or held in memory (see `open_input`), which is embedded without a temporary file.
+    """
+
+    image_path = preprocessor.prepare(path, width, height) if preprocessor else path
+
+    with open_input(image_path) as image_file:
+        if height != Inches(0):
+            picture = slide.shapes.add_picture(image_file, left, top, width, height)
+        else:
+            picture = slide.shapes.add_picture(image_file, left, top, width)
+
+    # Described by the file it was added from, even when its image part is shared with another picture or loaded from a cache
+    _describe(picture, path)
+    return picture
+
+@traced
+def replace_image(picture: BaseShape, path: InputSource, width: Inches, height: Inches = Inches(0), preprocessor: Optional[ImagePreprocessor] = None) -> tuple[Length, Length]:
     """
-    
-    if height != Inches(0):
-        return slide.shapes.add_picture(path, left, top, width, height) 
-    return slide.shapes.add_picture(path, left, top, width) 
\ No newline at end of file
+    Swaps the image shown by an existing picture for another, sized the way `add_image` would size it.
+
+    The picture is not resized; the (width, height) it should now have is returned. The previous image
+    is dropped from the slide unless another picture on the slide still shows it.
+    """
+
+    image_path = preprocessor.prepare(path, width, height) if preprocessor else path
+
+    slide_part = picture.part
+    with open_input(image_path) as image_file:
+        image_part = slide_part.package.get_or_add_image_part(image_file)
+
+    blip = picture._element.blipFill.blip
+    old_rId = blip.rEmbed
+    if slide_part.related_part(old_rId) is not image_part:
+        blip.rEmbed = None
+        if old_rId not in slide_part._element.xpath("//a:blip/@r:embed"):
+            slide_part.drop_rel(old_rId)
+        blip.rEmbed = slide_part.relate_to(image_part, RT.IMAGE)
+
+    _describe(picture, path)
+
+    # Truncated to whole EMUs, as python-pptx does when it writes a new picture
+    width, height = image_part.scale(width, height or None)
+    return Emu(int(width)), Emu(int(height))
+
+def _describe(picture: BaseShape, path: InputSource) -> None:
+    """Sets a picture's description to the name of its image file, or to python-pptx's generic name for an image without one."""
+
+    image_part = picture.part.related_part(picture._element.blipFill.blip.rEmbed)
+    picture._element.nvPicPr.cNvPr.set("descr", input_name(path) or f"image.{image_part.ext}")
\ No newline at end of file
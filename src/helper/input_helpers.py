@@ -0,0 +1,273 @@
+import hashlib
+import io
+import mmap
+import os
+import threading
+
+from typing import Any, BinaryIO, Dict, Iterable, Optional, Union
+
+# An input file given by its path, or held in memory: bytes, a memoryview, a memory-mapped file or a seekable binary file object
+InputSource = Union[str, os.PathLike, bytes, bytearray, memoryview, mmap.mmap, BinaryIO]
+
+# Serialises the seek-and-read of file objects, which several readers can share
+_file_object_lock = threading.Lock()
+
+# The prefetched inputs being served, if any. Checked on every input read, so it costs one global lookup when none are.
+_active_inputs: Optional['InputBuffers'] = None
+
+class InputBuffers:
+    """
+    The contents of a pack's input files, read ahead of rendering, by absolute path.
+
+    While active (`with buffers:`), the helpers that read CSV files, images and bullet point files get them
+    from memory through `open_input` and `input_stat` instead of from disk, so rendering does no input I/O.
+    Files that were not prefetched are still read from disk. Pages rendered on worker processes by
+    `BriefingPack.add_frames` are sent the prefetched files they read along with them (see `subset`).
+    """
+
+    def __init__(self, files: Dict[str, tuple[os.stat_result, bytes]]) -> None:
+        self.files = files
+
+    def __enter__(self) -> 'InputBuffers':
+        global _active_inputs
+
+        if _active_inputs is not None:
+            raise RuntimeError("Other prefetched inputs are already active")
+        _active_inputs = self
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        global _active_inputs
+
+        _active_inputs = None
+
+    def __contains__(self, path: Union[str, os.PathLike]) -> bool:
+        return os.path.abspath(path) in self.files
+
+    def __len__(self) -> int:
+        return len(self.files)
+
+    @property
+    def total_bytes(self) -> int:
+        return sum(len(data) for _, data in self.files.values())
+
+    def subset(self, paths: Iterable[Union[str, os.PathLike]]) -> 'InputBuffers':
+        """Returns the prefetched files among `paths`, to send to another process along with the frames that read them."""
+
+        files = {}
+        for path in paths:
+            path = os.path.abspath(path)
+            if path in self.files:
+                files[path] = self.files[path]
+        return InputBuffers(files)
+
+def active_inputs() -> Optional[InputBuffers]:
+    """Returns the prefetched inputs being served, or None."""
+
+    return _active_inputs
+
+def _prefetched(path: Union[str, os.PathLike]) -> Optional[tuple[os.stat_result, bytes]]:
+    inputs = _active_inputs
+    if inputs is None:
+        return None
+    return inputs.files.get(os.path.abspath(path))
+
+def is_path(source: Any) -> bool:
+    """Returns whether an input is given by its path."""
+
+    return isinstance(source, (str, os.PathLike))
+
+def is_memory_input(source: Any) -> bool:
+    """Returns whether an input is held in memory: bytes, a memoryview, a memory-mapped file or a binary file object."""
+
+    return isinstance(source, (bytes, bytearray, memoryview, mmap.mmap)) or (not is_path(source) and hasattr(source, "read"))
+
+def is_process_local_input(source: Any) -> bool:
+    """Returns whether an in-memory input cannot be sent to another process: a memoryview, a memory-mapped file or a file object."""
+
+    return is_memory_input(source) and not isinstance(source, (bytes, bytearray))
+
+def is_empty_input(source: Any) -> bool:
+    """Returns whether an input holds nothing: an empty path, a zero-length buffer or a BytesIO with an empty buffer."""
+
+    if is_path(source):
+        return not os.fspath(source)
+    if hasattr(source, "getbuffer"):
+        return source.getbuffer().nbytes == 0
+    if isinstance(source, (bytes, bytearray, memoryview, mmap.mmap)):
+        return (source.nbytes if isinstance(source, memoryview) else len(source)) == 0
+    return False
+
+def input_name(source: InputSource) -> Optional[str]:
+    """Returns the file name of an input: the base name of its path, or of the file a file object was opened from, or None."""
+
+    name = source if is_path(source) else getattr(source, "name", None)
+    return os.path.basename(name) if isinstance(name, (str, os.PathLike)) else None
+
+def input_digest(source: InputSource) -> str:
+    """Returns the SHA-256 of an in-memory input's bytes, hashing buffers in place."""
+
+    if not is_path(source) and hasattr(source, "getbuffer"):
+        source = source.getbuffer()
+    if isinstance(source, (bytes, bytearray, memoryview, mmap.mmap)):
+        with _byte_view(source) as view:
+            return hashlib.sha256(view).hexdigest()
+    with open_input(source) as file:
+        return hashlib.file_digest(file, "sha256").hexdigest()
+
+def open_input(path: InputSource) -> BinaryIO:
+    """
+    Opens an input file for reading as binary, from memory if it has been prefetched.
+
+    In-memory inputs are read where they are, without being copied first: buffers through a view of their bytes
+    (only the bytes each read returns are copied, see `_BufferReader`) and file objects from their start, through
+    a reader that leaves them open when it is closed.
+    """
+
+    if isinstance(path, (bytes, bytearray, memoryview, mmap.mmap)):
+        return _BufferReader(path)
+    if not is_path(path):
+        # BytesIO objects are read through their buffer rather than their file position
+        return _BufferReader(path.getbuffer()) if hasattr(path, "getbuffer") else _FileObjectReader(path)
+
+    prefetched = _prefetched(path)
+    if prefetched is not None:
+        return io.BytesIO(prefetched[1])
+    return open(path, 'rb')
+
+def input_stat(path: Union[str, os.PathLike]) -> os.stat_result:
+    """Returns the status of an input file, as it was when prefetched if it has been."""
+
+    prefetched = _prefetched(path)
+    if prefetched is not None:
+        return prefetched[0]
+    return os.stat(path)
+
+def is_input_file(path: Union[str, os.PathLike]) -> bool:
+    """Returns whether a path is an existing input file, without touching the disk if it has been prefetched."""
+
+    return _prefetched(path) is not None or os.path.isfile(path)
+
+def _byte_view(buffer: Union[bytes, bytearray, memoryview, mmap.mmap]) -> memoryview:
+    """Returns a flat view of a buffer's bytes."""
+
+    view = memoryview(buffer)
+    return view if view.ndim == 1 and view.format == "B" else view.cast("B")
+
+class _BufferReader(io.BufferedIOBase):
+    """
+    A read-only binary file over a buffer's bytes, sharing them instead of copying them the way BytesIO does.
+
+    The buffer is never copied whole up front, and `readinto` copies straight into the caller's buffer. Reading the
+    whole of a bytes object, or of a memoryview of all of one, returns the object itself; any other read, including
+    every read of a bytearray, memory map or other memoryview, returns a copy of the bytes read, as `read` must
+    return bytes. Readers like TextIOWrapper that read in chunks so only copy a chunk at a time. The view of the
+    buffer is released when the reader is closed, so a memory map can be closed after the inputs that read it.
+    """
+
+    def __init__(self, buffer: Union[bytes, bytearray, memoryview, mmap.mmap]) -> None:
+        self._view = _byte_view(buffer)
+        whole = buffer.obj if isinstance(buffer, memoryview) else buffer
+        self._bytes = whole if isinstance(whole, bytes) and self._view.c_contiguous and len(whole) == self._view.nbytes else None
+        self._position = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def read(self, size: Optional[int] = -1) -> bytes:
+        if self.closed:
+            raise ValueError("I/O operation on closed file")
+
+        start = min(self._position, len(self._view))
+        end = len(self._view) if size is None or size < 0 else min(start + size, len(self._view))
+        self._position = max(self._position, end)
+        if self._bytes is not None and start == 0 and end == len(self._bytes):
+            return self._bytes
+        return self._view[start:end].tobytes()
+
+    read1 = read
+
+    def readinto(self, buffer: Any) -> int:
+        if self.closed:
+            raise ValueError("I/O operation on closed file")
+
+        target = _byte_view(buffer)
+        start = min(self._position, len(self._view))
+        count = min(len(target), len(self._view) - start)
+        target[:count] = self._view[start:start + count]
+        self._position = start + count
+        return count
+
+    readinto1 = readinto
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if self.closed:
+            raise ValueError("I/O operation on closed file")
+
+        base = {io.SEEK_SET: 0, io.SEEK_CUR: self._position, io.SEEK_END: len(self._view)}[whence]
+        if base + offset < 0:
+            raise ValueError(f"Negative seek position {base + offset}")
+        self._position = base + offset
+        return self._position
+
+    def tell(self) -> int:
+        if self.closed:
+            raise ValueError("I/O operation on closed file")
+        return self._position
+
+    def close(self) -> None:
+        if not self.closed:
+            self._view.release()
+            self._bytes = None
+        super().close()
+
+class _FileObjectReader(io.BufferedIOBase):
+    """
+    Reads a caller's binary file object from its start, keeping a position of its own and leaving the file open.
+
+    Each read seeks the file to the reader's position first, under a lock, so readers in several threads can share it.
+    """
+
+    def __init__(self, file: BinaryIO) -> None:
+        self._file = file
+        self._position = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def read(self, size: Optional[int] = -1) -> bytes:
+        if self.closed:
+            raise ValueError("I/O operation on closed file")
+
+        with _file_object_lock:
+            self._file.seek(self._position)
+            data = self._file.read(-1 if size is None else size)
+        self._position += len(data)
+        return data
+
+    read1 = read
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if self.closed:
+            raise ValueError("I/O operation on closed file")
+
+        if whence == io.SEEK_END:
+            with _file_object_lock:
+                base = self._file.seek(0, io.SEEK_END)
+        else:
+            base = self._position if whence == io.SEEK_CUR else 0
+        if base + offset < 0:
+            raise ValueError(f"Negative seek position {base + offset}")
+        self._position = base + offset
+        return self._position
+
+    def tell(self) -> int:
+        if self.closed:
+            raise ValueError("I/O operation on closed file")
+        return self._position
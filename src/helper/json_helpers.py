@@ -1,18 +1,113 @@
-import json 
+import json
+import os
+
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+from .input_helpers import input_stat, open_input
+
+DEFAULT_BULLET_POINTS_PATH = "input/bullet_points.json"
+
+class BulletPointStore:
+    """
+    A cache of bullet points loaded from one or more JSON files.
+
+    Each source file is parsed once and every key is formatted up front, so repeated lookups
+    do not re-parse the file. A source is re-read only when its modification time or size changes.
+    When several sources define the same key, the source listed last wins. A key's value must be a list of
+    bullet points (which may nest lists); asking for a key with any other value raises a ValueError naming it,
+    while the other keys of its source can still be read.
+
+    Only the source paths are pickled, so a store sent to another process re-reads its files there on first use.
+    """
+
+    def __init__(self, json_file_paths: Union[str, Sequence[str]] = DEFAULT_BULLET_POINTS_PATH) -> None:
+        if isinstance(json_file_paths, str):
+            json_file_paths = [json_file_paths]
+
+        self.json_file_paths = list(json_file_paths)
+        self._sources: Dict[str, tuple[tuple[int, int], Dict[str, Optional[List[str]]]]] = {}
+
+    def __getstate__(self) -> Dict[str, Any]:
+        return {"json_file_paths": self.json_file_paths, "_sources": {}}
+
+    def add_source(self, json_file_path: str) -> None:
+        """Adds another JSON file to the store. Its keys take precedence over existing sources."""
+
+        if json_file_path not in self.json_file_paths:
+            self.json_file_paths.append(json_file_path)
+
+    def get(self, key: str) -> List[str]:
+        """Returns the formatted bullet points for a key, or an empty list if no source defines it."""
+
+        for json_file_path in reversed(self.json_file_paths):
+            index = self._index(json_file_path)
+            if key in index:
+                if index[key] is None:
+                    raise ValueError(f"Bullet points for '{key}' in '{json_file_path}' are not a list")
+                return list(index[key])
+        return []
+
+    def keys(self) -> List[str]:
+        """Returns every key defined across all sources."""
+
+        keys = {}
+        for json_file_path in self.json_file_paths:
+            keys.update(dict.fromkeys(self._index(json_file_path)))
+        return list(keys)
+
+    def invalidate(self, json_file_path: Optional[str] = None) -> None:
+        """Drops the cached index for one source, or for all sources if none is given."""
+
+        if json_file_path is None:
+            self._sources.clear()
+        else:
+            self._sources.pop(json_file_path, None)
+
+    def _index(self, json_file_path: str) -> Dict[str, Optional[List[str]]]:
+        """
+        Returns the formatted index for a source, re-parsing it if the file has changed on disk. Keys whose value
+        is not a list are indexed as None.
+        """
+
+        stat = input_stat(json_file_path)
+        signature = (stat.st_mtime_ns, stat.st_size)
+
+        cached = self._sources.get(json_file_path)
+        if cached and cached[0] == signature:
+            return cached[1]
+
+        with open_input(json_file_path) as file:
+            data = json.load(file)
+
+        index = {key: format_bullet_points(value) if isinstance(value, list) else None for key, value in data.items()}
+        self._sources[json_file_path] = (signature, index)
+        return index
+
+# Shared by load_bullet_points and frames that are not given a store of their own
+_default_stores: Dict[str, BulletPointStore] = {}
+
+def get_bullet_point_store(json_file_path: str = DEFAULT_BULLET_POINTS_PATH) -> BulletPointStore:
+    """Returns the shared store for a JSON file, creating it on first use."""
+
+    if json_file_path not in _default_stores:
+        _default_stores[json_file_path] = BulletPointStore(json_file_path)
+    return _default_stores[json_file_path]
+
+def resolve_bullet_points(key: str, bullet_point_store: Optional[BulletPointStore] = None) -> List[str]:
+    """Returns the bullet points for a key from a store, or from the shared default store if none is given."""
+
+    return (bullet_point_store or get_bullet_point_store()).get(key)
+
+def bullet_point_paths(bullet_point_store: Optional[BulletPointStore] = None) -> List[str]:
+    """Returns the JSON files a store reads, or the shared default store if none is given."""
+
+    return list((bullet_point_store or get_bullet_point_store()).json_file_paths)
 
 def load_bullet_points(json_file_path: str, key: str) -> list:
     """Loads the bullet points for a specific slide from a JSON file."""
-    
-    with open(json_file_path, 'r') as file:
-        data = json.load(file)
-    
+
     # Get the bullet points for the specified slide, return an empty list if not found
-    bullet_points = data.get(key)
-    
-    # Format the bullet points with proper indentation
-    formatted_bullet_points = format_bullet_points(bullet_points)
-    
-    return formatted_bullet_points
+    return get_bullet_point_store(json_file_path).get(key)
 
 def format_bullet_points(bullet_points, indent_level=0):
     """Formats the bullet points, handling indentation for nested points."""
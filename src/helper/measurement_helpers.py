@@ -0,0 +1,181 @@
+from functools import lru_cache
+from typing import TYPE_CHECKING, Dict, List, Sequence
+
+if TYPE_CHECKING:
+    import numpy as np
+
+# Advance widths of the printable ASCII characters (space to tilde) in 1/1000 em
+_ASCII_WIDTHS = {
+    "Calibri": [
+        226, 326, 401, 498, 507, 715, 682, 221, 303, 303, 498, 498, 250, 306, 252, 386,
+        507, 507, 507, 507, 507, 507, 507, 507, 507, 507, 268, 268, 498, 498, 498, 463,
+        894, 579, 544, 533, 615, 488, 459, 631, 623, 252, 319, 520, 420, 855, 646, 662,
+        517, 673, 543, 459, 487, 642, 567, 890, 519, 487, 468, 307, 386, 307, 498, 498,
+        291, 479, 525, 423, 525, 498, 305, 471, 525, 229, 239, 455, 229, 799, 525, 527,
+        525, 525, 349, 391, 335, 525, 452, 715, 433, 453, 395, 314, 460, 314, 498,
+    ],
+    "Calibri Bold": [
+        226, 326, 438, 498, 507, 729, 705, 233, 312, 312, 498, 498, 258, 306, 267, 430,
+        507, 507, 507, 507, 507, 507, 507, 507, 507, 507, 276, 276, 498, 498, 498, 463,
+        898, 606, 561, 529, 630, 488, 459, 637, 631, 267, 331, 547, 423, 874, 659, 676,
+        532, 686, 563, 473, 495, 653, 591, 906, 551, 520, 478, 325, 430, 325, 498, 498,
+        300, 494, 537, 418, 537, 503, 316, 474, 537, 246, 255, 480, 246, 813, 537, 538,
+        537, 537, 355, 399, 347, 537, 473, 745, 459, 474, 397, 344, 475, 344, 498,
+    ],
+    "Arial": [
+        278, 278, 355, 556, 556, 889, 667, 191, 333, 333, 389, 584, 278, 333, 278, 278,
+        556, 556, 556, 556, 556, 556, 556, 556, 556, 556, 278, 278, 584, 584, 584, 556,
+        1015, 667, 667, 722, 722, 667, 611, 778, 722, 278, 500, 667, 556, 833, 722, 778,
+        667, 778, 722, 667, 611, 722, 667, 944, 667, 667, 611, 278, 278, 278, 469, 556,
+        333, 556, 556, 500, 556, 556, 278, 556, 556, 222, 222, 500, 222, 833, 556, 556,
+        556, 556, 333, 500, 278, 556, 500, 722, 500, 500, 500, 334, 260, 334, 584,
+    ],
+}
+
+# Widths of the non-ASCII characters that appear in our bullet points and tables
+_EXTRA_WIDTHS = {
+    "Calibri": {"•": 498, "–": 498, "—": 905, "‘": 250, "’": 250, "“": 418, "”": 418, "£": 507, "€": 507, "°": 342, " ": 226},
+    "Calibri Bold": {"•": 498, "–": 498, "—": 905, "‘": 258, "’": 258, "“": 438, "”": 438, "£": 507, "€": 507, "°": 342, " ": 226},
+    "Arial": {"•": 350, "–": 556, "—": 1000, "‘": 222, "’": 222, "“": 333, "”": 333, "£": 556, "€": 556, "°": 400, " ": 278},
+}
+
+# Default line spacing (ascent + descent + line gap) as a multiple of the font size
+_LINE_SPACING = {"Calibri": 1.22, "Calibri Bold": 1.22, "Arial": 1.15}
+
+# Metric-compatible fonts share a table
+_FONT_ALIASES = {"Carlito": "Calibri", "Helvetica": "Arial", "Liberation Sans": "Arial"}
+
+# Unknown characters are assumed to be half an em wide
+_FALLBACK_WIDTH = 500
+
+# PowerPoint's default left + right text box insets (0.1 inch each), in inches
+TEXTBOX_HORIZONTAL_INSETS = 0.2
+
+_char_widths: Dict[str, Dict[str, int]] = {}
+
+# Advance widths of the Basic Multilingual Plane by font, for measuring many texts at once
+_width_tables: Dict[str, 'np.ndarray'] = {}
+
+def _font_key(font: str, bold: bool) -> str:
+    font = _FONT_ALIASES.get(font, font)
+    if font not in _ASCII_WIDTHS:
+        raise ValueError(f"No metrics for font: {font}")
+    if bold and f"{font} Bold" in _ASCII_WIDTHS:
+        return f"{font} Bold"
+    return font
+
+def _widths(font_key: str) -> Dict[str, int]:
+    """Returns a character to advance width map for a font, built on first use."""
+
+    if font_key not in _char_widths:
+        widths = {chr(32 + i): width for i, width in enumerate(_ASCII_WIDTHS[font_key])}
+        widths.update(_EXTRA_WIDTHS.get(font_key, {}))
+        _char_widths[font_key] = widths
+    return _char_widths[font_key]
+
+def text_width(text: str, font_size_pt: float, font: str = "Calibri", bold: bool = False) -> float:
+    """Returns the width of a single line of text in inches."""
+
+    widths = _widths(_font_key(font, bold))
+    units = sum(widths.get(char, _FALLBACK_WIDTH) for char in text)
+    return units * font_size_pt / 1000 / 72
+
+def text_units(texts: Sequence[str], font: str = "Calibri", bold: bool = False) -> 'np.ndarray':
+    """
+    Returns the width of each text on a single line in 1/1000 em, measuring them all in one vectorised pass.
+
+    The widths do not depend on the font size: multiply by the size in points and divide by 72000 for inches.
+    """
+
+    import numpy as np
+
+    font_key = _font_key(font, bold)
+    table = _width_tables.get(font_key)
+    if table is None:
+        table = np.full(0x10000, _FALLBACK_WIDTH, dtype=np.int64)
+        for char, width in _widths(font_key).items():
+            table[ord(char)] = width
+        _width_tables[font_key] = table
+
+    lengths = np.fromiter(map(len, texts), dtype=np.int64, count=len(texts))
+    codes = np.frombuffer("".join(texts).encode("utf-32-le"), dtype=np.uint32)
+    units = np.where(codes < 0x10000, table[np.minimum(codes, 0xFFFF)], _FALLBACK_WIDTH)
+
+    totals = np.concatenate(([0], np.cumsum(units)))
+    ends = np.cumsum(lengths)
+    return totals[ends] - totals[ends - lengths]
+
+def line_height(font_size_pt: float, font: str = "Calibri", bold: bool = False) -> float:
+    """Returns the height of one line of text in inches at single line spacing."""
+
+    return _LINE_SPACING[_font_key(font, bold)] * font_size_pt / 72
+
+@lru_cache(maxsize=65536)
+def count_lines(text: str, font_size_pt: float, max_width_inch: float, font: str = "Calibri", bold: bool = False) -> int:
+    """
+    Returns the number of lines a paragraph wraps to in a box `max_width_inch` wide, after the text box insets.
+
+    Lines are broken greedily at spaces, the way PowerPoint does; a word wider than the box is broken
+    between characters. Line feeds and vertical tabs start new lines. Results are memoised.
+
+    An empty paragraph still takes one line, as it does in a table cell. Text boxes measured with
+    `measure_text_height` and `measure_bullet_points` take no lines for blank text instead.
+    """
+
+    widths = _widths(_font_key(font, bold))
+    # Work in font units to avoid converting every character
+    available = (max_width_inch - TEXTBOX_HORIZONTAL_INSETS) * 72 * 1000 / font_size_pt
+    space = widths[" "]
+
+    lines = 0
+    for segment in text.replace("\v", "\n").split("\n"):
+        lines += 1
+
+        # Leading spaces (used to indent nested bullets) take up room on the first line
+        stripped = segment.lstrip(" ")
+        line = (len(segment) - len(stripped)) * space
+
+        for index, word in enumerate(stripped.split(" ")):
+            word_width = sum(widths.get(char, _FALLBACK_WIDTH) for char in word)
+            gap = space if index else 0
+
+            if line + gap + word_width <= available:
+                line += gap + word_width
+                continue
+
+            if line > 0:
+                lines += 1
+                line = 0
+
+            # Break words that do not fit on a line of their own
+            if word_width > available:
+                for char in word:
+                    char_width = widths.get(char, _FALLBACK_WIDTH)
+                    if line + char_width > available and line > 0:
+                        lines += 1
+                        line = 0
+                    line += char_width
+            else:
+                line = word_width
+
+    return lines
+
+def measure_text_height(text: str, font_size_pt: float, max_width_inch: float, font: str = "Calibri", bold: bool = False) -> float:
+    """
+    Returns the height in inches of a paragraph wrapped to a text box `max_width_inch` wide.
+
+    Text that is empty or only whitespace has no height, so an empty text box is not given a line it does not show.
+    """
+
+    return _text_box_lines(text, font_size_pt, max_width_inch, font, bold) * line_height(font_size_pt, font, bold)
+
+def measure_bullet_points(bullet_points: Sequence[str], font_size_pt: float, max_width_inch: float, font: str = "Calibri", bold: bool = False) -> List[float]:
+    """Returns the height in inches of each bullet point, each one being its own paragraph, in one call. Blank points have no height."""
+
+    height = line_height(font_size_pt, font, bold)
+    return [_text_box_lines(point, font_size_pt, max_width_inch, font, bold) * height for point in bullet_points]
+
+def _text_box_lines(text: str, font_size_pt: float, max_width_inch: float, font: str, bold: bool) -> int:
+    """Returns the lines a text box's paragraph wraps to: none for blank text, as the original estimate gave."""
+
+    return count_lines(text, font_size_pt, max_width_inch, font, bold) if text.strip() else 0
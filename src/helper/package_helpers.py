@@ -0,0 +1,134 @@
+import io
+import os
+import threading
+import zipfile
+
+from typing import IO, Container, List, Optional, Union
+
+from pptx.opc.oxml import serialize_part_xml
+from pptx.opc.package import Part
+from pptx.opc.packuri import CONTENT_TYPES_URI, PACKAGE_URI
+from pptx.opc.serialized import _ContentTypesItem
+from pptx.presentation import Presentation
+
+from ..tracing import traced
+
+# Named compression settings, mapped to zlib levels (None stores parts uncompressed)
+COMPRESSION_LEVELS = {"store": None, "fast": 1, "default": 6, "max": 9}
+
+Compression = Union[str, int, None]
+
+# Parts that are compressed already, which deflating again barely shrinks or even grows, so they are always stored
+STORED_EXTENSIONS = {"png", "jpg", "jpeg", "gif", "xlsx"}
+
+# Every member gets the same timestamp (1 Jan 1980, the earliest a ZIP can hold) so identical packs produce identical files
+_DATE_TIME = (1980, 1, 1, 0, 0, 0)
+
+class PackageArchive:
+    """
+    The members of a saved .pptx file.
+
+    Lets a presentation loaded from the file be written back with the contents of its unchanged parts taken from
+    the file as they are, instead of being serialised again.
+    """
+
+    def __init__(self, blob: bytes) -> None:
+        self._archive = zipfile.ZipFile(io.BytesIO(blob))
+        self._names = set(self._archive.namelist())
+
+    def read(self, name: str) -> Optional[bytes]:
+        """Returns the uncompressed bytes of a member, or None if there is no such member."""
+
+        return self._archive.read(name) if name in self._names else None
+
+def compression_level(compression: Compression) -> Optional[int]:
+    """
+    Returns the zlib level for a compression setting, or None to store parts uncompressed.
+
+    `compression` is one of the names in COMPRESSION_LEVELS or a zlib level from 0 (store) to 9.
+    """
+
+    if compression is None:
+        return None
+    if isinstance(compression, str):
+        if compression not in COMPRESSION_LEVELS:
+            raise ValueError(f"Unknown compression: {compression}. Expected one of {', '.join(COMPRESSION_LEVELS)} or 0-9")
+        return COMPRESSION_LEVELS[compression]
+    if not 0 <= compression <= 9:
+        raise ValueError(f"Compression level must be between 0 and 9, got {compression}")
+    return compression or None
+
+@traced
+def package_members(prs: Presentation, original: Optional[PackageArchive] = None, unchanged_parts: Container[Part] = ()) -> List[tuple[str, bytes]]:
+    """
+    Serialises a presentation into its ZIP members, in the order python-pptx writes them.
+
+    That is the content types, the package relationships, then each part followed by its relationships, if any.
+    Given the `original` archive the presentation was loaded from, the members of `unchanged_parts` are read from
+    it instead of the parts being serialised again.
+    """
+
+    package = prs.part.package
+    parts = tuple(package.iter_parts())
+
+    members = [
+        (CONTENT_TYPES_URI.membername, serialize_part_xml(_ContentTypesItem.xml_for(parts))),
+        (PACKAGE_URI.rels_uri.membername, package._rels.xml),
+    ]
+    for part in parts:
+        stored = original is not None and part in unchanged_parts
+        members.append((part.partname.membername, (stored and original.read(part.partname.membername)) or part.blob))
+        if part._rels:
+            members.append((part.partname.rels_uri.membername, (stored and original.read(part.partname.rels_uri.membername)) or part.rels.xml))
+
+    return members
+
+@traced
+def write_package(prs: Presentation, file: Union[str, os.PathLike, IO[bytes]], compression: Compression = "default", original: Optional[PackageArchive] = None, unchanged_parts: Container[Part] = ()) -> None:
+    """
+    Writes a presentation as a .pptx file to a path or a writable binary stream.
+
+    Parts are deflated at the `compression` level, except images and embedded workbooks, which are compressed
+    already and are stored as they are (see STORED_EXTENSIONS). Members carry a fixed timestamp, so the same
+    presentation always produces the same bytes. A file path is written through a temporary file, so a failed save
+    leaves any file already there untouched. Given the `original` archive the presentation was loaded from,
+    `unchanged_parts` are read from it (see `package_members`).
+
+    Parts are deflated one after another. With images stored, deflating the large slide XML is about a third of a
+    default save (see benchmarks/save_compression.py), and zipfile has no public way to write members deflated
+    elsewhere, so they are not compressed in parallel.
+    """
+
+    level = compression_level(compression)
+    members = package_members(prs, original, unchanged_parts)
+
+    if not isinstance(file, (str, os.PathLike)):
+        _write_zip(file, members, level)
+        return
+
+    temp_path = f"{os.fspath(file)}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(temp_path, 'wb') as stream:
+            _write_zip(stream, members, level)
+        os.replace(temp_path, file)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+def package_bytes(prs: Presentation, compression: Compression = "default") -> bytes:
+    """Returns a presentation as the bytes of a .pptx file, without touching the disk."""
+
+    stream = io.BytesIO()
+    write_package(prs, stream, compression)
+    return stream.getvalue()
+
+def _write_zip(stream: IO[bytes], members: List[tuple[str, bytes]], level: Optional[int]) -> None:
+    with zipfile.ZipFile(stream, 'w') as archive:
+        for name, data in members:
+            info = zipfile.ZipInfo(name, _DATE_TIME)
+            # Recorded as made on MS-DOS whichever system saves the pack, so packs saved on Windows and Linux are identical
+            info.create_system = 0
+            stored = level is None or name.rpartition(".")[2].lower() in STORED_EXTENSIONS
+            info.compress_type = zipfile.ZIP_STORED if stored else zipfile.ZIP_DEFLATED
+            archive.writestr(info, data, compresslevel = None if stored else level)
@@ -0,0 +1,145 @@
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from lxml import etree
+from pptx.oxml.ns import qn
+
+# The extension every record is written in, inside the extension list PowerPoint keeps for tools of its own
+RECORD_EXTENSION_URI = "{8F2C5A71-3E94-4B6D-A0C8-D51E7B29F463}"
+RECORD_NAMESPACE = "urn:briefing-pack:record"
+
+# Pack metadata that appears in the header and footer, in BriefingPack argument order
+METADATA_FIELDS = ("reference_number", "classification", "code_version", "job_id")
+
+@dataclass
+class BlockRecord:
+    """The shapes one layout block created and a fingerprint of what it was filled with."""
+
+    block_type: str
+    shape_ids: List[int]
+    fingerprint: str
+
+@dataclass
+class SlideRecord:
+    """
+    What a refreshable pack records about each slide: the type of frame it shows, a fingerprint of the frame's
+    content, the shapes of each block of its layout, of its title and of its own header and footer text.
+    """
+
+    frame_type: str
+    fingerprint: str
+    blocks: List[BlockRecord]
+    title_shape_id: Optional[int] = None
+    chrome_shape_ids: List[int] = field(default_factory=list)
+
+@dataclass
+class PackRecord:
+    """
+    What a refreshable pack records about itself: the settings it was built with, the metadata in its header and
+    footer and, when they are in the slide layout, the shapes of their text.
+    """
+
+    chrome_in_layout: bool
+    shared_styles: bool
+    metadata: Dict[str, str]
+    chrome_shape_ids: List[int] = field(default_factory=list)
+
+def write_slide_record(element: etree._Element, record: SlideRecord) -> None:
+    """Writes a slide's record into its XML, replacing any it already holds."""
+
+    frame = etree.Element(_tag("frame"), nsmap={"bp": RECORD_NAMESPACE})
+    frame.set("type", record.frame_type)
+    frame.set("fingerprint", record.fingerprint)
+    if record.title_shape_id is not None:
+        frame.set("title", str(record.title_shape_id))
+    if record.chrome_shape_ids:
+        frame.set("chrome", _ids(record.chrome_shape_ids))
+
+    for block in record.blocks:
+        etree.SubElement(frame, _tag("block"), {"type": block.block_type, "shapes": _ids(block.shape_ids), "fingerprint": block.fingerprint})
+
+    _write(element, frame)
+
+def read_slide_record(element: etree._Element) -> Optional[SlideRecord]:
+    """Returns the record written into a slide's XML, or None if it has none."""
+
+    frame = _read(element, "frame")
+    if frame is None:
+        return None
+
+    blocks = [BlockRecord(block.get("type"), _parse_ids(block.get("shapes")), block.get("fingerprint")) for block in frame.iterchildren(_tag("block"))]
+    title = frame.get("title")
+    return SlideRecord(frame.get("type"), frame.get("fingerprint"), blocks, int(title) if title else None, _parse_ids(frame.get("chrome")))
+
+def write_pack_record(element: etree._Element, record: PackRecord) -> None:
+    """Writes a pack's record into its presentation XML, replacing any it already holds."""
+
+    pack = etree.Element(_tag("pack"), nsmap={"bp": RECORD_NAMESPACE})
+    pack.set("chromeInLayout", "1" if record.chrome_in_layout else "0")
+    pack.set("sharedStyles", "1" if record.shared_styles else "0")
+    for name in METADATA_FIELDS:
+        pack.set(_attribute(name), record.metadata[name])
+    if record.chrome_shape_ids:
+        pack.set("chrome", _ids(record.chrome_shape_ids))
+
+    _write(element, pack)
+
+def read_pack_record(element: etree._Element) -> Optional[PackRecord]:
+    """Returns the record written into a pack's presentation XML, or None if it has none."""
+
+    pack = _read(element, "pack")
+    if pack is None:
+        return None
+
+    metadata = {name: pack.get(_attribute(name), "") for name in METADATA_FIELDS}
+    return PackRecord(pack.get("chromeInLayout") == "1", pack.get("sharedStyles") == "1", metadata, _parse_ids(pack.get("chrome")))
+
+def remove_record(element: etree._Element) -> None:
+    """Removes the record written into a slide's or pack's XML, if it holds one, along with an extension list left empty."""
+
+    extLst = element.find(qn("p:extLst"))
+    if extLst is None:
+        return
+
+    for ext in extLst.findall(qn("p:ext")):
+        if ext.get("uri") == RECORD_EXTENSION_URI:
+            extLst.remove(ext)
+    if len(extLst) == 0:
+        element.remove(extLst)
+
+def _tag(name: str) -> str:
+    return f"{{{RECORD_NAMESPACE}}}{name}"
+
+def _attribute(name: str) -> str:
+    """The camel case attribute a metadata field is written as, e.g. referenceNumber."""
+
+    first, *rest = name.split("_")
+    return first + "".join(word.title() for word in rest)
+
+def _ids(shape_ids: List[int]) -> str:
+    return " ".join(str(shape_id) for shape_id in shape_ids)
+
+def _parse_ids(text: Optional[str]) -> List[int]:
+    return [int(shape_id) for shape_id in text.split()] if text else []
+
+def _write(element: etree._Element, record: etree._Element) -> None:
+    """Puts a record in the element's extension list, which comes last among its children, replacing the previous one."""
+
+    extLst = element.find(qn("p:extLst"))
+    if extLst is None:
+        extLst = etree.SubElement(element, qn("p:extLst"))
+
+    for ext in extLst.iterchildren(qn("p:ext")):
+        if ext.get("uri") == RECORD_EXTENSION_URI:
+            ext.clear()
+            ext.set("uri", RECORD_EXTENSION_URI)
+            break
+    else:
+        ext = etree.SubElement(extLst, qn("p:ext"), {"uri": RECORD_EXTENSION_URI})
+    ext.append(record)
+
+def _read(element: etree._Element, name: str) -> Optional[etree._Element]:
+    for ext in element.iterfind(f"{qn('p:extLst')}/{qn('p:ext')}"):
+        if ext.get("uri") == RECORD_EXTENSION_URI:
+            return ext.find(_tag(name))
+    return None
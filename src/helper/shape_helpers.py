@@ -1,5 +1,8 @@
+from typing import Dict, Iterable
+
 from pptx.enum.shapes import MSO_CONNECTOR
 from pptx.dml.color import RGBColor
+from pptx.shapes.base import BaseShape
 from pptx.util import Inches
 from pptx.slide import Slide
 from pptx.shapes.shapetree import SlideShapes
@@ -19,4 +22,17 @@ def add_line(slide: Slide, start_x: Inches, end_x: Inches, y: Inches) -> 'SlideS
     # Set the thickness of the line
     line.line.width = Inches(0.01) 
 
-    return line
\ No newline at end of file
+    return line
+
+def shapes_by_id(slide: Slide, shape_ids: Iterable[int]) -> Dict[int, BaseShape]:
+    """Returns the shapes of a slide with the given ids, without creating a shape object for every other shape."""
+
+    wanted = set(shape_ids)
+    shapes = {}
+
+    # The first child of every shape element holds its non-visual properties, including its id
+    for cNvPr in slide.shapes._spTree.xpath("./*/*[1]/p:cNvPr"):
+        shape_id = int(cNvPr.get("id"))
+        if shape_id in wanted:
+            shapes[shape_id] = slide.shapes._shape_factory(cNvPr.getparent().getparent())
+    return shapes
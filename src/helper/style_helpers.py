@@ -0,0 +1,99 @@
+import weakref
+
+from typing import Optional
+
+from lxml import etree
+from pptx.opc.constants import RELATIONSHIP_TYPE as RT
+from pptx.opc.package import Part
+from pptx.oxml import parse_xml
+from pptx.oxml.ns import nsdecls, qn
+from pptx.presentation import Presentation as PresentationType
+from pptx.text.text import TextFrame
+
+# Table style registered by `register_shared_styles`: black text on white cells with thin black borders
+SHARED_TABLE_STYLE_ID = "{3B4E9A6C-2D71-4F0A-9C58-7E1B5D2A8F40}"
+
+_BORDER_LINE = (
+    '<a:ln w="12700" cap="flat" cmpd="sng" algn="ctr">'
+    '<a:solidFill><a:srgbClr val="000000"/></a:solidFill>'
+    '<a:prstDash val="solid"/><a:round/>'
+    '<a:headEnd type="none" w="med" len="med"/><a:tailEnd type="none" w="med" len="med"/>'
+    '</a:ln>'
+)
+
+_TABLE_STYLE_XML = (
+    f'<a:tblStyle {nsdecls("a")} styleId="{SHARED_TABLE_STYLE_ID}" styleName="Briefing Pack Table">'
+    '<a:wholeTbl>'
+    '<a:tcTxStyle><a:fontRef idx="minor"><a:prstClr val="black"/></a:fontRef><a:srgbClr val="000000"/></a:tcTxStyle>'
+    '<a:tcStyle><a:tcBdr>'
+    + "".join(f'<a:{edge}>{_BORDER_LINE}</a:{edge}>' for edge in ("left", "right", "top", "bottom", "insideH", "insideV"))
+    + '</a:tcBdr><a:fill><a:solidFill><a:srgbClr val="FFFFFF"/></a:solidFill></a:fill></a:tcStyle>'
+    '</a:wholeTbl>'
+    '</a:tblStyle>'
+)
+
+# The base font size, in points, of the shared styles of each package looked at, or None if it has none
+_shared_font_sizes: 'weakref.WeakKeyDictionary[object, Optional[int]]' = weakref.WeakKeyDictionary()
+
+def register_shared_styles(prs: PresentationType, font_size: int) -> None:
+    """
+    Registers the styles slides rely on instead of formatting every cell and run, once per presentation.
+
+    The presentation's default text style is set to `font_size` at every level, and the briefing pack table style
+    (borders, white fill and black text) is added to its table styles. Text and tables created in the presentation
+    afterwards only write the formatting that differs from these. Registering again is harmless.
+    """
+
+    size = str(font_size * 100)
+    for level_pPr in prs.part._element.xpath("p:defaultTextStyle/*"):
+        defRPr = level_pPr.find(qn("a:defRPr"))
+        if defRPr is None:
+            defRPr = etree.SubElement(level_pPr, qn("a:defRPr"))
+        defRPr.set("sz", size)
+
+    styles_part = prs.part.part_related_by(RT.TABLE_STYLES)
+    styles = parse_xml(styles_part.blob)
+    if all(style.get("styleId") != SHARED_TABLE_STYLE_ID for style in styles.iter(qn("a:tblStyle"))):
+        styles.append(parse_xml(_TABLE_STYLE_XML))
+        # python-pptx does not parse the table styles part, so it is saved from its blob
+        styles_part._blob = etree.tostring(styles, xml_declaration=True, encoding="UTF-8", standalone=True)
+
+    _shared_font_sizes[prs.part.package] = font_size
+
+def shared_font_size(part: Part) -> Optional[int]:
+    """
+    Returns the base font size of the shared styles registered in the package a part belongs to, or None if there are none.
+
+    A package opened from a file, such as a pack being refreshed or a template being stamped, is looked at once:
+    it has shared styles if its table styles include the briefing pack style, and their size is its default text size.
+    """
+
+    package = part.package
+    if package not in _shared_font_sizes:
+        _shared_font_sizes[package] = _registered_font_size(package.presentation_part)
+    return _shared_font_sizes[package]
+
+def _registered_font_size(presentation_part: Part) -> Optional[int]:
+    """Returns the default text size of a presentation whose table styles include the briefing pack style, or None."""
+
+    try:
+        styles_part = presentation_part.part_related_by(RT.TABLE_STYLES)
+    except KeyError:
+        return None
+    if SHARED_TABLE_STYLE_ID.encode() not in styles_part.blob:
+        return None
+
+    sizes = presentation_part._element.xpath("p:defaultTextStyle/a:lvl1pPr/a:defRPr/@sz")
+    return int(sizes[0]) // 100 if sizes else None
+
+def set_list_style_size(text_frame: TextFrame, font_size: Optional[int]) -> None:
+    """Sets the font size every paragraph of a text frame inherits, or removes it with None, in place of a size on each paragraph."""
+
+    lstStyle = text_frame._txBody.find(qn("a:lstStyle"))
+    if lstStyle is None:
+        lstStyle = etree.Element(qn("a:lstStyle"))
+        text_frame._txBody.insert(1, lstStyle)
+    lstStyle.clear()
+
+    if font_size is not None:
+        lstStyle.append(parse_xml(f'<a:lvl1pPr {nsdecls("a")}><a:defRPr sz="{font_size * 100}"/></a:lvl1pPr>'))
@@ -1,10 +1,13 @@
-import pandas as pd
+import math
+import re
 
-from typing import Any, List
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, List, Mapping, NamedTuple, Optional, Sequence, Tuple, Union
 
 from pptx.dml.color import RGBColor
 from pptx.slide import Slide
-from pptx.util import Pt, Inches
+from pptx.util import Emu, Pt, Inches
 
 from pptx.shapes.base import BaseShape
 from pptx.text.text import TextFrame
@@ -13,70 +16,328 @@ from pptx.table import Table
 from pptx.oxml.xmlchemy import OxmlElement
 from pptx.table import _Cell
 
-from .text_helpers import add_textbox
+from .text_helpers import add_textbox, set_textbox_text
+from .measurement_helpers import TEXTBOX_HORIZONTAL_INSETS, count_lines, line_height, text_units
+from .table_xml_helpers import create_and_populate_table_xml, replace_table_xml
+from .csv_helpers import CsvTable, is_dataframe, read_plain_csv
+from .input_helpers import InputSource, is_empty_input, is_memory_input, is_path, open_input
+from .table_style_helpers import DEFAULT_FILL, TableStyle, style_cells
+from ..tracing import traced
 
-def calculate_table_height(table: Table) -> Inches:
-    """Calculates the total height of a table based on its number of rows and font size."""
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
 
-    font_size = int(table.cell(0, 0).text_frame.paragraphs[0].font.size.pt)
+# A table can be given as a CSV file (a path, or CSV bytes held in memory, see InputSource), an in-memory DataFrame, or a list of rows.
+# A list of rows is either a list of dicts keyed by column name, or a list of sequences whose first row is the header.
+TableSource = Union[InputSource, 'pd.DataFrame', CsvTable, Sequence[Sequence[Any]], Sequence[Mapping[str, Any]]]
+
+# Loaded table data: a DataFrame, or a CsvTable for plain CSV files, which both offer `columns`, `shape` and `itertuples`
+TableData = Union['pd.DataFrame', CsvTable]
+
+@traced
+def load_table_data(source: TableSource) -> TableData:
+    """
+    Loads table data into a DataFrame, or a CsvTable for a plain CSV file.
+
+    CSV files are read once, in place when they are held in memory; DataFrames and CsvTables are passed through unchanged so callers can reuse data they already hold.
+    Plain CSV files (see `read_plain_csv`) are read without pandas, which is only imported for the inputs that need it.
+    """
+
+    if isinstance(source, CsvTable) or is_dataframe(source):
+        return source
+    is_csv = is_path(source) or is_memory_input(source)
+    if is_csv:
+        table = read_plain_csv(source)
+        if table is not None:
+            return table
+
+    import pandas as pd
+
+    if is_csv:
+        with open_input(source) as file:
+            return pd.read_csv(file)
+
+    rows = list(source)
+    if not rows:
+        return pd.DataFrame()
+    if isinstance(rows[0], Mapping):
+        return pd.DataFrame(rows)
+    return pd.DataFrame(rows[1:], columns=list(rows[0]))
+
+def has_table_data(source: TableSource) -> bool:
+    """Returns whether a table source was supplied. None, empty paths and zero-length buffers mean no table."""
+
+    return source is not None and not is_empty_input(source)
+
+# Geometry of the tables created by add_table
+TABLE_FONT_SIZE = 7
+TABLE_TITLE_OFFSET = Inches(0.22) # Gap between the top of the title and the top of the table
+TABLE_INDENT = Inches(0.05) # The table sits slightly right of its title
+SECOND_COLUMN_WIDTH = Inches(1.8)
+
+# PowerPoint's default top + bottom cell margins (0.05 inch each), in inches
+CELL_VERTICAL_MARGINS = 0.1
+
+# Width of the empty first column holding the row colours when the other columns are fitted to their content
+MARKER_COLUMN_WIDTH = Inches(0.15)
+
+_LINE_BREAKS = re.compile("\n|\v")
+
+def table_row_height(font_size: int) -> float:
+    """Returns the height in inches of a table row holding a single line of text at the given font size."""
+
+    return line_height(font_size) + CELL_VERTICAL_MARGINS
+
+def measure_table_row(cells: Sequence[Any], column_widths: Sequence[int], font_size: int = TABLE_FONT_SIZE) -> float:
+    """Returns the height in inches of a table row whose cells wrap to the widths of their columns."""
+
+    lines = max((count_lines(str(cell), font_size, width / Inches(1)) for cell, width in zip(cells, column_widths)), default=1)
+    return lines * line_height(font_size) + CELL_VERTICAL_MARGINS
+
+def table_column_widths(columns: int, table_width: Inches) -> List[int]:
+    """Returns the column widths add_table gives a table: an even split of `table_width` with a wider second column."""
+
+    width = table_width // columns
+    widths = [width] * (columns - 1) + [table_width - (columns - 1) * width]
+    widths[1] = SECOND_COLUMN_WIDTH
+    return widths
+
+@dataclass(frozen=True)
+class TableFit:
+    """Column widths and row heights in EMU that fit a table to its content, starting with the row colour column and the header row."""
+
+    column_widths: Tuple[int, ...]
+    row_heights: Tuple[int, ...]
+
+    @property
+    def width(self) -> int:
+        return sum(self.column_widths)
+
+    @property
+    def height(self) -> int:
+        return sum(self.row_heights)
+
+class _ColumnMetrics(NamedTuple):
+    line_units: 'np.ndarray' # Width of the longest line of each cell, in 1/1000 em
+    lines: 'np.ndarray' # Number of lines of each cell before wrapping
+    widest: int # Width of the longest line in the column
+    longest_word: int # Width of the longest word in the column
+
+@traced
+def fit_table(header: Sequence[Any], rows: Sequence[Sequence[Any]], table_width: int, font_size: int = TABLE_FONT_SIZE) -> TableFit:
+    """
+    Returns column widths that share `table_width` between the columns by their content, and the height of each row at those widths.
+
+    After a narrow row colour column, columns get the width of their longest line when the table is wide enough, with the
+    rest of the width shared in proportion. Otherwise columns are kept as wide as their longest word and the columns that
+    must wrap share what is left by how much more they would need. Each row is as tall as its most wrapped cell, at any
+    font size. Columns are measured in a vectorised pass, and measurements are cached by column content, font size and
+    width, so tables repeating the same data are not measured again.
+    """
+
+    columns = [tuple(map(str, column)) for column in zip(header, *rows)] if rows else [(str(name),) for name in header]
+    return _fit_columns(columns, table_width, font_size)
+
+@traced
+def fit_table_data(data: TableData, table_width: int, style: Optional[TableStyle] = None, font_size: int = TABLE_FONT_SIZE) -> TableFit:
+    """Fits a table of loaded data to its content (see `fit_table`), measuring cells as `style` formats them."""
+
+    if style:
+        return fit_table(list(data.columns), style_cells(data, style)[0], table_width, font_size)
+    if not is_dataframe(data):
+        return fit_table(list(data.columns), list(data.itertuples(index=False)), table_width, font_size)
+
+    # Stringify a column at a time rather than a row of numpy scalars at a time
+    columns = [(str(name), *data.iloc[:, index].to_numpy(dtype=object).astype(str).tolist()) for index, name in enumerate(data.columns)]
+    return _fit_columns(columns, table_width, font_size)
+
+def _fit_columns(columns: List[Tuple[str, ...]], table_width: int, font_size: int) -> TableFit:
+    """Fits a table given as the text of each column, header first (see `fit_table`)."""
+
+    import numpy as np
+
+    metrics = [_column_metrics(column) for column in columns]
+
+    widths = _share_width(
+        table_width - MARKER_COLUMN_WIDTH,
+        [_units_to_emu(column.widest, font_size) for column in metrics],
+        [_units_to_emu(column.longest_word, font_size) for column in metrics],
+    )
+
+    line_counts = [_column_lines(column, font_size, width) for column, width in zip(columns, widths)]
+    row_lines = np.max(line_counts, axis=0) if columns else np.ones(1)
+    row_heights = np.rint((row_lines * line_height(font_size) + CELL_VERTICAL_MARGINS) * Inches(1)).astype(np.int64)
+
+    return TableFit((MARKER_COLUMN_WIDTH, *widths), tuple(row_heights.tolist()))
+
+@lru_cache(maxsize=1024)
+def _column_metrics(cells: Tuple[str, ...]) -> _ColumnMetrics:
+    """Measures the lines and words of every cell of a column in one pass each."""
+
+    import numpy as np
+
+    cell_lines = [_LINE_BREAKS.split(cell) for cell in cells]
+    lines = [line for split in cell_lines for line in split]
+    words = [line.split(" ") for line in lines]
+
+    line_counts = np.fromiter(map(len, cell_lines), dtype=np.int64, count=len(cells))
+    line_units = np.maximum.reduceat(text_units(lines), np.concatenate(([0], np.cumsum(line_counts)[:-1])))
+    word_units = text_units([word for split in words for word in split])
+
+    return _ColumnMetrics(line_units, line_counts, int(line_units.max(initial=0)), int(word_units.max(initial=0)))
+
+@lru_cache(maxsize=4096)
+def _column_lines(cells: Tuple[str, ...], font_size: int, width: int) -> Tuple[int, ...]:
+    """Returns the number of lines each cell of a column wraps to at a width, only wrapping the cells that do not fit."""
+
+    import numpy as np
+
+    metrics = _column_metrics(cells)
+    # The same room `count_lines` gives a line, in 1/1000 em
+    available = (width / Inches(1) - TEXTBOX_HORIZONTAL_INSETS) * 72 * 1000 / font_size
+
+    lines = metrics.lines.copy()
+    for index in np.flatnonzero(metrics.line_units > available):
+        lines[index] = count_lines(cells[index], font_size, width / Inches(1))
+    return tuple(lines.tolist())
+
+def _units_to_emu(units: int, font_size: int) -> int:
+    """Returns the width of a cell that holds a line `units` wide on one line, rounded up so it does not wrap."""
+
+    return math.ceil((units * font_size / 72000 + TEXTBOX_HORIZONTAL_INSETS) * Inches(1)) + 1
+
+def _share_width(available: int, widest: List[int], narrowest: List[int]) -> List[int]:
+    """Shares a width between columns that want to be `widest` wide but can be as narrow as `narrowest`."""
+
+    if not widest:
+        return []
+    if sum(widest) <= available:
+        base, weights = widest, widest
+    elif sum(narrowest) < available:
+        base, weights = narrowest, [wide - narrow for wide, narrow in zip(widest, narrowest)]
+    else:
+        base, weights = [0] * len(narrowest), narrowest
+
+    spare, total = available - sum(base), sum(weights) or 1
+    widths = [width + spare * weight // total for width, weight in zip(base, weights)]
+    widths[-1] += available - sum(widths)
+    return widths
+
+@traced
+def calculate_table_height(table: Table, font_size: Optional[float] = None) -> Inches:
+    """
+    Calculates the total height of a table based on its number of rows and font size.
+
+    The font size is read from the first cell unless it is given, as it must be for tables using shared styles.
+    """
+
+    if font_size is None:
+        font_size = table.cell(0, 0).text_frame.paragraphs[0].font.size.pt
     rows = len(table.rows)
-    
-    if font_size == 7:
-        return Inches(rows * 0.219)
 
-def add_table(slide: Slide, title: str, csv_data: str, cell_colours: List[RGBColor], top: Inches, left: Inches, table_width: Inches) -> tuple[Table, BaseShape]:
+    return Inches(rows * table_row_height(font_size))
+
+@traced
+def add_table(slide: Slide, title: str, csv_data: TableSource, cell_colours: List[RGBColor], top: Inches, left: Inches, table_width: Inches, backend: str = "xml", style: Optional[TableStyle] = None, fit: Optional[TableFit] = None) -> tuple[Table, BaseShape]:
     """
     Adds a table with a title to a slide.
 
     The function creates and populates a table, sets column width, applies cell colors,
     adjusts font size, and calculates the table height. Returns the table and its shape.
+
+    A `style` declares number formats and colour rules per column (see `table_style_helpers`), which are
+    applied on top of `cell_colours`. A `fit` from `fit_table_data` sizes the columns and rows to their content,
+    in place of the fixed second column width and rows a single line tall.
+
+    The "xml" backend builds the whole table in one pass; the "pptx" backend styles it cell by cell
+    through python-pptx. Both produce identical XML, except in a presentation with shared styles, which only
+    the "xml" backend relies on; the "pptx" backend's explicit formatting looks the same.
     """
 
     add_textbox(slide, left, top, Inches(0.5), Inches(0.15), title, 9, bold = True)
-    table, shape = create_and_populate_table(slide, left + Inches(0.05), top + Inches(0.22), table_width, Inches(0.1), csv_data)
-    table.columns[1].width = Inches(1.8)
 
-    set_cell_colours(table, cell_colours)
-    set_table_font_size(table, 7)
-    table.height = calculate_table_height(table)
+    data = load_table_data(csv_data)
+    height = Emu(fit.height) if fit else Inches(0.1)
+    if backend == "xml":
+        column_widths = dict(enumerate(fit.column_widths)) if fit else {1: SECOND_COLUMN_WIDTH}
+        table, shape = create_and_populate_table_xml(slide, left + TABLE_INDENT, top + TABLE_TITLE_OFFSET, table_width, height, data, cell_colours, TABLE_FONT_SIZE, column_widths, style, fit.row_heights if fit else None)
+    elif backend == "pptx":
+        table, shape = create_and_populate_table(slide, left + TABLE_INDENT, top + TABLE_TITLE_OFFSET, table_width, height, data, style)
+        if fit:
+            for column, width in zip(table.columns, fit.column_widths):
+                column.width = Emu(width)
+            for row, row_height in zip(table.rows, fit.row_heights):
+                row.height = Emu(row_height)
+            shape.width = Emu(fit.width)
+        else:
+            table.columns[1].width = SECOND_COLUMN_WIDTH
+
+        set_cell_colours(table, cell_colours)
+        if style:
+            set_style_colours(table, data, style, cell_colours)
+        set_table_font_size(table, TABLE_FONT_SIZE)
+    else:
+        raise ValueError(f"Unknown table backend: {backend}")
+
+    table.height = Emu(fit.height) if fit else calculate_table_height(table, TABLE_FONT_SIZE)
 
     return table, shape 
 
-def create_and_populate_table(slide: Slide, x: Inches, y: Inches, cx: Inches, cy: Inches, csv: str) -> tuple[Table, BaseShape]:
+@traced
+def set_table_data(title_box: BaseShape, table_shape: BaseShape, title: str, csv_data: TableSource, cell_colours: List[RGBColor], table_width: Inches, style: Optional[TableStyle] = None, fit: Optional[TableFit] = None) -> Table:
+    """Replaces the title and contents of a table created by `add_table`, keeping its shapes."""
+
+    set_textbox_text(title_box, title, 9, bold = True)
+
+    column_widths = dict(enumerate(fit.column_widths)) if fit else {1: SECOND_COLUMN_WIDTH}
+    table = replace_table_xml(table_shape, load_table_data(csv_data), table_width, Inches(0.1), cell_colours, TABLE_FONT_SIZE, column_widths, style, fit.row_heights if fit else None)
+    table.height = Emu(fit.height) if fit else calculate_table_height(table, TABLE_FONT_SIZE)
+
+    return table
+
+@traced
+def create_and_populate_table(slide: Slide, x: Inches, y: Inches, cx: Inches, cy: Inches, csv: TableSource, style: Optional[TableStyle] = None) -> tuple[Table, BaseShape]:
     """
-    Creates a blank table on a slide and populates it with data from a CSV file.
+    Creates a blank table on a slide and populates it with data from a CSV file, DataFrame or list of rows.
 
     The table includes an extra row for headers and an empty first column.
+    The source is loaded once and the same frame is used to size and populate the table.
     Returns the table and its shape.
     """
-    df = pd.read_csv(csv)
+    df = load_table_data(csv)
     rows = df.shape[0] + 1 # Plus 1 for the headers
     cols = df.shape[1] + 1 # Plus 1 for empty first colunmn
 
     table, table_shape = create_blank_table(slide, rows, cols, x, y, cx, cy)
-    populate_table(table, csv)
+    populate_table(table, df, style)
 
     return table, table_shape
 
-def populate_table(table: Table, csv_path: str) -> None:
+@traced
+def populate_table(table: Table, csv_path: TableSource, style: Optional[TableStyle] = None) -> None:
     """
-    Populates a table with data from a CSV file.
+    Populates a table with data from a CSV file, DataFrame or list of rows.
 
-    The first row is filled with column headers, and subsequent rows are populated with CSV data.
+    The first row is filled with column headers, and subsequent rows are populated with CSV data,
+    formatted by the number formats of `style` if one is given.
     """
 
-    # Read the CSV file into a DataFrame
-    df = pd.read_csv(csv_path)
+    # Read the CSV file into a DataFrame, unless one was passed in
+    df = load_table_data(csv_path)
     
     # Populate the first row with column headers
     for col_idx, col_name in enumerate(df.columns):
-        table.cell(0, col_idx + 1).text = col_name  # Adjust the index if necessary (depends on table implementation)
+        table.cell(0, col_idx + 1).text = str(col_name)  # Adjust the index if necessary (depends on table implementation)
     
+    rows = style_cells(df, style)[0] if style else df.itertuples(index=False)
+
     # Iterate through each row and column index to fill the table with data
-    for row_idx, row in enumerate(df.itertuples(index=False), start=1):  # Start from 1 to skip the header row
+    for row_idx, row in enumerate(rows, start=1):  # Start from 1 to skip the header row
         for col_idx, cell in enumerate(row):
             table.cell(row_idx, col_idx + 1).text = str(cell)  # Populate the table with the cell data
 
+@traced
 def create_blank_table(slide: Slide, rows: int, columns: int, x: Inches, y: Inches, cx: Inches, cy: Inches) -> tuple[Table, BaseShape]:
     """
     Creates a blank table on a slide with a specified number of rows and columns.
@@ -97,6 +358,7 @@ def create_blank_table(slide: Slide, rows: int, columns: int, x: Inches, y: Inch
     set_table_font_size(table, 10)
     return table, shape
 
+@traced
 def set_table_font_size(table: Table, size: int) -> None:
     """
     Sets the font size and colour for all text in a table.
@@ -143,6 +405,7 @@ def set_cell_colour(table: Table, row: int, column: int, colour: List[RGBColor])
     specific_cell.fill.solid()  # Apply solid fill
     specific_cell.fill.fore_color.rgb = colour 
 
+@traced
 def set_cell_colours(table: Table, colours: List[RGBColor]):
     """
     Sets the background colour for the first column of each row in a table.
@@ -152,4 +415,14 @@ def set_cell_colours(table: Table, colours: List[RGBColor]):
     for i in range(len(colours)):
         if i + 2 > len(table.rows):
             break 
-        set_cell_colour(table, i + 1, 0, colours[i])
\ No newline at end of file
+        set_cell_colour(table, i + 1, 0, colours[i])
+
+@traced
+def set_style_colours(table: Table, csv_data: TableSource, style: TableStyle, cell_colours: Optional[List[RGBColor]] = None) -> None:
+    """Fills the cells of a table that the colour rules of `style` colour, on top of the row colours from `cell_colours`."""
+
+    _, fills = style_cells(load_table_data(csv_data), style, cell_colours)
+    for row_idx, row_fills in enumerate(fills, start=1):
+        for col_idx, fill in enumerate(row_fills):
+            if fill != DEFAULT_FILL:
+                set_cell_colour(table, row_idx, col_idx, RGBColor.from_string(fill))
\ No newline at end of file
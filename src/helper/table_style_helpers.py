@@ -0,0 +1,171 @@
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, List, Mapping, Optional, Sequence, Tuple
+
+from pptx.dml.color import RGBColor
+
+from .csv_helpers import is_dataframe
+from ..tracing import traced
+
+if TYPE_CHECKING:
+    import numpy as np
+
+# Fill of cells no rule colours, as python-pptx's table style would leave them
+DEFAULT_FILL = "FFFFFF"
+
+RED = RGBColor(0xC0, 0x00, 0x00)
+AMBER = RGBColor(0xFF, 0xC0, 0x00)
+GREEN = RGBColor(0x00, 0xB0, 0x50)
+
+class ColourRule:
+    """Decides the fill colour of cells from their numeric values."""
+
+    def fills(self, values: 'np.ndarray') -> 'np.ndarray':
+        """Returns the hex fill for each value, or an empty string where the rule gives none (e.g. for NaN)."""
+        raise NotImplementedError("Subclasses should implement this!")
+
+@dataclass(frozen=True)
+class Thresholds(ColourRule):
+    """
+    Colours values by the band they fall in: below `boundaries[0]` gets `colours[0]`, from `boundaries[0]`
+    up to `boundaries[1]` gets `colours[1]`, and so on, so there is one more colour than boundaries.
+    """
+
+    boundaries: Tuple[float, ...]
+    colours: Tuple[RGBColor, ...]
+
+    def __post_init__(self) -> None:
+        if len(self.colours) != len(self.boundaries) + 1:
+            raise ValueError(f"Thresholds need one more colour than boundaries, got {len(self.colours)} colours for {len(self.boundaries)} boundaries")
+        if list(self.boundaries) != sorted(self.boundaries):
+            raise ValueError("Threshold boundaries must be in ascending order")
+
+    def fills(self, values: 'np.ndarray') -> 'np.ndarray':
+        import numpy as np
+
+        bands = np.searchsorted(np.asarray(self.boundaries, dtype=float), values, side="right")
+        fills = np.array([str(colour) for colour in self.colours], dtype=object)[bands]
+        fills[np.isnan(values)] = ""
+        return fills
+
+@dataclass(frozen=True)
+class ColourScale(ColourRule):
+    """Colours values along a linear ramp from `low_colour` at `low` to `high_colour` at `high`, clamped at both ends."""
+
+    low: float
+    high: float
+    low_colour: RGBColor
+    high_colour: RGBColor
+
+    def fills(self, values: 'np.ndarray') -> 'np.ndarray':
+        import numpy as np
+
+        span = (self.high - self.low) or 1
+        position = np.clip((np.nan_to_num(values) - self.low) / span, 0, 1)[:, None]
+
+        low, high = np.array(tuple(self.low_colour), dtype=float), np.array(tuple(self.high_colour), dtype=float)
+        rgb = np.rint(low + position * (high - low)).astype(np.int64)
+        fills = np.char.mod("%06X", (rgb[:, 0] << 16) | (rgb[:, 1] << 8) | rgb[:, 2]).astype(object)
+        fills[np.isnan(values)] = ""
+        return fills
+
+def rag(amber_from: float, red_from: float, higher_is_worse: bool = True) -> Thresholds:
+    """
+    Returns red/amber/green thresholds. With `higher_is_worse` values below `amber_from` are green and values
+    from `red_from` up are red; otherwise values below `red_from` are red and values from `amber_from` up are green.
+    """
+
+    if higher_is_worse:
+        return Thresholds((amber_from, red_from), (GREEN, AMBER, RED))
+    return Thresholds((red_from, amber_from), (RED, AMBER, GREEN))
+
+@dataclass(frozen=True)
+class ColumnStyle:
+    """
+    How the cells of one column are formatted and coloured.
+
+    `number_format` is a printf-style format applied to numeric cells after multiplying them by `scale`, e.g. "%.1f",
+    or "%.0f%%" with a scale of 100 for percentages; other cells keep their text. `colour` fills the column's cells,
+    or, with `colour_rows`, the row marker in the table's first column instead.
+    """
+
+    number_format: Optional[str] = None
+    scale: float = 1
+    colour: Optional[ColourRule] = None
+    colour_rows: bool = False
+
+# Column styles by column name
+TableStyle = Mapping[str, ColumnStyle]
+
+@traced
+def style_cells(data: Any, style: TableStyle, marker_colours: Optional[Sequence[RGBColor]] = None) -> tuple[List[tuple], List[List[str]]]:
+    """
+    Returns the text of each data cell and the fill of each cell including the row markers, a row at a time.
+
+    Every column is formatted and coloured in one vectorised pass. Columns without a style keep `str(cell)`, row markers
+    start from `marker_colours` as `set_cell_colours` would colour them, and anything no rule colours is white.
+    """
+
+    import numpy as np
+    import pandas as pd
+
+    frame = data if is_dataframe(data) else pd.DataFrame(list(data.itertuples(index=False)), columns=list(data.columns))
+    rows = len(frame)
+
+    texts = []
+    fills = np.full((rows, len(frame.columns) + 1), DEFAULT_FILL, dtype=object)
+    for index, marker_colour in enumerate((marker_colours or [])[:rows]):
+        fills[index, 0] = str(marker_colour)
+
+    for column_index, column in enumerate(frame.columns):
+        column_style = style.get(str(column))
+        # numpy stringifies each cell with str(), as the unstyled table does; pandas' astype(str) keeps NaN as NaN
+        text = frame.iloc[:, column_index].to_numpy(dtype=object).astype(str).astype(object)
+        if column_style is None:
+            texts.append(text)
+            continue
+
+        values = pd.to_numeric(frame.iloc[:, column_index], errors="coerce").to_numpy(dtype=float)
+        numeric = ~np.isnan(values)
+
+        if column_style.number_format:
+            formatted = np.char.mod(column_style.number_format, values[numeric] * column_style.scale)
+            text[numeric] = formatted.astype(object)
+        texts.append(text)
+
+        if column_style.colour:
+            rule_fills = column_style.colour.fills(values)
+            coloured = rule_fills != ""
+            target = 0 if column_style.colour_rows else column_index + 1
+            fills[coloured, target] = rule_fills[coloured]
+
+    return list(zip(*texts)) if texts else [() for _ in range(rows)], fills.tolist()
+
+def colour_rule_from_dict(data: Mapping[str, Any]) -> ColourRule:
+    """
+    Creates a colour rule from its JSON description, with colours as hex strings, e.g.
+    {"type": "thresholds", "boundaries": [0, 10], "colours": ["00B050", "FFC000", "C00000"]},
+    {"type": "scale", "low": 0, "high": 100, "low_colour": "C00000", "high_colour": "FFFF00"} or
+    {"type": "rag", "amber_from": 5, "red_from": 10, "higher_is_worse": true}.
+    """
+
+    kwargs = dict(data)
+    rule_type = kwargs.pop("type")
+
+    if rule_type == "thresholds":
+        return Thresholds(tuple(kwargs["boundaries"]), tuple(RGBColor.from_string(colour) for colour in kwargs["colours"]))
+    if rule_type == "scale":
+        return ColourScale(kwargs["low"], kwargs["high"], RGBColor.from_string(kwargs["low_colour"]), RGBColor.from_string(kwargs["high_colour"]))
+    if rule_type == "rag":
+        return rag(**kwargs)
+    raise ValueError(f"Unknown colour rule type: {rule_type}")
+
+def table_style_from_dict(data: Mapping[str, Mapping[str, Any]]) -> TableStyle:
+    """Creates a table style from its JSON description: column names mapped to `ColumnStyle` fields, with `colour` as a colour rule description."""
+
+    style = {}
+    for column, column_data in data.items():
+        kwargs = dict(column_data)
+        if kwargs.get("colour"):
+            kwargs["colour"] = colour_rule_from_dict(kwargs["colour"])
+        style[column] = ColumnStyle(**kwargs)
+    return style
@@ -0,0 +1,172 @@
+import re
+
+from typing import Any, Dict, List, Optional, Sequence
+from xml.sax.saxutils import escape
+
+from pptx.dml.color import RGBColor
+from pptx.oxml import parse_xml
+from pptx.oxml.ns import nsdecls
+from pptx.oxml.xmlchemy import BaseOxmlElement
+from pptx.shapes.base import BaseShape
+from pptx.slide import Slide
+from pptx.table import Table
+from pptx.util import Emu, Inches
+
+from .style_helpers import SHARED_TABLE_STYLE_ID, shared_font_size
+from .table_style_helpers import TableStyle, style_cells
+from ..tracing import traced
+
+# Default table style python-pptx assigns to new tables
+_TABLE_STYLE_ID = "{5C22544A-7EE6-4342-B048-85BDC9FD1C3A}"
+
+# The same border `_set_cell_border` writes, repeated for the left, right, top and bottom edges
+_BORDER_XML = "".join(
+    f'<a:{edge} w="12700" cap="flat" cmpd="sng" algn="ctr">'
+    '<a:solidFill><a:srgbClr val="000000"/></a:solidFill>'
+    '<a:prstDash val="solid"/><a:round/>'
+    '<a:headEnd type="none" w="med" len="med"/><a:tailEnd type="none" w="med" len="med"/>'
+    f'</a:{edge}>'
+    for edge in ("lnL", "lnR", "lnT", "lnB")
+)
+
+_CTRL_CHARS = re.compile(r"([\x00-\x08\x0B-\x1F])")
+_LINE_BREAKS = re.compile("\n|\v")
+
+def create_and_populate_table_xml(slide: Slide, x: Inches, y: Inches, cx: Inches, cy: Inches, df: Any, cell_colours: Optional[List[RGBColor]] = None, font_size: int = 7, column_widths: Optional[Dict[int, Inches]] = None, style: Optional[TableStyle] = None, row_heights: Optional[Sequence[int]] = None) -> tuple[Table, BaseShape]:
+    """
+    Creates, populates and styles a table by emitting its `a:tbl` element in a single pass.
+
+    Produces the same XML as `create_and_populate_table` followed by setting the column widths,
+    `set_cell_colours` and `set_table_font_size`, without going through python-pptx once per cell and run.
+    `df` is the already-loaded table data, formatted and coloured by `style` if one is given (see `style_cells`).
+    In a presentation with shared styles (see `register_shared_styles`) the table uses them instead.
+    `row_heights`, if given, replace the even split of `cy` between the rows.
+    """
+
+    tbl, widths = table_xml(df, cx, cy, cell_colours, font_size, column_widths, style, shared_font_size(slide.part), row_heights)
+
+    # Let python-pptx create the graphic frame so shape ids and names match, then swap in the prepared table
+    shape = slide.shapes.add_table(1, 1, x, y, cx, cy)
+    graphicData = shape._element.graphic.graphicData
+    graphicData.replace(graphicData.tbl, tbl)
+
+    if column_widths:
+        shape.width = Emu(sum(widths))
+
+    return shape.table, shape
+
+def replace_table_xml(shape: BaseShape, df: Any, cx: Inches, cy: Inches, cell_colours: Optional[List[RGBColor]] = None, font_size: int = 7, column_widths: Optional[Dict[int, Inches]] = None, style: Optional[TableStyle] = None, row_heights: Optional[Sequence[int]] = None) -> Table:
+    """Replaces the table in an existing graphic frame with one built from `df`, as `create_and_populate_table_xml` builds it."""
+
+    tbl, widths = table_xml(df, cx, cy, cell_colours, font_size, column_widths, style, shared_font_size(shape.part), row_heights)
+
+    graphicData = shape._element.graphic.graphicData
+    graphicData.replace(graphicData.tbl, tbl)
+    shape.width = Emu(sum(widths))
+    if row_heights:
+        shape.height = Emu(sum(row_heights))
+
+    return shape.table
+
+@traced
+def table_xml(df: Any, cx: Inches, cy: Inches, cell_colours: Optional[List[RGBColor]] = None, font_size: int = 7, column_widths: Optional[Dict[int, Inches]] = None, style: Optional[TableStyle] = None, base_size: Optional[int] = None, row_heights: Optional[Sequence[int]] = None) -> tuple[BaseOxmlElement, List[int]]:
+    """
+    Returns the `a:tbl` element for `df`, with an empty first column and a header row, and its column widths.
+
+    With `base_size`, the font size of the presentation's shared styles, the table references the shared table
+    style and its cells only write a fill that is not white and a font size that is not `base_size`.
+    """
+
+    rows = df.shape[0] + 1 # Plus 1 for the headers
+    cols = df.shape[1] + 1 # Plus 1 for empty first colunmn
+
+    widths = _split_evenly(cx, cols)
+    for col_idx, width in (column_widths or {}).items():
+        widths[col_idx] = width
+    heights = list(row_heights) if row_heights else _split_evenly(cy, rows)
+
+    # First column fills, as applied by set_cell_colours
+    fills = ["FFFFFF"] * rows
+    for i, colour in enumerate((cell_colours or [])[:rows - 1]):
+        fills[i + 1] = str(colour)
+
+    if base_size is None:
+        size = str(font_size * 100)
+        cell_xml = _cell_xml
+        parts = [f'<a:tbl {nsdecls("a")}><a:tblPr firstRow="1" bandRow="1"><a:tableStyleId>{_TABLE_STYLE_ID}</a:tableStyleId></a:tblPr><a:tblGrid>']
+    else:
+        size = str(font_size * 100) if font_size != base_size else ""
+        cell_xml = _shared_cell_xml
+        parts = [f'<a:tbl {nsdecls("a")}><a:tblPr><a:tableStyleId>{SHARED_TABLE_STYLE_ID}</a:tableStyleId></a:tblPr><a:tblGrid>']
+    empty_cell = cell_xml("", size, "FFFFFF")
+
+    parts.extend(f'<a:gridCol w="{width}"/>' for width in widths)
+    parts.append('</a:tblGrid>')
+
+    # Header row
+    parts.append(f'<a:tr h="{heights[0]}">')
+    parts.append(cell_xml("", size, fills[0]))
+    parts.extend(cell_xml(str(col_name), size, "FFFFFF") for col_name in df.columns)
+    parts.append('</a:tr>')
+
+    if style:
+        texts, cell_fills = style_cells(df, style, cell_colours)
+        for row_idx, (row, row_fills) in enumerate(zip(texts, cell_fills), start=1):
+            parts.append(f'<a:tr h="{heights[row_idx]}">')
+            parts.append(cell_xml("", size, row_fills[0]) if row_fills[0] != "FFFFFF" else empty_cell)
+            parts.extend(cell_xml(text, size, fill) for text, fill in zip(row, row_fills[1:]))
+            parts.append('</a:tr>')
+    else:
+        for row_idx, row in enumerate(df.itertuples(index=False), start=1):
+            parts.append(f'<a:tr h="{heights[row_idx]}">')
+            parts.append(cell_xml("", size, fills[row_idx]) if fills[row_idx] != "FFFFFF" else empty_cell)
+            parts.extend(cell_xml(str(cell), size, "FFFFFF") for cell in row)
+            parts.append('</a:tr>')
+
+    parts.append('</a:tbl>')
+    return parse_xml("".join(parts)), widths
+
+def _split_evenly(total: int, count: int) -> List[int]:
+    """Splits a length between rows or columns the way python-pptx does, with the last absorbing any remainder."""
+
+    size = total // count
+    return [size] * (count - 1) + [total - (count - 1) * size]
+
+def _cell_xml(text: str, size: str, fill: str) -> str:
+    """Returns the XML for one cell, mirroring what python-pptx writes when `cell.text` is assigned."""
+
+    run_properties = f'<a:rPr sz="{size}"><a:solidFill><a:srgbClr val="000000"/></a:solidFill></a:rPr>'
+    paragraphs = "".join(f'<a:p><a:pPr><a:defRPr sz="{size}"/></a:pPr>{content}</a:p>' for content in _paragraph_contents(text, run_properties))
+
+    return (
+        f'<a:tc><a:txBody><a:bodyPr/><a:lstStyle/>{paragraphs}</a:txBody>'
+        f'<a:tcPr>{_BORDER_XML}<a:solidFill><a:srgbClr val="{fill}"/></a:solidFill></a:tcPr></a:tc>'
+    )
+
+def _shared_cell_xml(text: str, size: str, fill: str) -> str:
+    """
+    Returns the XML for one cell of a table using the shared table style, which supplies the borders, white fill
+    and black text. `size` is empty when the cell has the shared base font size.
+    """
+
+    run_properties = f'<a:rPr sz="{size}"/>' if size else ""
+    end_properties = f'<a:endParaRPr sz="{size}"/>' if size else ""
+    paragraphs = "".join(f'<a:p>{content or end_properties}</a:p>' for content in _paragraph_contents(text, run_properties))
+    cell_fill = f'<a:tcPr><a:solidFill><a:srgbClr val="{fill}"/></a:solidFill></a:tcPr>' if fill != "FFFFFF" else '<a:tcPr/>'
+
+    return f'<a:tc><a:txBody><a:bodyPr/><a:lstStyle/>{paragraphs}</a:txBody>{cell_fill}</a:tc>'
+
+def _paragraph_contents(text: str, run_properties: str) -> List[str]:
+    """Returns the runs and line breaks of each paragraph of a cell's text, as python-pptx splits them when `cell.text` is assigned."""
+
+    paragraphs = []
+    for p_text in text.split("\n"):
+        content = []
+        for idx, r_str in enumerate(_LINE_BREAKS.split(p_text)):
+            if idx > 0:
+                content.append('<a:br/>')
+            if r_str:
+                r_str = escape(_CTRL_CHARS.sub(lambda match: "_x%04X_" % ord(match.group(1)), r_str))
+                content.append(f'<a:r>{run_properties}<a:t>{r_str}</a:t></a:r>')
+        paragraphs.append("".join(content))
+    return paragraphs
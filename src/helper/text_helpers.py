@@ -7,16 +7,35 @@ from pptx.shapes.base import BaseShape
 from pptx.text.text import TextFrame
 from pptx.dml.color import RGBColor
 
+from .measurement_helpers import measure_bullet_points, measure_text_height
+from .style_helpers import set_list_style_size, shared_font_size
+from ..tracing import traced
+
+# Height of the shaded header of an info box
+INFO_BOX_HEADER_HEIGHT = Inches(0.25)
+
+@traced
 def add_textbox(slide: Slide, left: Inches, top: Inches, width: Inches, height: Inches, text: str, font_size: int, center: bool = False, bold: bool = False, word_wrap: bool = False) -> tuple[BaseShape, TextFrame]:
     """Adds a textbox to a slide with specified text formatting options."""
 
     text_box = slide.shapes.add_textbox(left, top, width, height)
-    text_frame = text_box.text_frame
+    return text_box, set_textbox_text(text_box, text, font_size, center = center, bold = bold, word_wrap = word_wrap)
+
+@traced
+def set_textbox_text(text_box: BaseShape, text: str, font_size: int, center: bool = False, bold: bool = False, word_wrap: bool = False) -> TextFrame:
+    """
+    Replaces the text of a text box, formatted the same way `add_textbox` formats it.
+
+    In a presentation with shared styles the font size is only written when it differs from theirs.
+    """
+
+    text_frame = _clear_text(text_box)
     text_frame.text = text
     text_frame.word_wrap = word_wrap
 
     run = text_frame.paragraphs[0].runs[0]
-    run.font.size = Pt(font_size)
+    if font_size != shared_font_size(text_box.part):
+        run.font.size = Pt(font_size)
     
     # Set bold if required
     if bold:
@@ -26,37 +45,50 @@ def add_textbox(slide: Slide, left: Inches, top: Inches, width: Inches, height:
         for paragraph in text_frame.paragraphs:
             paragraph.alignment = PP_ALIGN.CENTER
     
-    return text_box, text_frame
+    return text_frame
 
+@traced
 def add_bullet_points(slide: Slide, bullet_points: List[str], left: Inches, top: Inches, width: Inches, height: Inches, font_size: int) -> tuple[BaseShape, TextFrame]:
     """Adds a bulleted list to a slide and returns the shape and text frame."""
 
     paragraph_box = slide.shapes.add_textbox(left, top, width, height)
-    paragraph_frame = paragraph_box.text_frame
+    return paragraph_box, set_bullet_points(paragraph_box, bullet_points, font_size)
+
+@traced
+def set_bullet_points(paragraph_box: BaseShape, bullet_points: List[str], font_size: int) -> TextFrame:
+    """
+    Replaces the text of a text box with one paragraph per bullet point.
+
+    In a presentation with shared styles the font size is set once in the text box's list style, when it
+    differs from theirs, instead of on every paragraph.
+    """
+
+    paragraph_frame = _clear_text(paragraph_box)
 
     paragraph_frame.word_wrap = True 
 
+    base_size = shared_font_size(paragraph_box.part)
+    if base_size is not None:
+        set_list_style_size(paragraph_frame, font_size if font_size != base_size else None)
+
     for point in bullet_points:
         if paragraph_frame.paragraphs[-1].text:
             bullet_p = paragraph_frame.add_paragraph()
         else:
             bullet_p = paragraph_frame.paragraphs[-1]
         bullet_p.text = f"{point}"
-        bullet_p.font.size = Pt(font_size)  # Set font size
+        if base_size is None:
+            bullet_p.font.size = Pt(font_size)  # Set font size
     
-    return paragraph_box, paragraph_frame
+    return paragraph_frame
 
+@traced
 def add_info_box(slide: Slide, left: Inches, top: Inches, width: Inches, header_text: str, paragraph_text: List[str], font_size: int, padding: Inches = Inches(0)) -> tuple[BaseShape, TextFrame, BaseShape, TextFrame]:
     """Adds an information box to a slide consisting of a header and a paragraph of bullet points."""
 
-    header_height = Inches(0.25)
+    header_height = INFO_BOX_HEADER_HEIGHT
     header_box = slide.shapes.add_textbox(left, top, width, header_height) 
-    header_frame = header_box.text_frame
-    header_frame.text = header_text
-
-    header_p = header_frame.paragraphs[0]
-    header_p.font.color.rgb = RGBColor(255, 255, 255)  # White text
-    header_p.font.size = Pt(font_size + 1)
+    header_frame = set_info_box_header(header_box, header_text, font_size)
 
     # Set the background color 
     header_fill = header_box.fill
@@ -66,19 +98,9 @@ def add_info_box(slide: Slide, left: Inches, top: Inches, width: Inches, header_
 
     # Add the paragraph text box below the header
 
-    paragraph_height = Inches(estimate_bullet_point_textbox_height(paragraph_text, font_size, int(width / 914400))) + Inches(0.05) + padding
+    paragraph_height = Inches(estimate_bullet_point_textbox_height(paragraph_text, font_size, width / Inches(1))) + Inches(0.05) + padding
     paragraph_box = slide.shapes.add_textbox(left, top + header_height, width, paragraph_height)
-    paragraph_frame = paragraph_box.text_frame
-
-    paragraph_frame.word_wrap = True  # Ensures text wraps inside the box
-
-    for point in paragraph_text:
-        if paragraph_frame.paragraphs[-1].text:
-            bullet_p = paragraph_frame.add_paragraph()
-        else:
-            bullet_p = paragraph_frame.paragraphs[-1]
-        bullet_p.text = point
-        bullet_p.font.size = Pt(font_size)  #
+    paragraph_frame = set_bullet_points(paragraph_box, paragraph_text, font_size) # Wraps text inside the box
 
     # Format the paragraph background color
     paragraph_fill = paragraph_box.fill
@@ -87,36 +109,40 @@ def add_info_box(slide: Slide, left: Inches, top: Inches, width: Inches, header_
 
     return header_box, header_frame, paragraph_box, paragraph_frame
 
-def estimate_textbox_height(text: str, font_size_pt: int, max_width_inch: int) -> int:
-    """Estimate the height of a text box in PowerPoint for Calibri (Body) font."""
+@traced
+def set_info_box_header(header_box: BaseShape, header_text: str, font_size: int) -> TextFrame:
+    """Replaces the text of an info box header, in white one point larger than the box's bullet points."""
+
+    header_frame = _clear_text(header_box)
+    header_frame.text = header_text
+
+    header_p = header_frame.paragraphs[0]
+    header_p.font.color.rgb = RGBColor(255, 255, 255)  # White text
+    header_p.font.size = Pt(font_size + 1)
 
-    avg_char_width_inch = (font_size_pt * 0.5) / 72  # Approx 50% of font size, converted to inches
-    line_height_inch = (font_size_pt * 1.25) / 72  # Line height ~1.25× font size, converted to inches
+    return header_frame
 
-    # Estimate the number of lines based on word wrapping
-    words = text.split()
-    lines = []
-    current_line = ""
+def _clear_text(text_box: BaseShape) -> TextFrame:
+    """Empties a text box back to the single blank paragraph a new text box starts with."""
 
-    for word in words:
-        test_line = current_line + " " + word if current_line else word
-        if len(test_line) * avg_char_width_inch > max_width_inch:
-            lines.append(current_line)
-            current_line = word
-        else:
-            current_line = test_line
+    text_frame = text_box.text_frame
+    text_frame._txBody.clear_content()
+    text_frame._txBody.add_p()
+    return text_frame
 
-    if current_line:
-        lines.append(current_line)  # Add last line
+@traced
+def estimate_textbox_height(text: str, font_size_pt: int, max_width_inch: float) -> float:
+    """
+    Estimate the height of a text box in PowerPoint for Calibri (Body) font.
 
-    total_height_inch = len(lines) * line_height_inch
-    return total_height_inch
+    Uses Calibri's per-character advance widths and the same greedy line breaking PowerPoint applies,
+    with `max_width_inch` being the width of the text box.
+    """
 
-def estimate_bullet_point_textbox_height(bullet_points: List[str], font_size_pt: int, max_width_inch: int) -> int:
-    """Estimates the height of a text box containing a list of bullet points based on font size and width constraints."""
+    return measure_text_height(text, font_size_pt, max_width_inch)
 
-    height = 0
+@traced
+def estimate_bullet_point_textbox_height(bullet_points: List[str], font_size_pt: int, max_width_inch: float) -> float:
+    """Estimates the height of a text box containing a list of bullet points based on font size and width constraints."""
 
-    for point in bullet_points:
-        height += estimate_textbox_height(point, font_size_pt, max_width_inch)
-    return height
\ No newline at end of file
+    return sum(measure_bullet_points(bullet_points, font_size_pt, max_width_inch))
\ No newline at end of file
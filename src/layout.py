@@ -0,0 +1,352 @@
+import os
+
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Iterable, List, Optional, Sequence, Union
+
+from PIL import Image
+
+from pptx.dml.color import RGBColor
+from pptx.shapes.base import BaseShape
+from pptx.slide import Slide
+from pptx.util import Inches, Length
+
+from .helper.text_helpers import add_textbox, add_bullet_points, add_info_box, set_textbox_text, set_bullet_points, set_info_box_header, estimate_bullet_point_textbox_height, INFO_BOX_HEADER_HEIGHT
+from .helper.shape_helpers import add_line
+from .helper.input_helpers import InputSource, open_input
+from .helper.image_helpers import add_image, replace_image
+from .helper.chart_helpers import ChartSpec, add_chart, replace_chart
+from .helper.table_style_helpers import TableStyle
+from .slide_cache import fingerprint, visual_content
+from .helper.table_helpers import TableSource, add_table, set_table_data, load_table_data, fit_table_data, table_column_widths, table_row_height, TABLE_FONT_SIZE, TABLE_INDENT, TABLE_TITLE_OFFSET
+
+class LayoutOverflowError(Exception):
+    """Raised when a frame's content does not fit in the space available on the slide."""
+
+class Block:
+    """
+    A piece of slide content that can report its size before any shapes are created.
+
+    `space_before` is the gap above the block when it is stacked, `indent` moves it right within its stack
+    and `width`, if given, replaces the width the stack would otherwise give it.
+    """
+
+    def __init__(self, space_before: Length = Inches(0), indent: Length = Inches(0), width: Optional[Length] = None) -> None:
+        self.space_before = space_before
+        self.indent = indent
+        self.width = width
+
+    def measure(self, width: Length) -> tuple[Length, Length]:
+        """Returns the (width, height) the block occupies when given `width`."""
+        raise NotImplementedError("Subclasses should implement this!")
+
+    def render(self, slide: Slide, placement: 'Placement', briefing_pack) -> Any:
+        """Creates the block's shapes at its placement and returns them."""
+        raise NotImplementedError("Subclasses should implement this!")
+
+    def fill(self, slide: Slide, shapes: List[BaseShape], placement: 'Placement', briefing_pack) -> None:
+        """
+        Moves the shapes an earlier `render` of the same kind of block created to this placement,
+        and replaces their content with this block's data. Used to stamp packs out of a template.
+        """
+        raise NotImplementedError("Subclasses should implement this!")
+
+    def fingerprint_inputs(self) -> List[Any]:
+        """
+        Returns everything the block's shapes depend on besides where it is placed: its type and attributes, with
+        the contents of the files it reads in place of their paths (see `visual_content`).
+        """
+
+        return [type(self).__name__, *(visual_content(value) for value in vars(self).values())]
+
+class TableBlock(Block):
+    """
+    A titled table, as created by `add_table`, optionally formatted and coloured by a table style.
+
+    With `autofit` the columns share `table_width` by their content and each row is as tall as its wrapped cells
+    (see `fit_table`), so the blocks below a table with wrapping cells are placed below all of it.
+    """
+
+    def __init__(self, title: str, data: TableSource, cell_colours: List[RGBColor], table_width: Length, style: Optional[TableStyle] = None, autofit: bool = False, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self.title, self.cell_colours, self.table_width, self.style = title, cell_colours, table_width, style
+        self.data = load_table_data(data)
+        self.fit = fit_table_data(self.data, table_width, style) if autofit else None
+
+    def measure(self, width: Length) -> tuple[Length, Length]:
+        if self.fit:
+            return TABLE_INDENT + self.fit.width, TABLE_TITLE_OFFSET + self.fit.height
+
+        rows, cols = self.data.shape[0] + 1, self.data.shape[1] + 1
+        table_height = Inches(rows * table_row_height(TABLE_FONT_SIZE))
+        return TABLE_INDENT + sum(table_column_widths(cols, self.table_width)), TABLE_TITLE_OFFSET + table_height
+
+    def render(self, slide: Slide, placement: 'Placement', briefing_pack) -> Any:
+        return add_table(slide, self.title, self.data, self.cell_colours, placement.top, placement.left, self.table_width, style = self.style, fit = self.fit)
+
+    def fill(self, slide: Slide, shapes: List[BaseShape], placement: 'Placement', briefing_pack) -> None:
+        title_box, table_shape = shapes
+        title_box.left, title_box.top = placement.left, placement.top
+        table_shape.left, table_shape.top = placement.left + TABLE_INDENT, placement.top + TABLE_TITLE_OFFSET
+        set_table_data(title_box, table_shape, self.title, self.data, self.cell_colours, self.table_width, style = self.style, fit = self.fit)
+
+class BulletListBlock(Block):
+    """A text box of bullet points, sized to fit them."""
+
+    def __init__(self, bullet_points: List[str], font_size: int, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self.bullet_points, self.font_size = bullet_points, font_size
+
+    def measure(self, width: Length) -> tuple[Length, Length]:
+        return width, Inches(estimate_bullet_point_textbox_height(self.bullet_points, self.font_size, width / Inches(1)))
+
+    def render(self, slide: Slide, placement: 'Placement', briefing_pack) -> Any:
+        return add_bullet_points(slide, self.bullet_points, placement.left, placement.top, placement.width, placement.height, self.font_size)
+
+    def fill(self, slide: Slide, shapes: List[BaseShape], placement: 'Placement', briefing_pack) -> None:
+        _move(shapes[0], placement.left, placement.top, placement.width, placement.height)
+        set_bullet_points(shapes[0], self.bullet_points, self.font_size)
+
+class InfoBoxBlock(Block):
+    """A shaded header above a grey box of bullet points, as created by `add_info_box`."""
+
+    def __init__(self, header_text: str, bullet_points: List[str], font_size: int, padding: Length = Inches(0), **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self.header_text, self.bullet_points = header_text, bullet_points
+        self.font_size, self.padding = font_size, padding
+
+    def measure(self, width: Length) -> tuple[Length, Length]:
+        paragraph_height = Inches(estimate_bullet_point_textbox_height(self.bullet_points, self.font_size, width / Inches(1))) + Inches(0.05) + self.padding
+        return width, INFO_BOX_HEADER_HEIGHT + paragraph_height
+
+    def render(self, slide: Slide, placement: 'Placement', briefing_pack) -> Any:
+        return add_info_box(slide, placement.left, placement.top, placement.width, self.header_text, self.bullet_points, self.font_size, padding = self.padding)
+
+    def fill(self, slide: Slide, shapes: List[BaseShape], placement: 'Placement', briefing_pack) -> None:
+        header_box, paragraph_box = shapes
+        _move(header_box, placement.left, placement.top, placement.width, INFO_BOX_HEADER_HEIGHT)
+        _move(paragraph_box, placement.left, placement.top + INFO_BOX_HEADER_HEIGHT, placement.width, placement.height - INFO_BOX_HEADER_HEIGHT)
+        set_info_box_header(header_box, self.header_text, self.font_size)
+        set_bullet_points(paragraph_box, self.bullet_points, self.font_size)
+
+class TextBlock(Block):
+    """A single text box of fixed height."""
+
+    def __init__(self, text: str, font_size: int, height: Length, bold: bool = False, word_wrap: bool = False, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self.text, self.font_size, self.height = text, font_size, height
+        self.bold, self.word_wrap = bold, word_wrap
+
+    def measure(self, width: Length) -> tuple[Length, Length]:
+        return width, self.height
+
+    def render(self, slide: Slide, placement: 'Placement', briefing_pack) -> Any:
+        return add_textbox(slide, placement.left, placement.top, placement.width, placement.height, self.text, self.font_size, bold = self.bold, word_wrap = self.word_wrap)
+
+    def fill(self, slide: Slide, shapes: List[BaseShape], placement: 'Placement', briefing_pack) -> None:
+        _move(shapes[0], placement.left, placement.top, placement.width, placement.height)
+        set_textbox_text(shapes[0], self.text, self.font_size, bold = self.bold, word_wrap = self.word_wrap)
+
+class ImageBlock(Block):
+    """An image scaled to the block width, and to `height` if one is given (otherwise keeping its aspect ratio)."""
+
+    def __init__(self, path: InputSource, height: Length = Inches(0), **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self.path, self.height = path, height
+
+    def measure(self, width: Length) -> tuple[Length, Length]:
+        if self.height:
+            return width, self.height
+
+        # Only the image header is read to find its aspect ratio
+        with open_input(self.path) as file, Image.open(file) as image:
+            image_width, image_height = image.size
+        return width, Length(round(width * image_height / image_width))
+
+    def render(self, slide: Slide, placement: 'Placement', briefing_pack) -> Any:
+        return add_image(slide, placement.left, placement.top, placement.width, self.path, self.height, briefing_pack.image_preprocessor)
+
+    def fill(self, slide: Slide, shapes: List[BaseShape], placement: 'Placement', briefing_pack) -> None:
+        width, height = replace_image(shapes[0], self.path, placement.width, self.height, briefing_pack.image_preprocessor)
+        _move(shapes[0], placement.left, placement.top, width, height)
+
+class ChartBlock(Block):
+    """A native chart of table data, scaled to the block width, and to `height` if one is given (otherwise 4:3)."""
+
+    def __init__(self, spec: ChartSpec, height: Length = Inches(0), **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self.spec, self.height = spec, height
+
+    def measure(self, width: Length) -> tuple[Length, Length]:
+        return width, self.height or Length(width * 3 // 4)
+
+    def render(self, slide: Slide, placement: 'Placement', briefing_pack) -> Any:
+        return add_chart(slide, self.spec, placement.left, placement.top, placement.width, placement.height)
+
+    def fill(self, slide: Slide, shapes: List[BaseShape], placement: 'Placement', briefing_pack) -> None:
+        replace_chart(shapes[0], self.spec)
+        _move(shapes[0], placement.left, placement.top, placement.width, placement.height)
+
+def visual_block(source: Union[InputSource, ChartSpec], height: Length = Inches(0), **kwargs: Any) -> Block:
+    """Returns the block for an image slot, which holds either an image (a path or held in memory) or a chart spec."""
+
+    if isinstance(source, ChartSpec):
+        return ChartBlock(source, height, **kwargs)
+    return ImageBlock(source, height, **kwargs)
+
+class LineBlock(Block):
+    """A horizontal dividing line from the block's left edge to `end_x`. It takes up no height."""
+
+    def __init__(self, end_x: Length, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self.end_x = end_x
+
+    def measure(self, width: Length) -> tuple[Length, Length]:
+        return width, Inches(0)
+
+    def render(self, slide: Slide, placement: 'Placement', briefing_pack) -> Any:
+        return add_line(slide, placement.left, self.end_x, placement.top)
+
+    def fill(self, slide: Slide, shapes: List[BaseShape], placement: 'Placement', briefing_pack) -> None:
+        _move(shapes[0], placement.left, placement.top, self.end_x - placement.left, Inches(0))
+
+def _move(shape: BaseShape, left: Length, top: Length, width: Length, height: Length) -> None:
+    shape.left, shape.top, shape.width, shape.height = left, top, width, height
+
+class Placement:
+    """Where a block has been placed on the slide."""
+
+    def __init__(self, block: Block, left: Length, top: Length, width: Length, height: Length) -> None:
+        self.block = block
+        self.left, self.top, self.width, self.height = left, top, width, height
+
+    @property
+    def bottom(self) -> Length:
+        return self.top + self.height
+
+    @property
+    def right(self) -> Length:
+        return self.left + self.width
+
+    def fingerprint(self, briefing_pack) -> str:
+        """Returns a digest that changes whenever the shapes the placed block creates in `briefing_pack` would."""
+
+        return fingerprint(self.block.fingerprint_inputs(), self.left, self.top, self.width, self.height, briefing_pack.fingerprint_inputs(metadata = False))
+
+def place(block: Block, left: Length, top: Length, width: Length) -> Placement:
+    """Places a single block at a fixed position."""
+
+    block_width, height = block.measure(width)
+    return Placement(block, left, top, block_width, height)
+
+def stack(left: Length, top: Length, width: Length, blocks: Sequence[Block]) -> List[Placement]:
+    """Places blocks one below the other, each `space_before` below the bottom of the previous one."""
+
+    placements = []
+    y = top
+
+    for block in blocks:
+        y += block.space_before
+        block_width, height = block.measure(block.width if block.width is not None else width - block.indent)
+        placements.append(Placement(block, left + block.indent, y, block_width, height))
+        y += height
+
+    return placements
+
+class FrameLayout:
+    """
+    The complete geometry of a frame's content, computed before any shapes exist.
+
+    Placements are rendered in order, so the order also sets the z-order of the shapes.
+    """
+
+    def __init__(self, placements: Iterable[Placement]) -> None:
+        self.placements = list(placements)
+
+    @property
+    def bottom(self) -> Length:
+        return max((placement.bottom for placement in self.placements), default=Inches(0))
+
+    def overflows(self, max_bottom: Length) -> List[Placement]:
+        """Returns the placements that extend below `max_bottom`."""
+
+        return [placement for placement in self.placements if placement.bottom > max_bottom]
+
+    def check_fits(self, max_bottom: Length, slide_title: str = "") -> None:
+        """Raises LayoutOverflowError if any block extends below `max_bottom`."""
+
+        overflowing = self.overflows(max_bottom)
+        if overflowing:
+            names = ", ".join(type(placement.block).__name__ for placement in overflowing)
+            raise LayoutOverflowError(
+                f"Slide '{slide_title}' overflows by {(self.bottom - max_bottom) / Inches(1):.2f} inches ({names})"
+            )
+
+    def prepare_images(self, briefing_pack) -> None:
+        """Queues the layout's images with the pack's image preprocessor, if it has one."""
+
+        if briefing_pack.image_preprocessor:
+            briefing_pack.image_preprocessor.submit_many(
+                (placement.block.path, placement.width, placement.block.height)
+                for placement in self.placements if isinstance(placement.block, ImageBlock)
+            )
+
+    def render(self, slide: Slide, briefing_pack) -> List[Any]:
+        """Creates every block's shapes in one pass and returns what each block's helper returned."""
+
+        # Start on the images while the other blocks are rendered
+        self.prepare_images(briefing_pack)
+
+        return [placement.block.render(slide, placement, briefing_pack) for placement in self.placements]
+
+    def render_blocks(self, slide: Slide, briefing_pack) -> List[List[int]]:
+        """Creates every block's shapes like `render`, and returns the ids of the shapes each block created."""
+
+        self.prepare_images(briefing_pack)
+
+        block_shape_ids = []
+        for placement in self.placements:
+            shape_count = len(slide.shapes)
+            placement.block.render(slide, placement, briefing_pack)
+            block_shape_ids.append([shape.shape_id for shape in list(slide.shapes)[shape_count:]])
+        return block_shape_ids
+
+def _layout_frame(frame, slide_width: Length, slide_height: Length) -> FrameLayout:
+    return frame.layout(slide_width, slide_height)
+
+def _frame_pages(frames: Iterable, slide_width: Length, slide_height: Length) -> List:
+    """
+    Splits frames into the pages a pack of the given slide size adds for them. A blank pack to split them with
+    is only created for frames that spread over several slides, like paginated tables.
+    """
+
+    # Imported here, as both import this module
+    from .frame.base import BaseSlide
+    from .presentation import BriefingPack
+
+    briefing_pack = None
+    pages = []
+    for frame in frames:
+        if type(frame).pages is BaseSlide.pages:
+            pages.append(frame)
+            continue
+        if briefing_pack is None:
+            briefing_pack = BriefingPack("", "", "", "")
+            briefing_pack.prs.slide_width, briefing_pack.prs.slide_height = slide_width, slide_height
+        pages.extend(frame.pages(briefing_pack))
+    return pages
+
+def layout_frames(frames: Sequence, slide_width: Length = Inches(10), slide_height: Length = Inches(7.5), max_workers: Optional[int] = None) -> List[FrameLayout]:
+    """
+    Computes the layouts of many frames in parallel, without building any slides.
+
+    Frames that spread over several slides, like paginated tables, are split into their pages first, and a layout
+    is returned for each page. Useful for rejecting a pack with overflowing slides before any pptx work is done.
+    """
+
+    frames = _frame_pages(frames, slide_width, slide_height)
+    max_workers = max_workers or os.cpu_count() or 1
+    if max_workers == 1 or len(frames) < 2:
+        return [_layout_frame(frame, slide_width, slide_height) for frame in frames]
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(_layout_frame, frames, [slide_width] * len(frames), [slide_height] * len(frames)))
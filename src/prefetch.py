@@ -0,0 +1,59 @@
+import asyncio
+import os
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, List
+
+from .frame.base import BaseSlide
+from .helper.input_helpers import InputBuffers
+from .tracing import span
+
+class MissingInputsError(FileNotFoundError):
+    """Raised when files the frames of a pack need cannot be read, listing every one of them."""
+
+def input_paths(frames: Iterable[BaseSlide]) -> List[str]:
+    """Returns the absolute path of every file the frames read, once each, in the order they are first needed."""
+
+    paths = {}
+    for frame in frames:
+        for path in frame.input_paths():
+            paths.setdefault(os.path.abspath(path))
+    return list(paths)
+
+def _read(path: str) -> tuple[os.stat_result, bytes]:
+    with open(path, 'rb') as file:
+        return os.fstat(file.fileno()), file.read()
+
+async def prefetch_inputs_async(frames: Iterable[BaseSlide], max_concurrency: int = 16) -> InputBuffers:
+    """
+    Reads every CSV file, image and bullet point file the frames need, concurrently, and returns their contents.
+
+    The blocking reads run on up to `max_concurrency` threads, so on a high-latency share the reads overlap
+    instead of waiting on one another. Every file is checked before anything is rendered: if any cannot be
+    read, MissingInputsError lists them all. Activate the result (`with buffers:`) while building the pack
+    so its frames are rendered from memory.
+    """
+
+    paths = input_paths(frames)
+    loop = asyncio.get_running_loop()
+
+    with span("prefetch_inputs", files=len(paths)), ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="prefetch") as executor:
+        results = await asyncio.gather(*(loop.run_in_executor(executor, _read, path) for path in paths), return_exceptions=True)
+
+    files, missing = {}, []
+    for path, result in zip(paths, results):
+        if isinstance(result, OSError):
+            missing.append(f"{path} ({result.strerror or result})")
+        elif isinstance(result, BaseException):
+            raise result
+        else:
+            files[path] = result
+
+    if missing:
+        raise MissingInputsError(f"{len(missing)} input file(s) cannot be read: " + ", ".join(missing))
+    return InputBuffers(files)
+
+def prefetch_inputs(frames: Iterable[BaseSlide], max_concurrency: int = 16) -> InputBuffers:
+    """Runs `prefetch_inputs_async` in a new event loop, for callers that are not already in one."""
+
+    return asyncio.run(prefetch_inputs_async(frames, max_concurrency))
@@ -1,17 +1,58 @@
-from typing import Type
+import contextlib
+import importlib
+import os
+
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import IO, Any, Deque, Dict, Iterable, List, Optional, Type, Union
 
 from pptx import Presentation
-from pptx.util import Inches
+from pptx.oxml import parse_xml
+from pptx.oxml.ns import nsdecls
+from pptx.util import Inches, Pt
 from pptx.dml.color import RGBColor
-from pptx.slide import Slide
+from pptx.parts.image import ImagePart
+from pptx.presentation import Presentation as PresentationType
+from pptx.slide import Slide, SlideLayout
+from pptx.text.text import _Paragraph, _Run
+from pptx.shapes.shapetree import SlideShapes
 
 from .frame.base import BaseSlide
-from .frame.title import TitleSlide
-from .frame.new import NewSlide
-from.frame.summary import SummarySlide
 
-from .helper.text_helpers import add_textbox
-from .helper.shape_helpers import add_line
+from .helper.text_helpers import add_textbox, set_textbox_text
+from .helper.shape_helpers import add_line, shapes_by_id
+from .helper.image_helpers import ImagePreprocessor
+from .helper.input_helpers import InputBuffers, active_inputs
+from .helper.package_helpers import Compression, package_bytes, write_package
+from .helper.record_helpers import PackRecord, read_pack_record, read_slide_record, write_pack_record, write_slide_record
+from .helper.style_helpers import register_shared_styles
+from .layout import FrameLayout
+from .slide_cache import SlideCache, SlideParts, attach_slide, detach_slide
+from .tracing import Tracer, active_tracer, span
+
+SLIDE_TITLE_FONT_SIZE = 18
+
+# Font size the shared styles give all text, which the header, footer and tables use
+SHARED_STYLE_FONT_SIZE = 7
+
+# Fixed so that identical packs produce identical files
+_SLIDE_NUMBER_FIELD_ID = "{6D1C6E1A-3F2B-4C5D-9E8F-0A1B2C3D4E5F}"
+
+# Frame classes available from this module, imported the first time one is used
+_FRAME_MODULES = {
+    "TitleSlide": ".frame.title", "NewSlide": ".frame.new", "SummarySlide": ".frame.summary", "PaginatedTableSlide": ".frame.table",
+}
+
+def __getattr__(name: str) -> Any:
+    if name in _FRAME_MODULES:
+        return getattr(importlib.import_module(_FRAME_MODULES[name], __package__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+class _LayoutCanvas:
+    """Gives a slide layout a writable shape collection so the slide helpers can draw onto it."""
+
+    def __init__(self, slide_layout: SlideLayout) -> None:
+        self.shapes = SlideShapes(slide_layout.shapes._spTree, slide_layout)
 
 class BriefingPack():
     """
@@ -19,22 +60,227 @@ class BriefingPack():
 
     This class facilitates the creation and management of slides in a PowerPoint presentation.
     It handles adding slide frames (e.g., title, table, image), numbering slides, and adding common templates (header, footer) to each slide.
+
+    With `chrome_in_layout` the header and footer are written once into the slide layout the frames are built on,
+    instead of onto every slide, and slide numbers come from a native slide number field.
+
+    With an `image_preprocessor` images are downscaled to their display size, on a thread pool, before being embedded.
+    With `reject_overflow` a frame whose content would run into the footer raises LayoutOverflowError before its slide is created.
+
+    With a `slide_cache` slides whose frame and pack inputs have not changed since they were last rendered are
+    copied from the cache instead of being rendered again.
+
+    With `shared_styles` a table style and default text size are registered in the presentation once, and tables
+    and text boxes reference them, only writing the formatting where they differ, instead of formatting every
+    cell and run. The slides look the same and their XML is much smaller.
+
+    With `refreshable` each slide records which shapes every block of its frame's layout created, with fingerprints
+    of the frame and of each block, and the pack records its settings and metadata, so `refresh.refresh_pack` can
+    later update the saved pack in place.
+
+    While a `tracing.Tracer` is active, adding each frame, templating, numbering and saving are recorded as spans.
+
+    A `presentation` already set up by a briefing pack with the same `chrome_in_layout`, such as one loaded from a PackTemplate,
+    is used as it is instead of starting from a new one.
     """
     
-    def __init__(self, reference_number: str, classification: str, code_version: str, job_id: str) -> None:
-        self.prs = Presentation()
+    def __init__(self, reference_number: str, classification: str, code_version: str, job_id: str, chrome_in_layout: bool = False, image_preprocessor: Optional[ImagePreprocessor] = None, reject_overflow: bool = False, presentation: Optional[PresentationType] = None, slide_cache: Optional[SlideCache] = None, shared_styles: bool = False, refreshable: bool = False) -> None:
+        self.prs = presentation if presentation is not None else Presentation()
         self.reference_number = reference_number
         self.classification = classification
         self.code_version = code_version
         self.job_id = job_id
+
+        # Layout every frame creates its slide from
+        self.slide_layout = self.prs.slide_layouts[6] # Blank layout
+        self.chrome_in_layout = chrome_in_layout
+        self._slide_total_run = None
+
+        self.image_preprocessor = image_preprocessor
+        self.reject_overflow = reject_overflow
+        self.slide_cache = slide_cache
+
+        self.shared_styles = shared_styles
+        if shared_styles:
+            register_shared_styles(self.prs, SHARED_STYLE_FONT_SIZE)
+
+        self.refreshable = refreshable
+        layout_chrome_ids = []
+
+        if chrome_in_layout and presentation is None:
+            layout_chrome_ids = self.add_layout_template(self.slide_layout)
+        elif chrome_in_layout:
+            self._slide_total_run = self._find_slide_total_run(self.slide_layout)
+
+        if refreshable and read_pack_record(self.prs.part._element) is None:
+            metadata = {"reference_number": reference_number, "classification": classification, "code_version": code_version, "job_id": job_id}
+            write_pack_record(self.prs.part._element, PackRecord(chrome_in_layout, shared_styles, metadata, layout_chrome_ids))
     
     def add_frame(self, frame: Type['BaseSlide']) -> None:
         """
         Adds a slide frame to the briefing pack by invoking the `add_slide` method of the given slide frame class
+
+        A frame that spans several slides, such as a paginated table, adds one slide for each of its `pages`.
         """
 
+        for page in frame.pages(self):
+            self._add_page(page)
+
+    def add_frames(self, frames: Iterable['BaseSlide'], max_workers: Optional[int] = None, chunk_size: int = 8) -> None:
+        """
+        Adds many frames, rendering their slides in parallel on up to `max_workers` processes (the CPU count by default).
+
+        Pages are sent to the workers in chunks of `chunk_size` and each is rendered into a pack of the workers' own
+        with this pack's settings. The slides come back detached, as their XML and the images they show, and are
+        attached here in order; images shared by several slides are embedded once. The result is the same as adding
+        the frames one at a time. Slides found in the slide cache are loaded here instead of being rendered, as are
+        slides whose relationships cannot be detached, like those showing charts (see `BaseSlide.is_detachable`). Pages holding inputs that cannot be sent to another process,
+        such as memory-mapped files (see `BaseSlide.is_portable`), are rendered here too. While prefetched inputs are
+        active, each chunk is sent the prefetched files its pages read, so workers do not read them from disk again. At most two chunks per worker are in flight at a time, so
+        pages that are produced lazily, like those of a paginated table, are not all held at once. While a tracer is
+        active, the workers trace their renders too and their spans are added to it.
+        """
+
+        max_workers = max_workers or os.cpu_count() or 1
+        settings = self._render_settings()
+        prefetched = active_inputs()
+        tracer = active_tracer()
+        trace = tracer.memory if tracer else None
+        image_parts: Dict[str, ImagePart] = {}
+        in_flight: Deque[tuple[List[tuple['BaseSlide', Optional[str], bool]], Optional[Future]]] = deque()
+
+        with span("add_frames", "frame", workers=max_workers), ProcessPoolExecutor(max_workers=max_workers) as executor:
+            def submit(chunk: List[tuple['BaseSlide', Optional[str], bool]]) -> None:
+                pages = [page for page, _, in_parent in chunk if not in_parent]
+                inputs = prefetched.subset(path for page in pages for path in page.input_paths()) if prefetched else None
+                in_flight.append((chunk, executor.submit(_render_detached, settings, pages, inputs, trace) if pages else None))
+                if len(in_flight) >= 2 * max_workers:
+                    self._attach_chunk(*in_flight.popleft(), image_parts)
+
+            chunk = []
+            for frame in frames:
+                for page in frame.pages(self):
+                    key = page.fingerprint(self) if self.slide_cache else None
+                    in_parent = (bool(key) and self.slide_cache.has(key)) or not page.is_portable() or not page.is_detachable()
+                    if key and not in_parent:
+                        # Counted here as `_add_page` counts it when loading, for the slide a worker renders instead
+                        self.slide_cache.misses += 1
+                    chunk.append((page, key, in_parent))
+                    if len(chunk) == chunk_size:
+                        submit(chunk)
+                        chunk = []
+            if chunk:
+                submit(chunk)
+
+            while in_flight:
+                self._attach_chunk(*in_flight.popleft(), image_parts)
+
+    def _attach_chunk(self, chunk: List[tuple['BaseSlide', Optional[str], bool]], future: Optional[Future], image_parts: Dict[str, ImagePart]) -> None:
+        """Adds the slides of a chunk of pages in order, attaching those a worker rendered."""
+
+        rendered, media, spans = future.result() if future else ([], {}, [])
+        rendered = iter(rendered)
+
+        tracer = active_tracer()
+        if tracer and spans:
+            tracer.merge_spans(spans)
+
+        for page, key, in_parent in chunk:
+            parts = None if in_parent else next(rendered)
+            if parts is None:
+                # A slide the worker could not detach is rendered again here, without counting its cache miss twice
+                self._add_page(page, None if in_parent else key)
+                continue
+
+            with span(f"add_frame {type(page).__name__}", "frame", title=page.slide_title, cached=False, parallel=True) as frame_span:
+                slide = attach_slide(self, parts, media, image_parts)
+                if self.slide_cache:
+                    self.slide_cache.store(key, slide)
+                frame_span.set(shapes=len(slide.shapes))
+
+    def _render_settings(self) -> Dict[str, Any]:
+        """The arguments a worker process needs to create a pack that renders slides exactly as this one does."""
+
+        preprocessor = self.image_preprocessor
+        return {
+            "reference_number": self.reference_number, "classification": self.classification,
+            "code_version": self.code_version, "job_id": self.job_id,
+            "chrome_in_layout": self.chrome_in_layout, "reject_overflow": self.reject_overflow, "shared_styles": self.shared_styles,
+            "refreshable": self.refreshable,
+            "slide_size": (self.prs.slide_width, self.prs.slide_height),
+            "image_preprocessor": (preprocessor.cache_dir, preprocessor.dpi, preprocessor.lossy, preprocessor.jpeg_quality) if preprocessor else None,
+        }
+
+    def _add_page(self, frame: 'BaseSlide', missed_key: Optional[str] = None) -> None:
+        """
+        Adds a page's slide from the slide cache, or renders it and caches it. A `missed_key` is the page's key, already
+        known to be missing from the slide cache, which is not looked up again.
+        """
+
+        with span(f"add_frame {type(frame).__name__}", "frame", title=frame.slide_title) as frame_span:
+            key = missed_key
+            if self.slide_cache and key is None:
+                key = frame.fingerprint(self)
+                slide = self.slide_cache.load(self, key)
+                if slide:
+                    frame_span.set(cached=True, shapes=len(slide.shapes))
+                    return
+
+            if self.image_preprocessor:
+                # Start preparing images while the rest of the slide is built
+                self.image_preprocessor.submit_many(frame.image_boxes(self))
+
+            slide = self._render_page(frame)
+
+            if self.slide_cache:
+                self.slide_cache.store(key, slide)
+            frame_span.set(cached=False, shapes=len(slide.shapes))
+
+    def _render_page(self, frame: 'BaseSlide') -> Slide:
+        """Renders a page's slide at the end of the pack, with its header, footer and title."""
+
         slide = frame.add_slide(self)
         self.add_slide_template(slide, frame.slide_title)
+        return slide
+
+    def fingerprint_inputs(self, metadata: bool = True) -> List[Any]:
+        """
+        Returns the pack settings that affect how a frame's slide is rendered, as part of its fingerprint.
+
+        Without `metadata` the header and footer text is left out, for fingerprinting a slide's own content.
+        """
+
+        preprocessor = self.image_preprocessor
+        inputs = [
+            self.chrome_in_layout, self.prs.slide_width, self.prs.slide_height, self.reject_overflow, self.shared_styles,
+            (preprocessor.dpi, preprocessor.lossy, preprocessor.jpeg_quality) if preprocessor else None,
+        ]
+        if self.refreshable:
+            inputs.append("refreshable")
+
+        # Slides only carry their own copy of the header and footer when it is not in the layout
+        if metadata and not self.chrome_in_layout:
+            inputs += [self.reference_number, self.classification, self.code_version, self.job_id]
+        return inputs
+
+    @property
+    def content_bottom(self) -> Inches:
+        """The lowest point frame content may reach without running into the footer."""
+
+        return self.prs.slide_height - Inches(0.2)
+
+    def check_layout(self, layout: FrameLayout, slide_title: str = "") -> None:
+        """Raises LayoutOverflowError for a layout that runs into the footer, if the pack rejects overflowing slides."""
+
+        if self.reject_overflow:
+            layout.check_fits(self.content_bottom, slide_title)
+
+    def prepare_images(self, frames: Iterable['BaseSlide']) -> None:
+        """Queues the images of many frames at once, so they are processed in parallel ahead of building."""
+
+        if self.image_preprocessor:
+            for frame in frames:
+                self.image_preprocessor.submit_many(frame.image_boxes(self))
 
     def number_slides(self):
         """
@@ -42,8 +288,17 @@ class BriefingPack():
         The slide number appears in the bottom-right corner of each slide.
         """
 
+        with span("number_slides"):
+            self._number_slides()
+
+    def _number_slides(self) -> None:
         slide_total = len(self.prs.slides)
 
+        if self.chrome_in_layout:
+            # The layout's slide number field fills in "X", only the total needs updating
+            self._slide_total_run.text = f"/{slide_total}"
+            return
+
         for index, slide in enumerate(self.prs.slides):
             # Define the position where the slide number will appear
             slide_width = self.prs.slide_width
@@ -61,15 +316,90 @@ class BriefingPack():
         """
         Adds a header and footer to the given slide, including reference number, classification, dividing line,
         code version, job ID, and slide title.
+
+        When the header and footer live in the slide layout only the slide title is added.
+        """
+
+        with span("add_slide_template"):
+            chrome_ids = [] if self.chrome_in_layout else self._add_chrome(slide)
+
+            # Add slide title above the black line
+            title_box, _ = add_textbox(slide, Inches(0.11), Inches(0.36), Inches(1), Inches(0.4), slide_title, SLIDE_TITLE_FONT_SIZE)
+
+            record = read_slide_record(slide._element) if self.refreshable else None
+            if record:
+                record.title_shape_id, record.chrome_shape_ids = title_box.shape_id, chrome_ids
+                write_slide_record(slide._element, record)
+
+    def add_layout_template(self, slide_layout: SlideLayout) -> List[int]:
+        """
+        Writes the header, footer and an "X/Y" slide number into a slide layout, so slides built on it show them
+        without carrying their own copies. The total is filled in when the pack is numbered.
+        Returns the ids of the header and footer text boxes, in the order of `_chrome_texts`.
+        """
+
+        slide_layout._element.cSld.name = "Briefing Pack"
+        layout_canvas = _LayoutCanvas(slide_layout)
+        chrome_ids = self._add_chrome(layout_canvas)
+
+        # Slide number field followed by a run holding the slide total
+        left = self.prs.slide_width - Inches(0.35)
+        top = self.prs.slide_height - Inches(0.2)
+        number_box = layout_canvas.shapes.add_textbox(left, top, Inches(3), Inches(0.2))
+        paragraph = number_box.text_frame.paragraphs[0]
+        paragraph._p.append(parse_xml(
+            f'<a:fld {nsdecls("a")} id="{_SLIDE_NUMBER_FIELD_ID}" type="slidenum"><a:rPr sz="700"/><a:t>\u2039#\u203a</a:t></a:fld>'
+        ))
+
+        self._slide_total_run = paragraph.add_run()
+        self._slide_total_run.text = "/0"
+        self._slide_total_run.font.size = Pt(7)
+
+        return chrome_ids
+
+    def _find_slide_total_run(self, slide_layout: SlideLayout) -> _Run:
+        """Returns the run after the slide number field that `add_layout_template` wrote into a slide layout."""
+
+        field = slide_layout._element.xpath(f'.//a:fld[@id="{_SLIDE_NUMBER_FIELD_ID}"]')[0]
+        return _Run(field.xpath("following-sibling::a:r")[0], _Paragraph(field.getparent(), None))
+
+    def _chrome_texts(self) -> List[tuple[str, bool]]:
+        """The text of each header and footer text box, in the order `_add_chrome` adds them, and whether it is centred and bold."""
+
+        return [
+            (f"Reference Number: {self.reference_number}", False), (self.classification, True),
+            (f"Code version: {self.code_version}", False), (f"Job ID: {self.job_id}", False), (self.classification, True),
+        ]
+
+    def refresh_chrome(self, slide: Union[Slide, SlideLayout], shape_ids: List[int]) -> bool:
+        """
+        Rewrites the header and footer text boxes `_add_chrome` added to a slide or layout, with the ids it returned,
+        where their text differs from this pack's metadata. Returns whether any was rewritten.
+        """
+
+        shapes = shapes_by_id(_LayoutCanvas(slide) if isinstance(slide, SlideLayout) else slide, shape_ids)
+        changed = False
+        for shape_id, (text, emphasised) in zip(shape_ids, self._chrome_texts()):
+            if shapes[shape_id].text_frame.text != text:
+                set_textbox_text(shapes[shape_id], text, 7, center = emphasised, bold = emphasised)
+                changed = True
+        return changed
+
+    def _add_chrome(self, slide: Slide) -> List[int]:
+        """
+        Adds the reference number, classification banners, dividing line, code version and job ID.
+        Returns the ids of the text boxes, in the order of `_chrome_texts`.
         """
-       
+
         slide_width = self.prs.slide_width
+        reference, classification, code_version, job_id, _ = (text for text, _ in self._chrome_texts())
+        text_boxes = []
 
-        add_textbox(slide, Inches(0.1), Inches(0), Inches(1), Inches(1), f"Reference Number: {self.reference_number}", 7)
+        text_boxes.append(add_textbox(slide, Inches(0.1), Inches(0), Inches(1), Inches(1), reference, 7))
 
         # Add classification to the top middle
         center_x = (slide_width - Inches(1.5)) / 2  # Center the text box horizontally
-        add_textbox(slide, center_x, Inches(0), Inches(1.5), Inches(0.3), self.classification, 7, center = True, bold =True)
+        text_boxes.append(add_textbox(slide, center_x, Inches(0), Inches(1.5), Inches(0.3), classification, 7, center = True, bold =True))
 
         # Calculate the start and end points for the line
         line_start_x = Inches(0.2)  
@@ -80,19 +410,58 @@ class BriefingPack():
         bottom_y = self.prs.slide_height - Inches(0.2)
 
         # Add text to the bottom left 
-        add_textbox(slide, Inches(0.1), bottom_y, Inches(1), Inches(1), f"Code version: {self.code_version}", 7)
-        add_textbox(slide, Inches(1), bottom_y, Inches(1), Inches(1), f"Job ID: {self.job_id}", 7)
+        text_boxes.append(add_textbox(slide, Inches(0.1), bottom_y, Inches(1), Inches(1), code_version, 7))
+        text_boxes.append(add_textbox(slide, Inches(1), bottom_y, Inches(1), Inches(1), job_id, 7))
 
         # Add classification to the bottom center 
         bottom_center_x = (slide_width - Inches(1.5)) / 2  # Center the text box horizontally
-        add_textbox(slide, bottom_center_x, bottom_y, Inches(1.5), Inches(0.3), self.classification, 7, center = True, bold = True)
+        text_boxes.append(add_textbox(slide, bottom_center_x, bottom_y, Inches(1.5), Inches(0.3), classification, 7, center = True, bold = True))
+
+        return [text_box.shape_id for text_box, _ in text_boxes]
+
+    def save(self, file: Union[str, os.PathLike, IO[bytes], None] = None, compression: Compression = "default") -> Optional[bytes]:
+        """
+        Save the presentation to a file path or a writable binary stream, or return it as bytes if no file is given.
+
+        `compression` is "store" (fastest, largest), "fast", "default", "max" or a zlib level from 0 to 9.
+        Saving to a path replaces the file only once the whole pack has been written.
+        """
+        with span("save", slides=len(self.prs.slides)):
+            self.number_slides()
+
+            if file is None:
+                return package_bytes(self.prs, compression)
+            write_package(self.prs, file, compression)
+            return None
+
+def _render_detached(settings: Dict[str, Any], pages: List['BaseSlide'], inputs: Optional[InputBuffers] = None, trace: Optional[bool] = None) -> tuple[List[Optional[SlideParts]], Dict[str, bytes], List[Dict[str, Any]]]:
+    """
+    Renders pages into a new pack in a worker process and returns each slide detached, or None for one that cannot be,
+    along with the bytes of the images they show by media name. The pages read any prefetched `inputs` from memory.
+
+    Unless `trace` is None the renders are traced, recording memory if it is True, and the spans are returned too
+    (see `Tracer.export_spans`).
+    """
 
-        # Add slide title above the black line
-        add_textbox(slide, Inches(0.11), Inches(0.36), Inches(1), Inches(0.4), slide_title, 18)
+    settings = dict(settings)
+    slide_width, slide_height = settings.pop("slide_size")
+    preprocessor = settings.pop("image_preprocessor")
 
-    def save(self, filename: str) -> None:
-        """Save the presentation to a file."""
-        self.number_slides()
-        self.prs.save(filename)
+    image_preprocessor = ImagePreprocessor(*preprocessor) if preprocessor else None
+    tracer = Tracer(trace) if trace is not None else None
 
+    # A worker forked while the prefetched inputs were active is already serving them
+    with tracer or contextlib.nullcontext(), inputs if inputs is not None and active_inputs() is None else contextlib.nullcontext(), image_preprocessor or contextlib.nullcontext():
+        briefing_pack = BriefingPack(**settings, image_preprocessor = image_preprocessor)
+        # Only the slides are sent back, so it does not matter that a header and footer in the layout were drawn at the default size
+        briefing_pack.prs.slide_width, briefing_pack.prs.slide_height = slide_width, slide_height
+        briefing_pack.prepare_images(pages)
 
+        media: Dict[str, bytes] = {}
+        detached = []
+        for page in pages:
+            with span(f"render_page {type(page).__name__}", "frame", title=page.slide_title) as page_span:
+                slide = briefing_pack._render_page(page)
+                detached.append(detach_slide(slide, media))
+                page_span.set(shapes=len(slide.shapes))
+    return detached, media, tracer.export_spans() if tracer else []
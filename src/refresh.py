@@ -0,0 +1,187 @@
+import io
+
+from typing import IO, List, Optional, Sequence, Set, Union
+
+import os
+
+from pptx import Presentation
+from pptx.opc.constants import RELATIONSHIP_TYPE as RT
+from pptx.opc.package import Part
+from pptx.slide import Slide
+
+from .frame.base import BaseSlide
+from .helper.image_helpers import ImagePreprocessor
+from .helper.input_helpers import InputSource, open_input
+from .helper.package_helpers import Compression, PackageArchive, write_package
+from .helper.record_helpers import SlideRecord, read_pack_record, read_slide_record, write_pack_record, write_slide_record
+from .helper.shape_helpers import shapes_by_id
+from .helper.text_helpers import set_textbox_text
+from .layout import FrameLayout
+from .presentation import BriefingPack, SLIDE_TITLE_FONT_SIZE
+from .renderer import frame_type
+from .tracing import span
+
+class PackMismatchError(Exception):
+    """Raised when a pack cannot be refreshed with the frames given: it was not built refreshable, or they do not have the structure it was built from."""
+
+class RefreshedPack:
+    """
+    A saved pack updated in place by `refresh_pack`, ready to be saved again.
+
+    `changed_slides` are the indices of the slides whose content, title, header or footer changed. Saving serialises
+    only the parts that changed; every other part is read from the original file as it is, so the slides that did
+    not change stay byte-identical when saved with the compression they were saved with before.
+    """
+
+    def __init__(self, briefing_pack: BriefingPack, original: PackageArchive, unchanged_parts: Set[Part], changed_slides: List[int]) -> None:
+        self.briefing_pack = briefing_pack
+        self.original = original
+        self.unchanged_parts = unchanged_parts
+        self.changed_slides = changed_slides
+
+    @property
+    def prs(self):
+        return self.briefing_pack.prs
+
+    def save(self, file: Union[str, os.PathLike, IO[bytes], None] = None, compression: Compression = "default") -> Optional[bytes]:
+        """
+        Saves the refreshed pack to a file path or a writable binary stream, or returns it as bytes if no file is given.
+
+        The pack is not numbered again, as it has the same slides it was saved with.
+        """
+
+        with span("save", slides=len(self.prs.slides), changed=len(self.changed_slides)):
+            if file is None:
+                stream = io.BytesIO()
+                write_package(self.prs, stream, compression, self.original, self.unchanged_parts)
+                return stream.getvalue()
+            write_package(self.prs, file, compression, self.original, self.unchanged_parts)
+
+def refresh_pack(pack: InputSource, frames: Sequence[BaseSlide], reference_number: str, classification: str, code_version: str, job_id: str, image_preprocessor: Optional[ImagePreprocessor] = None, reject_overflow: bool = False, shared_styles: Optional[bool] = None) -> RefreshedPack:
+    """
+    Updates a pack saved by a refreshable `BriefingPack` with new frames and metadata, without building it again.
+
+    The pack can be a path or held in memory (see `open_input`). Its slides are matched to the pages of `frames` in
+    order, and each must show the same type of frame with the same blocks in its layout, or PackMismatchError is
+    raised. Slides whose frame has the fingerprint recorded when it was built are left alone without being laid out.
+    On the others only the blocks whose fingerprint changed are filled with their new data (table contents, bullet
+    points, text, images and charts) and moved to their new placements, and the title is rewritten if it changed.
+    The header and footer text is rewritten where the metadata changed. The pack keeps the settings it was built
+    with; `shared_styles`, if given, must be one of them.
+    """
+
+    with span("refresh_pack"):
+        with open_input(pack) as file:
+            blob = file.read()
+        prs = Presentation(io.BytesIO(blob))
+
+        pack_record = read_pack_record(prs.part._element)
+        if pack_record is None:
+            raise PackMismatchError("The pack was not built refreshable")
+        if shared_styles is not None and shared_styles != pack_record.shared_styles:
+            raise PackMismatchError(f"The pack was built {'with' if pack_record.shared_styles else 'without'} shared styles")
+        original_parts = set(prs.part.package.iter_parts())
+
+        briefing_pack = BriefingPack(
+            reference_number, classification, code_version, job_id, chrome_in_layout = pack_record.chrome_in_layout,
+            image_preprocessor = image_preprocessor, reject_overflow = reject_overflow, presentation = prs,
+            shared_styles = pack_record.shared_styles, refreshable = True,
+        )
+
+        pages = [page for frame in frames for page in frame.pages(briefing_pack)]
+        slides = list(prs.slides)
+        if len(pages) != len(slides):
+            raise PackMismatchError(f"The pack has {len(slides)} slides, got frames for {len(pages)}")
+
+        # Lay out the slides whose frames changed and check them all before any is touched
+        changes = []
+        for index, (slide, page) in enumerate(zip(slides, pages)):
+            record = read_slide_record(slide._element)
+            if record is None or record.frame_type != frame_type(page):
+                found = record.frame_type if record else "a slide without a record"
+                raise PackMismatchError(f"Slide {index} ('{page.slide_title}') shows {found}, not a {frame_type(page)}")
+
+            fingerprint = page.fingerprint(briefing_pack, metadata = False)
+            if fingerprint != record.fingerprint:
+                changes.append((index, slide, page, record, fingerprint, _changed_layout(briefing_pack, index, page, record)))
+
+        if image_preprocessor:
+            # Queue every image that changed before any is needed
+            for *_, layout in changes:
+                layout.prepare_images(briefing_pack)
+
+        changed_slides = set()
+        for index, slide, page, record, fingerprint, layout in changes:
+            with span(f"refresh_slide {type(page).__name__}", "frame", title=page.slide_title):
+                _fill_slide(briefing_pack, slide, page, record, layout)
+                record.fingerprint = fingerprint
+                write_slide_record(slide._element, record)
+            changed_slides.add(index)
+
+        changed_parts = set()
+        metadata = {"reference_number": reference_number, "classification": classification, "code_version": code_version, "job_id": job_id}
+        if metadata != pack_record.metadata:
+            if pack_record.chrome_in_layout:
+                briefing_pack.refresh_chrome(briefing_pack.slide_layout, pack_record.chrome_shape_ids)
+                changed_parts.add(briefing_pack.slide_layout.part)
+            else:
+                for index, slide in enumerate(slides):
+                    if briefing_pack.refresh_chrome(slide, read_slide_record(slide._element).chrome_shape_ids):
+                        changed_slides.add(index)
+
+            pack_record.metadata = metadata
+            write_pack_record(prs.part._element, pack_record)
+            changed_parts.add(prs.part)
+
+        for index in changed_slides:
+            changed_parts |= _slide_parts(slides[index])
+
+        return RefreshedPack(briefing_pack, PackageArchive(blob), original_parts - changed_parts, sorted(changed_slides))
+
+def _changed_layout(briefing_pack: BriefingPack, index: int, page: BaseSlide, record: SlideRecord) -> FrameLayout:
+    """Lays out a page whose slide is to be refreshed, checking that it has the blocks the slide was built with."""
+
+    prs = briefing_pack.prs
+    layout = page.layout(prs.slide_width, prs.slide_height)
+
+    block_types = [type(placement.block).__name__ for placement in layout.placements]
+    recorded_types = [block.block_type for block in record.blocks]
+    if block_types != recorded_types:
+        raise PackMismatchError(
+            f"Slide {index} ('{page.slide_title}') was built with [{', '.join(recorded_types)}], got a frame with [{', '.join(block_types)}]"
+        )
+
+    briefing_pack.check_layout(layout, page.slide_title)
+    return layout
+
+def _fill_slide(briefing_pack: BriefingPack, slide: Slide, page: BaseSlide, record: SlideRecord, layout: FrameLayout) -> None:
+    """Fills the blocks of a slide whose fingerprints changed with the page's data, and rewrites its title if it changed."""
+
+    shapes = shapes_by_id(slide, [shape_id for block in record.blocks for shape_id in block.shape_ids] + [record.title_shape_id])
+
+    for placement, block in zip(layout.placements, record.blocks):
+        fingerprint = placement.fingerprint(briefing_pack)
+        if fingerprint != block.fingerprint:
+            placement.block.fill(slide, [shapes[shape_id] for shape_id in block.shape_ids], placement, briefing_pack)
+            block.fingerprint = fingerprint
+
+    title_box = shapes[record.title_shape_id]
+    if title_box.text_frame.text != page.slide_title:
+        set_textbox_text(title_box, page.slide_title, SLIDE_TITLE_FONT_SIZE)
+
+def _slide_parts(slide: Slide) -> Set[Part]:
+    """
+    A slide's part and the parts it alone relates to, such as its charts and their workbooks, which change along with it.
+    Its layout and images are left out: refreshing a slide adds new image parts rather than changing existing ones.
+    """
+
+    parts, pending = set(), [slide.part]
+    while pending:
+        part = pending.pop()
+        parts.add(part)
+        for relationship in part.rels.values():
+            if relationship.is_external or relationship.reltype in (RT.SLIDE_LAYOUT, RT.IMAGE):
+                continue
+            if relationship.target_part not in parts:
+                pending.append(relationship.target_part)
+    return parts
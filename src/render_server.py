@@ -0,0 +1,305 @@
+import argparse
+import base64
+import copy
+import json
+import multiprocessing
+import os
+import signal
+import socket
+import socketserver
+import sys
+import threading
+import time
+import traceback
+
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional
+
+import pandas as pd
+
+from pptx import Presentation
+from pptx.util import Inches
+
+from .batch import assemble_pack, pack_spec_from_dict
+from .helper.table_helpers import add_table
+from .presentation import BriefingPack
+from .slide_cache import SlideCache
+
+# Number of most recent requests the latency percentiles are taken over
+LATENCY_WINDOW = 1000
+
+# Blank presentation parsed once per worker; every pack is built on a deep copy of it
+_base_presentation = None
+_slide_cache_dir = None
+
+def _start_worker(slide_cache_dir: Optional[str]) -> None:
+    """
+    Prepares a worker process to render packs.
+
+    Parses the base template and builds a throwaway pack, so the first real request does not pay for
+    importing and first use of python-pptx, pandas and the slide helpers.
+    """
+
+    global _base_presentation, _slide_cache_dir
+
+    _base_presentation = Presentation()
+    _slide_cache_dir = slide_cache_dir
+
+    briefing_pack = BriefingPack("warm-up", "warm-up", "warm-up", "warm-up", presentation = copy.deepcopy(_base_presentation))
+    slide = briefing_pack.prs.slides.add_slide(briefing_pack.slide_layout)
+    add_table(slide, "Warm-up", pd.DataFrame({"A": [1], "B": ["b"]}), [], Inches(0.3), Inches(1), Inches(4))
+    briefing_pack.add_slide_template(slide, "Warm-up")
+    briefing_pack.save()
+
+def _render(pack: Dict[str, Any], return_bytes: bool) -> Dict[str, Any]:
+    """Renders one pack in a worker and returns the response body, with the pptx bytes or the path it was saved to."""
+
+    start = time.perf_counter()
+    spec = pack_spec_from_dict({"output_path": "", **pack})
+    slide_cache = SlideCache(_slide_cache_dir) if _slide_cache_dir else None
+    briefing_pack = assemble_pack(spec, slide_cache, copy.deepcopy(_base_presentation))
+
+    response: Dict[str, Any] = {"job_id": spec.job_id}
+    if return_bytes:
+        response["pptx"] = base64.b64encode(briefing_pack.save()).decode("ascii")
+    else:
+        if not spec.output_path:
+            raise ValueError("Pack has no output_path; set it or request the bytes with \"return\": \"bytes\"")
+        output_dir = os.path.dirname(spec.output_path)
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
+        briefing_pack.save(spec.output_path)
+        response["output_path"] = spec.output_path
+
+    if slide_cache:
+        response["cache_hits"], response["cache_misses"] = slide_cache.hits, slide_cache.misses
+    response["render_seconds"] = time.perf_counter() - start
+    return response
+
+class LatencyStats:
+    """Counts requests and keeps the latencies of the most recent ones, for the server's "stats" command."""
+
+    def __init__(self, window: int = LATENCY_WINDOW) -> None:
+        self.requests = 0
+        self.errors = 0
+        self._latencies = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float, ok: bool) -> None:
+        with self._lock:
+            self.requests += 1
+            self.errors += not ok
+            self._latencies.append(seconds)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Returns the request and error counts and the mean, p50, p95 and max latency in milliseconds."""
+
+        with self._lock:
+            latencies = sorted(self._latencies)
+            stats: Dict[str, Any] = {"requests": self.requests, "errors": self.errors}
+
+        if latencies:
+            stats.update({
+                "mean_ms": 1000 * sum(latencies) / len(latencies),
+                "p50_ms": 1000 * _percentile(latencies, 0.50),
+                "p95_ms": 1000 * _percentile(latencies, 0.95),
+                "max_ms": 1000 * latencies[-1],
+            })
+        return stats
+
+class RenderServer:
+    """
+    A resident process that renders briefing packs sent to it over a Unix domain socket.
+
+    Each request is one line of JSON and gets one line of JSON back. A pack request is
+    {"pack": {...}, "return": "bytes" | "path"}, with the pack described as in a batch spec file; the response
+    holds the base64 encoded .pptx or the path it was saved to. {"command": "stats"} returns request counts
+    and latencies, {"command": "reload"} replaces the worker pool, and {"command": "ping"} checks the server is up.
+
+    Packs are rendered on a pool of worker processes that have already imported the pack code and parsed the
+    base template. Workers are started fresh rather than forked, so a reload picks up changes to the code.
+    A reload lets the old pool finish the packs it has been given while new requests go to the new one.
+    """
+
+    def __init__(self, socket_path: str, max_workers: Optional[int] = None, slide_cache_dir: Optional[str] = None) -> None:
+        self.socket_path = socket_path
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.slide_cache_dir = slide_cache_dir
+        self.stats = LatencyStats()
+        self.reloads = 0
+
+        self._started = time.time()
+        self._pool_lock = threading.Lock()
+        self._pool = self._start_pool()
+
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+        self._server = _UnixServer(socket_path, _RequestHandler)
+        self._server.render_server = self
+
+    def serve_forever(self) -> None:
+        """Serves requests until `shutdown` is called, then waits for the packs in progress."""
+
+        try:
+            self._server.serve_forever()
+        finally:
+            self._server.server_close()
+            with self._pool_lock:
+                self._pool.shutdown()
+            if os.path.exists(self.socket_path):
+                os.unlink(self.socket_path)
+
+    def shutdown(self) -> None:
+        """Stops serving. Must be called from a different thread than `serve_forever`."""
+
+        self._server.shutdown()
+
+    def reload(self) -> None:
+        """Starts a new worker pool and retires the old one once the packs already sent to it are done."""
+
+        new_pool = self._start_pool()
+        with self._pool_lock:
+            old_pool, self._pool = self._pool, new_pool
+            self.reloads += 1
+        threading.Thread(target=old_pool.shutdown, name="retire-pool", daemon=True).start()
+
+    def handle(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Answers one request. Failures are returned as {"ok": false, "error": ...} rather than raised."""
+
+        command = request.get("command", "render")
+        if command == "render":
+            return self._handle_render(request)
+        if command == "stats":
+            return {"ok": True, "uptime_seconds": time.time() - self._started, "workers": self.max_workers, "reloads": self.reloads, **self.stats.snapshot()}
+        if command == "reload":
+            self.reload()
+            return {"ok": True, "reloads": self.reloads}
+        if command == "ping":
+            return {"ok": True}
+        return {"ok": False, "error": f"Unknown command: {command}"}
+
+    def _handle_render(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        start = time.perf_counter()
+        try:
+            if "pack" not in request:
+                raise ValueError("Render request has no \"pack\"")
+            return_bytes = request.get("return", "bytes") == "bytes"
+
+            with self._pool_lock:
+                # Submitted under the lock, so a reload cannot retire the pool in between
+                future = self._pool.submit(_render, request["pack"], return_bytes)
+            response = {"ok": True, **future.result()}
+        except Exception as error:
+            response = {"ok": False, "error": f"{type(error).__name__}: {error}", "traceback": traceback.format_exc()}
+
+        response["seconds"] = time.perf_counter() - start
+        self.stats.record(response["seconds"], response["ok"])
+        return response
+
+    def _start_pool(self) -> ProcessPoolExecutor:
+        pool = ProcessPoolExecutor(
+            max_workers=self.max_workers, mp_context=multiprocessing.get_context("spawn"),
+            initializer=_start_worker, initargs=(self.slide_cache_dir,),
+        )
+        # Start every worker now, so requests do not wait for them to warm up
+        for future in [pool.submit(time.sleep, 0.1) for _ in range(self.max_workers)]:
+            future.result()
+        return pool
+
+class _UnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    """Reads requests from a connection, one JSON document per line, until the client closes it."""
+
+    def handle(self) -> None:
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            try:
+                request = json.loads(line)
+                if not isinstance(request, dict):
+                    raise ValueError("Request must be a JSON object")
+                response = self.server.render_server.handle(request)
+            except ValueError as error:
+                response = {"ok": False, "error": f"Invalid request: {error}"}
+
+            self.wfile.write(json.dumps(response).encode("utf-8") + b"\n")
+            self.wfile.flush()
+
+def send_request(socket_path: str, request: Dict[str, Any], timeout: Optional[float] = None) -> Dict[str, Any]:
+    """Sends one request to a render server and returns its response."""
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.settimeout(timeout)
+        client.connect(socket_path)
+        client.sendall(json.dumps(request).encode("utf-8") + b"\n")
+        with client.makefile('rb') as stream:
+            line = stream.readline()
+
+    if not line:
+        raise ConnectionError(f"Render server at {socket_path} closed the connection without responding")
+    return json.loads(line)
+
+def render_bytes(socket_path: str, pack: Dict[str, Any], timeout: Optional[float] = None) -> bytes:
+    """Has a render server build a pack and returns the .pptx bytes. Raises RuntimeError if it fails."""
+
+    response = send_request(socket_path, {"pack": pack, "return": "bytes"}, timeout)
+    if not response["ok"]:
+        raise RuntimeError(response["error"])
+    return base64.b64decode(response["pptx"])
+
+def _percentile(ordered: List[float], fraction: float) -> float:
+    return ordered[min(int(fraction * len(ordered)), len(ordered) - 1)]
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Run a resident briefing pack render server, or send requests to one.")
+    subparsers = parser.add_subparsers(dest="action", required=True)
+
+    serve = subparsers.add_parser("serve", help="start a render server")
+    serve.add_argument("socket", help="path of the Unix domain socket to listen on")
+    serve.add_argument("-w", "--workers", type=int, default=None, help="number of worker processes (default: CPU count)")
+    serve.add_argument("--slide-cache", default=None, metavar="DIR", help="reuse slides whose inputs have not changed from a slide cache in DIR")
+
+    render = subparsers.add_parser("render", help="have a server build the packs in a batch spec file")
+    render.add_argument("socket")
+    render.add_argument("specs", help="JSON file describing the packs to build")
+
+    for action in ("stats", "reload"):
+        subparsers.add_parser(action, help=f"send a {action} command to a server").add_argument("socket")
+
+    args = parser.parse_args(argv)
+
+    if args.action == "serve":
+        server = RenderServer(args.socket, args.workers, args.slide_cache)
+
+        # shutdown blocks until serve_forever returns, so it must not run on the thread serving
+        stop = lambda *_: threading.Thread(target=server.shutdown).start()
+        signal.signal(signal.SIGTERM, stop)
+        signal.signal(signal.SIGINT, stop)
+        signal.signal(signal.SIGHUP, lambda *_: threading.Thread(target=server.reload).start())
+
+        print(f"Serving on {args.socket} with {server.max_workers} workers", flush=True)
+        server.serve_forever()
+        print(json.dumps(server.stats.snapshot()))
+        return 0
+
+    if args.action == "render":
+        failures = 0
+        with open(args.specs, 'r') as file:
+            data = json.load(file)
+        for pack in data["packs"] if isinstance(data, dict) else data:
+            response = send_request(args.socket, {"pack": pack, "return": "path"})
+            if response["ok"]:
+                print(f"{response['job_id']}: {response['output_path']} ({response['seconds']:.2f}s)")
+            else:
+                failures += 1
+                print(f"FAILED {pack.get('job_id')}: {response['error']}")
+        return 1 if failures else 0
+
+    print(json.dumps(send_request(args.socket, {"command": args.action}), indent=2))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,40 @@
+from typing import TYPE_CHECKING
+
+from pptx.slide import Slide
+
+from .helper.record_helpers import BlockRecord, SlideRecord, write_slide_record
+
+if TYPE_CHECKING:
+    from .frame.base import BaseSlide
+
+def render_frame(frame: 'BaseSlide', briefing_pack) -> Slide:
+    """
+    Creates the slide of a frame in a briefing pack from the frame's layout, without the header and footer.
+
+    The frame only describes its content: the slide and its shapes belong to the pack's presentation, and nothing
+    about them is stored on the frame. Raises LayoutOverflowError first if the pack rejects overflowing slides
+    and the layout runs into the footer. In a refreshable pack the slide records the frame's type and fingerprint
+    and the shapes and fingerprint of each block.
+    """
+
+    prs = briefing_pack.prs
+    layout = frame.layout(prs.slide_width, prs.slide_height)
+    briefing_pack.check_layout(layout, frame.slide_title)
+
+    slide = prs.slides.add_slide(briefing_pack.slide_layout) # Create an empty slide
+    if not briefing_pack.refreshable:
+        layout.render(slide, briefing_pack)
+        return slide
+
+    block_shape_ids = layout.render_blocks(slide, briefing_pack)
+    blocks = [
+        BlockRecord(type(placement.block).__name__, shape_ids, placement.fingerprint(briefing_pack))
+        for placement, shape_ids in zip(layout.placements, block_shape_ids)
+    ]
+    write_slide_record(slide._element, SlideRecord(frame_type(frame), frame.fingerprint(briefing_pack, metadata = False), blocks))
+    return slide
+
+def frame_type(frame: 'BaseSlide') -> str:
+    """The qualified name of a frame's class, as slide records hold it."""
+
+    return f"{type(frame).__module__}.{type(frame).__qualname__}"
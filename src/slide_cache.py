@@ -0,0 +1,247 @@
+import hashlib
+import io
+import json
+import os
+import threading
+
+from dataclasses import dataclass
+from typing import Any, Dict, List, Mapping, Optional
+
+import pptx
+
+from pptx.opc.constants import RELATIONSHIP_TYPE as RT
+from pptx.parts.image import ImagePart
+from pptx.oxml import parse_xml
+from pptx.slide import Slide
+from pptx.util import Length
+
+from .helper.chart_helpers import ChartSpec
+from .helper.csv_helpers import CsvTable, is_dataframe
+from .helper.input_helpers import input_digest, input_name, input_stat, is_input_file, is_memory_input, open_input
+
+# Bump when a change to the slide code alters what the same inputs render to
+CACHE_VERSION = 2
+
+_file_digests: Dict[str, tuple[int, int, str]] = {}
+_file_digests_lock = threading.Lock()
+
+def file_digest(path: str) -> str:
+    """Returns the SHA-256 of a file's bytes, memoised until the file's modification time or size changes."""
+
+    path = os.path.abspath(path)
+    stat = input_stat(path)
+
+    with _file_digests_lock:
+        cached = _file_digests.get(path)
+    if cached and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+        return cached[2]
+
+    with open_input(path) as file:
+        digest = hashlib.file_digest(file, "sha256").hexdigest()
+
+    with _file_digests_lock:
+        _file_digests[path] = (stat.st_mtime_ns, stat.st_size, digest)
+    return digest
+
+def file_content(source: Any) -> Any:
+    """
+    Stands the digest of a file's bytes in for its path, so that a fingerprint changes when the file does.
+
+    Inputs held in memory (see `open_input`) are stood in for by the digest of their bytes too. Anything that is not
+    an input file, such as a DataFrame, is returned unchanged.
+    """
+
+    if is_memory_input(source):
+        return ("data", input_name(source), input_digest(source))
+    if isinstance(source, (str, os.PathLike)) and is_input_file(source):
+        return ("file", file_digest(source))
+    return source
+
+def visual_content(source: Any) -> Any:
+    """Stands in for an image slot in a fingerprint: the digest of an image file, or a chart's settings and data (see `file_content`)."""
+
+    if isinstance(source, ChartSpec):
+        return ["chart", source.kind, source.categories, source.series, source.title, source.number_format, file_content(source.data)]
+    return file_content(source)
+
+def fingerprint(*values: Any) -> str:
+    """
+    Returns a hex digest identifying a combination of values.
+
+    Strings, numbers, lengths, colours, bytes, DataFrames, CsvTables and (nested) lists, tuples and dicts of them are supported.
+    """
+
+    hasher = hashlib.sha256()
+    _update(hasher, [CACHE_VERSION, pptx.__version__, list(values)])
+    return hasher.hexdigest()
+
+def _update(hasher: 'hashlib._Hash', value: Any) -> None:
+    """Feeds a value to the hasher with its type and length, so different values can never encode the same way."""
+
+    if is_dataframe(value):
+        import pandas as pd
+
+        hasher.update(b"D")
+        _update(hasher, [[str(column) for column in value.columns], [str(dtype) for dtype in value.dtypes]])
+        hasher.update(pd.util.hash_pandas_object(value, index=True).to_numpy().tobytes())
+    elif isinstance(value, CsvTable):
+        hasher.update(b"T")
+        _update(hasher, [value.columns, value.rows])
+    elif isinstance(value, (list, tuple)):
+        hasher.update(b"L%d:" % len(value))
+        for item in value:
+            _update(hasher, item)
+    elif isinstance(value, dict):
+        hasher.update(b"M%d:" % len(value))
+        for key in sorted(value, key=str):
+            _update(hasher, [key, value[key]])
+    elif isinstance(value, Length):
+        # Lengths in inches and the same lengths in EMU, as frames sent to worker processes carry them, are the same value
+        _update(hasher, int(value))
+    elif isinstance(value, bytes):
+        hasher.update(b"B%d:" % len(value))
+        hasher.update(value)
+    else:
+        text = f"{type(value).__name__}:{value!r}".encode("utf-8")
+        hasher.update(b"S%d:" % len(text))
+        hasher.update(text)
+
+@dataclass
+class SlideParts:
+    """
+    A rendered slide detached from its presentation: the slide's XML and the images it relates to, as
+    (relationship id, media name) pairs in relationship order. Media names are the image's SHA-1 and extension.
+    """
+
+    xml: bytes
+    images: List[tuple[str, str]]
+
+def detach_slide(slide: Slide, media: Dict[str, bytes]) -> Optional[SlideParts]:
+    """
+    Returns a slide's parts, adding the bytes of each image it shows to `media` under its media name, or returns None
+    if the slide has relationships other than to its layout and images, which cannot be detached.
+    """
+
+    images = []
+    for rId, relationship in slide.part.rels.items():
+        if relationship.reltype == RT.SLIDE_LAYOUT:
+            continue
+        if relationship.reltype != RT.IMAGE or relationship.is_external:
+            return None
+
+        image_part = relationship.target_part
+        name = f"{image_part.sha1}.{image_part.ext}"
+        if name not in media:
+            media[name] = image_part.blob
+        images.append((rId, name))
+
+    images.sort(key=lambda image: int(image[0][3:]))
+    return SlideParts(slide.part.blob, images)
+
+def attach_slide(briefing_pack, parts: SlideParts, media: Mapping[str, bytes], image_parts: Optional[Dict[str, ImagePart]] = None) -> Slide:
+    """
+    Adds a detached slide to the end of a briefing pack and returns it.
+
+    Images the pack already holds are shared rather than added again, and relationship ids are renumbered where
+    the pack assigns different ones, so the slide is the same as if it had been rendered in the pack.
+    `image_parts` remembers the pack's image parts by media name across calls, so attaching many slides
+    that show the same image only looks it up in the package once.
+    """
+
+    slide = briefing_pack.prs.slides.add_slide(briefing_pack.slide_layout)
+    element = parse_xml(parts.xml)
+
+    # Relate the images in their original order, so they get the same ids as when the slide was rendered
+    rIds = {}
+    for rId, name in parts.images:
+        image_part = image_parts.get(name) if image_parts is not None else None
+        if image_part is None:
+            image_part = slide.part.package.get_or_add_image_part(io.BytesIO(media[name]))
+            if image_parts is not None:
+                image_parts[name] = image_part
+        rIds[rId] = slide.part.relate_to(image_part, RT.IMAGE)
+    if any(rId != new_rId for rId, new_rId in rIds.items()):
+        for blip in element.xpath(".//a:blip[@r:embed]"):
+            blip.rEmbed = rIds[blip.rEmbed]
+
+    # Swap the parsed element in for the new slide's own, which is much cheaper than moving its content across
+    # documents. python-pptx caches the Slide wrapping the old element, so that is dropped too.
+    slide_part = slide.part
+    slide_part._element = element
+    slide_part.__dict__.pop("slide", None)
+    return slide_part.slide
+
+class SlideCache:
+    """
+    Keeps rendered slides on disk under the fingerprint of the frame and pack that produced them.
+
+    An entry is the slide's XML and a manifest of the images it shows, which are stored once each under their SHA-1.
+    The manifest is written last, so an entry only counts once it is complete.
+    Loading an entry splices the cached slide into a pack in place of rendering it again. Slides with
+    relationships other than to their layout and images are not cached. Entries are written to a temporary
+    name first, so concurrent builds sharing a cache directory never read a partly written one.
+    """
+
+    def __init__(self, cache_dir: str = ".slide_cache") -> None:
+        self.cache_dir = cache_dir
+        self.hits = 0
+        self.misses = 0
+
+        os.makedirs(os.path.join(cache_dir, "media"), exist_ok=True)
+
+    def load(self, briefing_pack, key: str) -> Optional[Slide]:
+        """Adds the slide cached under `key` to the briefing pack and returns it, or returns None on a miss."""
+
+        try:
+            with open(self._entry_path(key, "json"), 'r', encoding="utf-8") as file:
+                manifest = json.load(file)
+            with open(self._entry_path(key, "xml"), 'rb') as file:
+                parts = SlideParts(file.read(), [(image["rId"], image["media"]) for image in manifest["images"]])
+            media = {}
+            for _, name in parts.images:
+                with open(self._media_path(name), 'rb') as file:
+                    media[name] = file.read()
+        except (OSError, ValueError, KeyError):
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return attach_slide(briefing_pack, parts, media)
+
+    def has(self, key: str) -> bool:
+        """Returns whether a complete entry is cached under `key`, without loading it."""
+
+        return os.path.exists(self._entry_path(key, "json"))
+
+    def store(self, key: str, slide: Slide) -> bool:
+        """Caches a rendered slide under `key`. Returns False if the slide cannot be cached."""
+
+        media: Dict[str, bytes] = {}
+        parts = detach_slide(slide, media)
+        if parts is None:
+            return False
+
+        for name, blob in media.items():
+            if not os.path.exists(self._media_path(name)):
+                self._write(self._media_path(name), blob)
+
+        images = [{"rId": rId, "media": name} for rId, name in parts.images]
+        self._write(self._entry_path(key, "xml"), parts.xml)
+        self._write(self._entry_path(key, "json"), json.dumps({"images": images}).encode("utf-8"))
+
+        return True
+
+    def report(self) -> str:
+        return f"Slide cache: {self.hits} hits, {self.misses} misses"
+
+    def _entry_path(self, key: str, extension: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.{extension}")
+
+    def _media_path(self, media: str) -> str:
+        return os.path.join(self.cache_dir, "media", media)
+
+    def _write(self, path: str, data: bytes) -> None:
+        temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temp_path, 'wb') as file:
+            file.write(data)
+        os.replace(temp_path, path)
@@ -0,0 +1,157 @@
+import copy
+import io
+
+from typing import Dict, List, Optional, Sequence, Type
+
+from pptx import Presentation
+from pptx.presentation import Presentation as PresentationType
+
+from .frame.base import BaseSlide
+from .helper.image_helpers import ImagePreprocessor
+from .helper.package_helpers import package_bytes
+from .helper.record_helpers import METADATA_FIELDS, read_slide_record, remove_record
+from .helper.shape_helpers import shapes_by_id
+from .helper.text_helpers import set_textbox_text
+from .presentation import BriefingPack, SLIDE_TITLE_FONT_SIZE
+
+class TemplateMismatchError(Exception):
+    """Raised when the frames given to a template do not have the structure it was built from."""
+
+class _SlideSlots:
+    """The shapes of one template slide that are refilled for every pack stamped from it."""
+
+    def __init__(self, frame_type: Type[BaseSlide], block_types: List[str], block_shape_ids: List[List[int]], title_shape_id: int) -> None:
+        self.frame_type = frame_type
+        self.block_types = block_types
+        self.block_shape_ids = block_shape_ids
+        self.title_shape_id = title_shape_id
+
+    @property
+    def shape_ids(self) -> List[int]:
+        return [shape_id for shape_ids in self.block_shape_ids for shape_id in shape_ids] + [self.title_shape_id]
+
+class PackTemplate:
+    """
+    A briefing pack built once from a list of frames, from which packs with the same structure but different data are stamped out.
+
+    The template pack is kept as an in-memory .pptx, which each process parses once. Stamping a pack deep-copies the
+    parsed template and fills in the data of the frames it is given: table contents, bullet points, text, images, slide titles and the header and footer metadata.
+    Shapes are moved to where each frame's layout puts them, so content of a different length still lines up,
+    but no shapes are created. Frames must be of the same types as the ones the template was built from,
+    with the same blocks in their layouts (e.g. a summary slide with one table cannot fill one built with two).
+    With `shared_styles` the template and the packs stamped from it use shared table and text styles (see `BriefingPack`).
+    """
+
+    def __init__(self, frames: Sequence[BaseSlide], chrome_in_layout: bool = False, shared_styles: bool = False) -> None:
+        self.chrome_in_layout = chrome_in_layout
+        self.shared_styles = shared_styles
+
+        # The metadata is written as placeholders that are found and replaced when stamping. The pack is built
+        # refreshable only for the records of which shapes each slide's blocks and title are, which are then removed
+        briefing_pack = BriefingPack(*(_placeholder(field) for field in METADATA_FIELDS), chrome_in_layout = chrome_in_layout, shared_styles = shared_styles, refreshable = True)
+        self._slides = [self._add_frame(briefing_pack, page) for frame in frames for page in frame.pages(briefing_pack)]
+        self._metadata_shape_ids = self._find_metadata_shapes(briefing_pack.prs)
+        remove_record(briefing_pack.prs.part._element)
+
+        # Stored uncompressed, since it is only ever read back into memory
+        self.blob = package_bytes(briefing_pack.prs, "store")
+        self._presentation = None
+
+    def __getstate__(self) -> dict:
+        # Worker processes parse their own copy from the blob
+        return {**self.__dict__, "_presentation": None}
+
+    @property
+    def presentation(self) -> PresentationType:
+        """The template pack, parsed from the blob the first time it is needed."""
+
+        if self._presentation is None:
+            self._presentation = Presentation(io.BytesIO(self.blob))
+        return self._presentation
+
+    def stamp(self, frames: Sequence[BaseSlide], reference_number: str, classification: str, code_version: str, job_id: str, image_preprocessor: Optional[ImagePreprocessor] = None, reject_overflow: bool = False) -> BriefingPack:
+        """
+        Returns a new briefing pack with the template's structure and the data of `frames`, ready to save.
+
+        Frames that spread over several slides must need as many slides as they did in the template.
+        """
+
+        briefing_pack = BriefingPack(
+            reference_number, classification, code_version, job_id, chrome_in_layout = self.chrome_in_layout,
+            image_preprocessor = image_preprocessor, reject_overflow = reject_overflow, presentation = copy.deepcopy(self.presentation),
+            shared_styles = self.shared_styles,
+        )
+        prs = briefing_pack.prs
+
+        frames = [page for frame in frames for page in frame.pages(briefing_pack)]
+        if len(frames) != len(self._slides):
+            raise TemplateMismatchError(f"Template has {len(self._slides)} slides, got frames for {len(frames)}")
+
+        layouts = [frame.layout(prs.slide_width, prs.slide_height) for frame in frames]
+        for index, (frame, layout, slots) in enumerate(zip(frames, layouts, self._slides)):
+            block_types = [type(placement.block).__name__ for placement in layout.placements]
+            if type(frame) is not slots.frame_type or block_types != slots.block_types:
+                raise TemplateMismatchError(
+                    f"Frame {index} ('{frame.slide_title}') does not match the template: expected a {slots.frame_type.__name__} with "
+                    f"{_names(slots.block_types)}, got a {type(frame).__name__} with {_names(block_types)}"
+                )
+            briefing_pack.check_layout(layout, frame.slide_title)
+
+        if image_preprocessor:
+            # Queue every image in the pack before any is needed
+            for layout in layouts:
+                layout.prepare_images(briefing_pack)
+
+        for slide, frame, layout, slots in zip(prs.slides, frames, layouts, self._slides):
+            shapes = shapes_by_id(slide, slots.shape_ids)
+            for placement, shape_ids in zip(layout.placements, slots.block_shape_ids):
+                placement.block.fill(slide, [shapes[shape_id] for shape_id in shape_ids], placement, briefing_pack)
+            set_textbox_text(shapes[slots.title_shape_id], frame.slide_title, SLIDE_TITLE_FONT_SIZE)
+
+        self._fill_metadata(briefing_pack, dict(zip(METADATA_FIELDS, (reference_number, classification, code_version, job_id))))
+
+        return briefing_pack
+
+    def _add_frame(self, briefing_pack: BriefingPack, frame: BaseSlide) -> _SlideSlots:
+        """Builds a frame's slide as any pack does, taking which shapes each block and the title created from its record."""
+
+        briefing_pack.add_frame(frame)
+        slide = briefing_pack.prs.slides[-1]
+        record = read_slide_record(slide._element)
+        remove_record(slide._element)
+
+        block_types = [block.block_type for block in record.blocks]
+        return _SlideSlots(type(frame), block_types, [block.shape_ids for block in record.blocks], record.title_shape_id)
+
+    def _find_metadata_shapes(self, prs: Presentation) -> Dict[Optional[int], List[int]]:
+        """Returns the ids of the shapes holding metadata placeholders, by slide index (None for the slide layout)."""
+
+        containers = {None: prs.slide_layouts[6]} if self.chrome_in_layout else dict(enumerate(prs.slides))
+        placeholders = [_placeholder(field) for field in METADATA_FIELDS]
+
+        metadata_shape_ids = {}
+        for index, container in containers.items():
+            metadata_shape_ids[index] = [
+                shape.shape_id for shape in container.shapes
+                if shape.has_text_frame and any(placeholder in shape.text_frame.text for placeholder in placeholders)
+            ]
+        return metadata_shape_ids
+
+    def _fill_metadata(self, briefing_pack: BriefingPack, metadata: Dict[str, str]) -> None:
+        """Replaces the metadata placeholders in the header and footer with the pack's values."""
+
+        prs = briefing_pack.prs
+        for index, shape_ids in self._metadata_shape_ids.items():
+            container = briefing_pack.slide_layout if index is None else prs.slides[index]
+            shapes = shapes_by_id(container, shape_ids)
+
+            for shape_id in shape_ids:
+                for text in shapes[shape_id]._element.xpath(".//a:t[text()]"):
+                    for field, value in metadata.items():
+                        text.text = text.text.replace(_placeholder(field), value)
+
+def _placeholder(field: str) -> str:
+    return f"⟦{field}⟧"
+
+def _names(block_types: List[str]) -> str:
+    return "[" + ", ".join(block_types) + "]"
@@ -0,0 +1,222 @@
+import functools
+import json
+import os
+import threading
+import time
+import tracemalloc
+
+from typing import IO, Any, Callable, Dict, List, Optional, TypeVar, Union
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+# The tracer recording spans, if any. Checked on every traced call, so tracing costs one global lookup when off.
+_active_tracer: Optional['Tracer'] = None
+
+class Span:
+    """One timed piece of work: a helper call, a frame being added or a save."""
+
+    __slots__ = ("tracer", "name", "category", "args", "start", "duration", "child_duration", "thread_id", "process_id", "_memory_before")
+
+    def __init__(self, tracer: 'Tracer', name: str, category: str, args: Dict[str, Any]) -> None:
+        self.tracer, self.name, self.category, self.args = tracer, name, category, args
+        self.start = self.duration = self.child_duration = 0
+        self.process_id = tracer.process_id
+
+    def set(self, **args: Any) -> None:
+        """Attaches extra details to the span, such as the number of shapes on a slide."""
+
+        self.args.update(args)
+
+    def __enter__(self) -> 'Span':
+        self.thread_id = threading.get_ident()
+        self.tracer._stack().append(self)
+        if self.tracer.memory:
+            self._memory_before = tracemalloc.get_traced_memory()[0]
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.duration = time.perf_counter_ns() - self.start
+        if self.tracer.memory:
+            self.args["memory_delta_kb"] = round((tracemalloc.get_traced_memory()[0] - self._memory_before) / 1024, 1)
+
+        stack = self.tracer._stack()
+        stack.pop()
+        if stack:
+            stack[-1].child_duration += self.duration
+        self.tracer.spans.append(self)
+
+class _NullSpan:
+    """Stands in for a span when tracing is off."""
+
+    def set(self, **args: Any) -> None:
+        pass
+
+    def __enter__(self) -> '_NullSpan':
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        pass
+
+_NULL_SPAN = _NullSpan()
+
+class Tracer:
+    """
+    Records timed spans around the work of building and saving briefing packs, while it is active.
+
+    Activate it with `with Tracer() as tracer:`; pack code run inside the block, on any thread, is traced.
+    With `memory` each span also records the net change in Python-allocated memory while it ran, across all threads
+    (through tracemalloc, which slows everything down noticeably). The spans can be exported as a Chrome trace-event file, to be
+    opened in chrome://tracing or Perfetto, or summarised as a table of time per span name.
+
+    Work done in other processes is traced by a tracer of their own, whose `export_spans` are sent back and added
+    to this one with `merge_spans`; they keep the process they were recorded in.
+    """
+
+    def __init__(self, memory: bool = False) -> None:
+        self.memory = memory
+        self.spans: List[Span] = []
+        self.process_id = os.getpid()
+
+        self._local = threading.local()
+        self._started_tracemalloc = False
+        self._origin = time.perf_counter_ns()
+        # The wall clock at the origin, which spans recorded in other processes are placed against
+        self._wall_origin = time.time_ns()
+
+    def __enter__(self) -> 'Tracer':
+        global _active_tracer
+
+        # A tracer inherited by a forked process records nothing its parent sees, so it is replaced
+        if _active_tracer is not None and _active_tracer.process_id == os.getpid():
+            raise RuntimeError("Another tracer is already active")
+        if self.memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+        _active_tracer = self
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        global _active_tracer
+
+        _active_tracer = None
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+
+    def span(self, name: str, category: str = "pack", **args: Any) -> Span:
+        return Span(self, name, category, args)
+
+    def export_spans(self) -> List[Dict[str, Any]]:
+        """Returns the spans as plain dicts timed by the wall clock, to be sent to another process and merged there."""
+
+        return [
+            {
+                "name": span.name, "category": span.category, "args": span.args, "start": self._wall_origin + span.start - self._origin,
+                "duration": span.duration, "child_duration": span.child_duration, "thread_id": span.thread_id, "process_id": span.process_id,
+            }
+            for span in self.spans
+        ]
+
+    def merge_spans(self, exported: List[Dict[str, Any]]) -> None:
+        """Adds spans exported by a tracer in another process, placed on this tracer's clock."""
+
+        for record in exported:
+            merged = Span(self, record["name"], record["category"], record["args"])
+            merged.start = self._origin + record["start"] - self._wall_origin
+            merged.duration, merged.child_duration = record["duration"], record["child_duration"]
+            merged.thread_id, merged.process_id = record["thread_id"], record["process_id"]
+            self.spans.append(merged)
+
+    def chrome_trace(self) -> Dict[str, Any]:
+        """Returns the spans in the Chrome trace-event format, as complete ("X") events timed in microseconds."""
+
+        thread_names = {thread.ident: thread.name for thread in threading.enumerate()}
+
+        events = [
+            {"name": "process_name", "ph": "M", "pid": process_id, "args": {"name": "pack" if process_id == self.process_id else f"worker {process_id}"}}
+            for process_id in sorted({span.process_id for span in self.spans})
+        ]
+        events += [
+            {"name": "thread_name", "ph": "M", "pid": process_id, "tid": thread_id, "args": {"name": thread_names.get(thread_id, str(thread_id)) if process_id == self.process_id else str(thread_id)}}
+            for process_id, thread_id in sorted({(span.process_id, span.thread_id) for span in self.spans})
+        ]
+        for span in sorted(self.spans, key=lambda span: span.start):
+            events.append({
+                "name": span.name, "cat": span.category, "ph": "X", "pid": span.process_id, "tid": span.thread_id,
+                "ts": (span.start - self._origin) / 1000, "dur": span.duration / 1000, "args": span.args,
+            })
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def write_chrome_trace(self, file: Union[str, os.PathLike, IO[str]]) -> None:
+        """Writes the Chrome trace-event JSON to a path or a writable text stream."""
+
+        if isinstance(file, (str, os.PathLike)):
+            with open(file, 'w') as stream:
+                json.dump(self.chrome_trace(), stream, default=str)
+        else:
+            json.dump(self.chrome_trace(), file, default=str)
+
+    def summary(self) -> str:
+        """
+        Returns a table of the calls, total, self (excluding nested spans), mean and maximum time of each span name,
+        most expensive first, with the net memory allocated when memory tracing is on.
+        """
+
+        totals: Dict[str, List[float]] = {}
+        for span in self.spans:
+            row = totals.setdefault(span.name, [0, 0, 0, 0, 0])
+            row[0] += 1
+            row[1] += span.duration
+            row[2] += span.duration - span.child_duration
+            row[3] = max(row[3], span.duration)
+            row[4] += span.args.get("memory_delta_kb", 0)
+
+        header = f"{'span':<52} {'calls':>7} {'total ms':>10} {'self ms':>10} {'mean ms':>9} {'max ms':>9}"
+        lines = [header + (f" {'mem KB':>10}" if self.memory else "")]
+        for name, (calls, total, own, longest, memory) in sorted(totals.items(), key=lambda item: -item[1][2]):
+            line = f"{name:<52} {calls:>7} {total / 1e6:>10.2f} {own / 1e6:>10.2f} {total / calls / 1e6:>9.3f} {longest / 1e6:>9.2f}"
+            lines.append(line + (f" {memory:>10.1f}" if self.memory else ""))
+        return "\n".join(lines)
+
+    def _stack(self) -> List[Span]:
+        """The spans open on the current thread, innermost last."""
+
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+def active_tracer() -> Optional[Tracer]:
+    """Returns the tracer recording spans in this process, if any."""
+
+    tracer = _active_tracer
+    return tracer if tracer is not None and tracer.process_id == os.getpid() else None
+
+def span(name: str, category: str = "pack", **args: Any) -> Union[Span, _NullSpan]:
+    """Returns a span of the active tracer to use as a context manager, or one that does nothing if none is active."""
+
+    tracer = _active_tracer
+    if tracer is None:
+        return _NULL_SPAN
+    return tracer.span(name, category, **args)
+
+def traced(function: F) -> F:
+    """
+    Decorates a helper so each call is recorded as a span named after its module and function while a tracer is active.
+
+    Only helpers called once per table, image, text box or slide are traced. A helper called for every row or cell
+    would pay for the wrapper on each call even with tracing off, and would flood traces with tiny spans.
+    """
+
+    module = function.__module__.rsplit(".", 1)[-1]
+    name = f"{module}.{function.__qualname__}"
+
+    @functools.wraps(function)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        tracer = _active_tracer
+        if tracer is None:
+            return function(*args, **kwargs)
+        with tracer.span(name, module):
+            return function(*args, **kwargs)
+    return wrapper
@@ -0,0 +1,7 @@
+import pytest
+
+from .packs import PackInputs
+
+@pytest.fixture
+def inputs(tmp_path) -> PackInputs:
+    return PackInputs(str(tmp_path))
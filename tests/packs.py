@@ -0,0 +1,73 @@
+"""Inputs, frames and comparisons shared by the tests that build whole packs."""
+
+import io
+import json
+import os
+import zipfile
+
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from PIL import Image
+from pptx.dml.color import RGBColor
+
+from src.frame.base import BaseSlide
+from src.frame.new import NewSlide
+from src.frame.summary import SummarySlide
+from src.frame.table import PaginatedTableSlide
+from src.frame.title import TitleSlide
+from src.helper.chart_helpers import ChartSpec
+from src.helper.json_helpers import BulletPointStore
+
+CELL_COLOURS = [RGBColor(255, 0, 0), RGBColor(255, 128, 0), RGBColor(255, 255, 0)]
+METADATA = ("REF1", "OFFICIAL", "5.0.0", "job-1")
+
+class PackInputs:
+    """Images, tables and bullet points written to a directory for frames to read."""
+
+    def __init__(self, directory: str) -> None:
+        self.directory = directory
+        self.bullet_points = os.path.join(directory, "bullet_points.json")
+        with open(self.bullet_points, 'w') as file:
+            json.dump({key: [f"A {key} point describing the scenario.", f"Another {key} point."] for key in ("summary", "table", "scenario", "assumptions")}, file)
+        self.store = BulletPointStore(self.bullet_points)
+
+        self.png = os.path.join(directory, "image.png")
+        self.jpg = os.path.join(directory, "image.jpg")
+        pixels = np.random.default_rng(0).integers(0, 255, (120, 160, 3), dtype=np.uint8)
+        Image.fromarray(pixels).save(self.png)
+        Image.fromarray(pixels[:, ::-1]).save(self.jpg)
+
+        self.csv = os.path.join(directory, "table.csv")
+        self.table().to_csv(self.csv, index=False)
+        self.long_csv = os.path.join(directory, "long.csv")
+        pd.DataFrame({
+            "Region": [f"Region {i % 7}" for i in range(90)], "Site": [f"Site {i}" for i in range(90)], "Count": [i * 7 % 100 for i in range(90)],
+        }).to_csv(self.long_csv, index=False)
+
+    def table(self, changed_value: int = 0) -> pd.DataFrame:
+        return pd.DataFrame({"Name": [f"Item {i}" for i in range(6)], "Value": [i * 10 + (changed_value if i == 0 else 0) for i in range(6)], "Share": [i / 4 for i in range(6)]})
+
+    def frames(self, chart: bool = False, changed_value: int = 0, summary_title: str = "Summary", summary_image: Optional[str] = None) -> List[BaseSlide]:
+        """A title, a new, a summary and a paginated table frame; with `chart` the summary's second image is a chart of its table."""
+
+        table = self.table(changed_value)
+        second_image = ChartSpec(table, kind = "bar", title = "Values") if chart else self.jpg
+        return [
+            TitleSlide("Title", "1 Jan", self.png),
+            NewSlide("New", "Consequences", self.csv, CELL_COLOURS, "table", "scenario", "assumptions", self.jpg, self.store),
+            SummarySlide(summary_title, "summary", "Some comments", "Table 1", table, CELL_COLOURS, "Table 2", self.csv, CELL_COLOURS, summary_image or self.png, second_image, self.store),
+            PaginatedTableSlide("Sites", "All sites", self.long_csv, CELL_COLOURS),
+        ]
+
+def package_parts(blob: bytes) -> Dict[str, bytes]:
+    """The uncompressed members of a saved pack, leaving out the document properties, which carry the time it was saved."""
+
+    archive = zipfile.ZipFile(io.BytesIO(blob))
+    return {name: archive.read(name) for name in archive.namelist() if not name.startswith("docProps/")}
+
+def differing_parts(first: bytes, second: bytes) -> List[str]:
+    first, second = package_parts(first), package_parts(second)
+    return sorted(name for name in first.keys() | second.keys() if first.get(name) != second.get(name))
@@ -0,0 +1,80 @@
+import os
+
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+from src.helper.image_helpers import ImagePreprocessor
+from src.presentation import BriefingPack
+from src.slide_cache import SlideCache
+
+from .packs import METADATA, differing_parts
+
+def build(frames, parallel: bool, **kwargs) -> tuple[bytes, BriefingPack]:
+    briefing_pack = BriefingPack(*METADATA, **kwargs)
+    if parallel:
+        briefing_pack.add_frames(frames, max_workers = 2, chunk_size = 2)
+    else:
+        for frame in frames:
+            briefing_pack.add_frame(frame)
+    return briefing_pack.save(), briefing_pack
+
+def test_parallel_pack_matches_serial(inputs):
+    serial, _ = build(inputs.frames(), parallel = False)
+    parallel, _ = build(inputs.frames(), parallel = True)
+    assert differing_parts(serial, parallel) == []
+
+def test_parallel_pack_matches_serial_with_pack_settings(inputs):
+    for settings in ({"chrome_in_layout": True}, {"shared_styles": True}, {"refreshable": True}):
+        serial, _ = build(inputs.frames(), parallel = False, **settings)
+        parallel, _ = build(inputs.frames(), parallel = True, **settings)
+        assert differing_parts(serial, parallel) == [], settings
+
+def test_parallel_pack_counts_slide_cache_like_serial(inputs, tmp_path):
+    counts = {}
+    for parallel in (False, True):
+        cache_dir = os.path.join(tmp_path, f"cache-{parallel}")
+        for run in ("cold", "warm"):
+            cache = SlideCache(cache_dir)
+            build(inputs.frames(), parallel, slide_cache = cache)
+            counts[parallel, run] = (cache.hits, cache.misses)
+
+    assert counts[True, "cold"] == counts[False, "cold"]
+    assert counts[True, "warm"] == counts[False, "warm"]
+    assert counts[False, "cold"][0] == 0 and counts[False, "warm"][1] == 0
+
+def test_parallel_pack_renders_chart_slides_once(inputs, monkeypatch):
+    # Workers run on threads of this process, so every render is counted
+    monkeypatch.setattr("src.presentation.ProcessPoolExecutor", ThreadPoolExecutor)
+    renders = Counter()
+    render_page = BriefingPack._render_page
+    def counting_render_page(briefing_pack, frame):
+        renders[frame.slide_title] += 1
+        return render_page(briefing_pack, frame)
+    monkeypatch.setattr(BriefingPack, "_render_page", counting_render_page)
+
+    parallel, _ = build(inputs.frames(chart = True), parallel = True)
+    table_pages = len(list(inputs.frames()[-1].pages(BriefingPack(*METADATA))))
+    assert renders == {"Title": 1, "New": 1, "Summary": 1, "Sites": 1, "Sites (cont.)": table_pages - 1}
+
+    monkeypatch.undo()
+    serial, _ = build(inputs.frames(chart = True), parallel = False)
+    assert differing_parts(serial, parallel) == []
+
+def test_workers_shut_down_their_image_preprocessors(inputs, tmp_path, monkeypatch):
+    monkeypatch.setattr("src.presentation.ProcessPoolExecutor", ThreadPoolExecutor)
+    preprocessors = []
+    init = ImagePreprocessor.__init__
+    def recording_init(preprocessor, *args, **kwargs):
+        init(preprocessor, *args, **kwargs)
+        preprocessors.append(preprocessor)
+    monkeypatch.setattr(ImagePreprocessor, "__init__", recording_init)
+
+    with ImagePreprocessor(os.path.join(tmp_path, "images")) as image_preprocessor:
+        parallel, _ = build(inputs.frames(), parallel = True, image_preprocessor = image_preprocessor)
+        workers = preprocessors[1:]
+        assert workers and all(worker._executor._shutdown for worker in workers)
+        assert not image_preprocessor._executor._shutdown
+
+    with ImagePreprocessor(os.path.join(tmp_path, "images")) as image_preprocessor:
+        serial, _ = build(inputs.frames(), parallel = False, image_preprocessor = image_preprocessor)
+    assert differing_parts(serial, parallel) == []
@@ -0,0 +1,51 @@
+import io
+
+from pptx import Presentation
+
+from src.presentation import BriefingPack
+
+from .packs import METADATA
+
+def build(frames, chrome_in_layout: bool) -> BriefingPack:
+    briefing_pack = BriefingPack(*METADATA, chrome_in_layout = chrome_in_layout)
+    for frame in frames:
+        briefing_pack.add_frame(frame)
+    briefing_pack.number_slides()
+    return briefing_pack
+
+def shapes(shape_tree) -> list:
+    return [(shape.shape_type, shape.left, shape.top, shape.width, shape.height, shape.text_frame.text if shape.has_text_frame else None) for shape in shape_tree]
+
+def test_chrome_is_drawn_once_in_the_layout(inputs):
+    frames = inputs.frames()[:3]
+    explicit, in_layout = build(frames, False), build(frames, True)
+    blank_layout = shapes(Presentation().slide_layouts[6].shapes)
+
+    for index, (explicit_slide, layout_slide) in enumerate(zip(explicit.prs.slides, in_layout.prs.slides)):
+        # The slide keeps its frame's shapes and its title; the header and footer it no longer carries are in the layout
+        layout_chrome = shapes(layout_slide.slide_layout.shapes)[len(blank_layout):]
+        chrome = [shape for shape in shapes(explicit_slide.shapes) if shape not in shapes(layout_slide.shapes)]
+        assert [shape for shape in shapes(layout_slide.shapes) if shape not in shapes(explicit_slide.shapes)] == []
+        assert len(chrome) == len(layout_chrome) == 7
+
+        # Everything but the slide number is the same shape in the same place
+        assert chrome[:-1] == layout_chrome[:-1]
+        assert chrome[-1][-1] == f"{index + 1}/3"
+        assert layout_chrome[-1][:-1] == chrome[-1][:-1] and layout_chrome[-1][-1] == "‹#›/3"
+
+def test_slide_numbers_are_a_native_field(inputs):
+    briefing_pack = build(inputs.frames()[:2], True)
+    stream = io.BytesIO()
+    briefing_pack.prs.save(stream)
+    reopened = Presentation(stream)
+
+    layout = reopened.slides[0].slide_layout
+    assert all(slide.slide_layout is layout for slide in reopened.slides)
+    # The blank layout's own slide number placeholder has a field too; the chrome's is the last
+    fields = layout._element.xpath(".//a:fld[@type='slidenum']")
+    assert len(fields) == 2 and fields[-1].getparent().xpath("a:r/a:t")[-1].text == f"/{len(reopened.slides)}"
+
+def test_layout_metadata_is_the_packs(inputs):
+    briefing_pack = build(inputs.frames()[:1], True)
+    texts = [shape.text_frame.text for shape in briefing_pack.slide_layout.shapes if shape.has_text_frame]
+    assert {"Reference Number: REF1", "OFFICIAL", "Code version: 5.0.0", "Job ID: job-1"} <= set(texts)
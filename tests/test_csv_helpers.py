@@ -0,0 +1,51 @@
+import io
+import random
+
+import pandas as pd
+import pytest
+
+from src.helper.csv_helpers import read_plain_csv
+
+def pandas_rows(data: bytes) -> list:
+    return [tuple(row) for row in pd.read_csv(io.BytesIO(data)).itertuples(index=False)]
+
+def assert_reads_like_pandas(data: bytes) -> None:
+    """A CSV read without pandas must hold exactly the values pandas reads, or be left to pandas."""
+
+    table = read_plain_csv(data)
+    if table is None:
+        return
+    expected = pandas_rows(data)
+    assert [[repr(cell) for cell in row] for row in table.rows] == [[repr(getattr(cell, "item", lambda: cell)()) for cell in row] for row in expected]
+    assert table.columns == list(pd.read_csv(io.BytesIO(data)).columns)
+
+@pytest.mark.parametrize("cell", [
+    "0.0000090546842747278", "-0.000000000000000000417", "0.000000000000000007", "-0.00000680916729839",
+    "0.1", "-0.5", ".25", "-.25", "1.", "123456789012345.6", "12345678901234.5", "0.00000000000001",
+    "123456789012345678", "-123456789012345678", "1234567890123456789", "007", "-0", "-0.0",
+])
+def test_numbers_read_like_pandas(cell):
+    assert_reads_like_pandas(f"value\n{cell}\n".encode())
+
+def test_random_decimals_read_like_pandas():
+    rng = random.Random(0)
+    cells = []
+    for _ in range(2000):
+        digits = "".join(rng.choice("0123456789") for _ in range(rng.randint(1, 22)))
+        split = rng.randint(0, len(digits))
+        cells.append(("-" if rng.random() < 0.3 else "") + digits[:split] + "." + digits[split:])
+
+    data = ("value\n" + "\n".join(cells) + "\n").encode()
+    expected = [row[0] for row in pandas_rows(data)]
+    for cell, value in zip(cells, expected):
+        table = read_plain_csv(f"value\n{cell}\n".encode())
+        if table is not None:
+            assert repr(table.rows[0][0]) == repr(float(value)), cell
+
+def test_mixed_columns_read_like_pandas():
+    assert_reads_like_pandas(b"Name,Count,Share,Code\nA,1,0.5,007\nB,2,0.25,x\nC,3,1,12\n")
+    assert_reads_like_pandas(b"\xef\xbb\xbfName,Count\r\nA,1\r\n\r\nB,2\r\n")
+
+def test_files_needing_pandas_are_left_to_it():
+    for data in (b"a,b\n1,\n", b"a,a\n1,2\n", b"a,b\n1,2,3\n", b"a\n1e5\n", b"a\nTrue\n", b""):
+        assert read_plain_csv(data) is None
@@ -0,0 +1,16 @@
+import pytest
+
+from benchmarks.import_time import DEFAULT_BUDGET_MS, DEFAULT_MODULES, LAZY_MODULES, import_profile
+
+REPEAT = 3
+
+@pytest.mark.parametrize("module", DEFAULT_MODULES)
+def test_import_time_is_within_budget(module):
+    profiles = [import_profile(module) for _ in range(REPEAT)]
+    best = min(total for total, _ in profiles)
+    assert 0 < best <= DEFAULT_BUDGET_MS, f"{module} took {best:.1f}ms to import, over the {DEFAULT_BUDGET_MS:.0f}ms budget"
+
+@pytest.mark.parametrize("module", DEFAULT_MODULES)
+def test_heavy_modules_are_imported_lazily(module):
+    _, imported = import_profile(module)
+    assert not [name for name in LAZY_MODULES if name in imported]
@@ -0,0 +1,41 @@
+import io
+import mmap
+
+import pytest
+
+from src.helper.input_helpers import open_input
+
+DATA = b"Name,Value\nItem 0,10\nItem 1,20\n"
+
+def test_reading_all_of_a_bytes_object_returns_it():
+    with open_input(DATA) as file:
+        assert file.read() is DATA
+    with open_input(memoryview(DATA)) as file:
+        assert file.read() is DATA
+
+@pytest.mark.parametrize("make", [bytearray, lambda data: memoryview(bytearray(data)), lambda data: memoryview(data)[1:]], ids=["bytearray", "memoryview", "memoryview-slice"])
+def test_other_buffers_are_shared_and_copied_as_they_are_read(make):
+    buffer = make(DATA)
+    with open_input(buffer) as file:
+        first = file.read(4)
+        assert isinstance(first, bytes)
+        if not isinstance(buffer, memoryview) or not buffer.readonly:
+            # The reader shares the buffer, so a change made after it was opened is seen by later reads
+            buffer[4] = ord("!")
+        rest = file.read()
+
+    assert first + rest == bytes(buffer)
+
+def test_readinto_copies_into_the_callers_buffer():
+    target = bytearray(6)
+    with open_input(bytearray(DATA)) as file:
+        file.seek(5)
+        assert file.readinto(target) == 6
+    assert target == DATA[5:11]
+
+def test_closing_the_reader_releases_a_memory_map():
+    mapped = mmap.mmap(-1, len(DATA))
+    mapped.write(DATA)
+    with io.TextIOWrapper(open_input(mapped), encoding="utf-8", newline="") as file:
+        assert file.read() == DATA.decode()
+    mapped.close()
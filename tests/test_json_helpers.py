@@ -0,0 +1,28 @@
+import json
+
+import pytest
+
+from src.helper.json_helpers import BulletPointStore
+
+def write_json(path, data):
+    with open(path, 'w') as file:
+        json.dump(data, file)
+    return str(path)
+
+def test_nested_bullet_points_are_indented(tmp_path):
+    store = BulletPointStore(write_json(tmp_path / "points.json", {"key": ["One", ["Two", ["Three"]]]}))
+    assert store.get("key") == ["• One", "     • Two", "          • Three"]
+    assert store.get("missing") == []
+
+def test_later_sources_take_precedence(tmp_path):
+    store = BulletPointStore([write_json(tmp_path / "a.json", {"key": ["A"], "other": ["B"]}), write_json(tmp_path / "b.json", {"key": ["C"]})])
+    assert store.get("key") == ["• C"]
+    assert store.get("other") == ["• B"]
+    assert store.keys() == ["key", "other"]
+
+@pytest.mark.parametrize("value", ["A single string", 3, None, {"nested": ["A"]}])
+def test_values_that_are_not_lists_are_rejected(tmp_path, value):
+    store = BulletPointStore(write_json(tmp_path / "points.json", {"fine": ["A"], "broken": value}))
+    assert store.get("fine") == ["• A"]
+    with pytest.raises(ValueError, match="'broken'"):
+        store.get("broken")
@@ -0,0 +1,50 @@
+import pytest
+
+from pptx.util import Inches
+
+from src.frame.new import NewSlide
+from src.layout import FrameLayout, LayoutOverflowError, TextBlock, layout_frames, stack
+from src.presentation import BriefingPack
+
+from .packs import CELL_COLOURS, METADATA
+
+def geometry(layout: FrameLayout) -> list:
+    return [(type(p.block).__name__, p.left, p.top, p.width, p.height) for p in layout.placements]
+
+def test_stack_adds_space_before_and_indent():
+    placements = stack(Inches(1), Inches(2), Inches(4), [
+        TextBlock("a", 10, Inches(0.5)),
+        TextBlock("b", 10, Inches(1), space_before = Inches(0.25), indent = Inches(0.5)),
+        TextBlock("c", 10, Inches(0.5), width = Inches(2)),
+    ])
+
+    assert [(p.left, p.top, p.width, p.height) for p in placements] == [
+        (Inches(1), Inches(2), Inches(4), Inches(0.5)),
+        (Inches(1.5), Inches(2.75), Inches(3.5), Inches(1)),
+        (Inches(1), Inches(3.75), Inches(2), Inches(0.5)),
+    ]
+
+def test_check_fits_names_the_overflowing_blocks():
+    layout = FrameLayout(stack(Inches(0), Inches(6), Inches(4), [TextBlock("a", 10, Inches(0.5)), TextBlock("b", 10, Inches(1))]))
+
+    assert layout.bottom == Inches(7.5)
+    layout.check_fits(Inches(7.5), "Fits")
+    assert [p.block.text for p in layout.overflows(Inches(7))] == ["b"]
+    with pytest.raises(LayoutOverflowError, match=r"^Slide 'Tall' overflows by 0\.50 inches \(TextBlock\)$"):
+        layout.check_fits(Inches(7), "Tall")
+
+def test_reject_overflow_raises_before_the_slide_is_added(inputs):
+    frame = NewSlide("Long", "Sites", inputs.long_csv, CELL_COLOURS, "table", "scenario", "assumptions", inputs.jpg, inputs.store)
+
+    BriefingPack(*METADATA).add_frame(frame)
+    briefing_pack = BriefingPack(*METADATA, reject_overflow = True)
+    with pytest.raises(LayoutOverflowError, match="Slide 'Long' overflows by"):
+        briefing_pack.add_frame(frame)
+    assert len(briefing_pack.prs.slides) == 0
+
+def test_layout_frames_matches_each_frame_layout(inputs):
+    frames = inputs.frames()
+    expected = [geometry(page.layout(Inches(10), Inches(7.5))) for frame in frames for page in frame.pages(BriefingPack(*METADATA))]
+
+    for max_workers in (1, 2):
+        assert [geometry(layout) for layout in layout_frames(frames, max_workers = max_workers)] == expected
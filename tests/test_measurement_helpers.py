@@ -0,0 +1,59 @@
+import pytest
+
+from pptx.util import Inches
+
+from src.helper.measurement_helpers import count_lines, line_height, measure_bullet_points, measure_text_height, text_units, text_width
+from src.helper.table_helpers import CELL_VERTICAL_MARGINS, measure_table_row
+from src.helper.text_helpers import estimate_textbox_height
+
+# Box widths leaving 2,000 and 1,800 font units (1/1000 em) of room for 10 pt text inside the insets.
+# In Calibri "a" is 479 units wide, "W" 890, a space 226, and bold "W" 906; in Arial "a" is 556.
+ROOM_2000 = 0.2 + 2000 / 7200
+ROOM_1800 = 0.45
+
+@pytest.mark.parametrize("text, lines", [
+    ("aaaa", 1),                # 1,916 units fits
+    ("a a a", 1),               # 1,889 with the spaces
+    ("aa aa", 2),               # 2,142 wraps at the space
+    ("aaaa aaaa", 2),
+    ("aaaaa", 2),               # A word wider than the box breaks after four characters
+    ("aaaaaaaaa", 3),           # 4 + 4 + 1 characters
+    ("aaaa aaaaaaaaa", 4),      # "aaaa", then the long word broken 4 + 4 + 1
+    ("  aaa", 1),               # Indentation takes room: 452 + 1,437
+    ("   aaaa", 2),             # 678 + 1,916 does not fit, so the word moves down
+    ("a\nb", 2),
+    ("a\vb", 2),
+    ("", 1),                    # An empty paragraph still takes a line
+])
+def test_lines_break_like_powerpoint(text, lines):
+    assert count_lines(text, 10, ROOM_2000) == lines
+
+def test_narrow_and_wide_characters_are_measured_by_their_glyphs():
+    # Eight "i"s fit where a fixed half-em estimate would give them 4,000 units; three "W"s do not
+    assert count_lines("iiiiiiii", 10, ROOM_2000) == 1
+    assert count_lines("WWW", 10, ROOM_2000) == 2
+
+def test_bold_and_other_fonts_use_their_own_metrics():
+    assert count_lines("WW", 10, ROOM_1800) == 1
+    assert count_lines("WW", 10, ROOM_1800, bold = True) == 2
+    assert count_lines("aaaa", 10, ROOM_2000, font = "Arial") == 2
+    assert count_lines("aaaa", 10, ROOM_2000, font = "Liberation Sans") == 2
+    with pytest.raises(ValueError, match="No metrics for font"):
+        count_lines("aaaa", 10, ROOM_2000, font = "Comic Sans MS")
+
+def test_text_units_match_text_width():
+    texts = ["", "Hello, world", "• A bullet – with £5 and 20°", "漢字 and 🙂"]
+    assert [units * 10 / 72000 for units in text_units(texts)] == pytest.approx([text_width(text, 10) for text in texts])
+
+@pytest.mark.parametrize("text", ["", "   ", "\n"])
+def test_blank_text_boxes_have_no_height(text):
+    assert measure_text_height(text, 12, 5) == 0
+    assert estimate_textbox_height(text, 12, 5) == 0
+
+def test_text_box_heights_are_whole_lines():
+    assert measure_text_height("A short line", 12, 5) == line_height(12)
+    assert measure_text_height("A short line\nand another", 12, 5) == 2 * line_height(12)
+    assert measure_bullet_points(["", "• A point", "aaaa aaaa"], 10, ROOM_2000) == [0, 3 * line_height(10), 2 * line_height(10)]
+
+def test_empty_table_rows_are_one_line_tall():
+    assert measure_table_row(["", ""], [Inches(1), Inches(1)], 7) == pytest.approx(line_height(7) + CELL_VERTICAL_MARGINS)
@@ -0,0 +1,62 @@
+import io
+import os
+import zipfile
+
+import pytest
+
+from pptx import Presentation
+
+from src.helper import package_helpers
+from src.presentation import BriefingPack
+
+from .packs import METADATA, package_parts
+
+def build(inputs) -> BriefingPack:
+    briefing_pack = BriefingPack(*METADATA)
+    for frame in inputs.frames(chart = True):
+        briefing_pack.add_frame(frame)
+    return briefing_pack
+
+def test_saved_pack_has_the_parts_python_pptx_writes(inputs):
+    briefing_pack = build(inputs)
+    blob = briefing_pack.save()
+    reference = io.BytesIO()
+    briefing_pack.prs.save(reference)
+
+    assert package_parts(blob) == package_parts(reference.getvalue())
+    assert len(Presentation(io.BytesIO(blob)).slides) == len(briefing_pack.prs.slides)
+
+@pytest.mark.parametrize("compression", ["store", "fast", "default", "max", 3])
+def test_saving_is_deterministic(inputs, compression):
+    assert build(inputs).save(compression = compression) == build(inputs).save(compression = compression)
+
+def test_compressed_media_are_stored(inputs):
+    archive = zipfile.ZipFile(io.BytesIO(build(inputs).save()))
+    for info in archive.infolist():
+        extension = info.filename.rpartition(".")[2]
+        expected = zipfile.ZIP_STORED if extension in package_helpers.STORED_EXTENSIONS else zipfile.ZIP_DEFLATED
+        assert info.compress_type == expected, info.filename
+        assert info.date_time == (1980, 1, 1, 0, 0, 0)
+
+def test_failed_save_leaves_existing_file_untouched(inputs, tmp_path, monkeypatch):
+    output_dir = os.path.join(tmp_path, "output")
+    os.makedirs(output_dir)
+    path = os.path.join(output_dir, "pack.pptx")
+    with open(path, 'wb') as file:
+        file.write(b"previous pack")
+
+    def fail(*args):
+        raise OSError("disk full")
+    monkeypatch.setattr(package_helpers, "_write_zip", fail)
+
+    with pytest.raises(OSError, match="disk full"):
+        build(inputs).save(path)
+    with open(path, 'rb') as file:
+        assert file.read() == b"previous pack"
+    assert os.listdir(output_dir) == ["pack.pptx"]
+
+def test_unknown_compression_is_rejected():
+    with pytest.raises(ValueError):
+        package_helpers.compression_level("zstd")
+    with pytest.raises(ValueError):
+        package_helpers.compression_level(10)
@@ -0,0 +1,30 @@
+import pytest
+
+from src.frame.table import CONTINUATION_SUFFIX, PaginatedTableSlide
+from src.layout import layout_frames
+from src.presentation import BriefingPack
+
+from .packs import METADATA
+
+@pytest.mark.parametrize("max_workers", [1, 2])
+def test_layout_frames_splits_paginated_tables_into_pages(inputs, max_workers):
+    frames = inputs.frames()
+    prs = BriefingPack(*METADATA).prs
+    pages = [page for frame in frames for page in frame.pages(BriefingPack(*METADATA))]
+    layouts = layout_frames(frames, prs.slide_width, prs.slide_height, max_workers = max_workers)
+
+    assert len(layouts) == len(pages) > len(frames)
+    assert [layout.bottom for layout in layouts] == [page.layout(prs.slide_width, prs.slide_height).bottom for page in pages]
+
+def test_header_only_table_is_one_empty_page(tmp_path):
+    path = tmp_path / "header.csv"
+    path.write_text("Region,Count\n")
+    briefing_pack = BriefingPack(*METADATA)
+    briefing_pack.add_frame(PaginatedTableSlide("Sites", "All sites", str(path)))
+    assert len(briefing_pack.prs.slides) == 1
+    assert not any(shape.text_frame.text.endswith(CONTINUATION_SUFFIX) for shape in briefing_pack.prs.slides[0].shapes if shape.has_text_frame)
+
+@pytest.mark.parametrize("source", [b"", [], [[]]])
+def test_empty_table_raises_value_error(source):
+    with pytest.raises(ValueError, match="no header row"):
+        BriefingPack(*METADATA).add_frame(PaginatedTableSlide("Sites", "All sites", source))
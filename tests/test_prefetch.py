@@ -0,0 +1,27 @@
+import multiprocessing
+import os
+
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+from src.prefetch import prefetch_inputs
+from src.presentation import BriefingPack
+
+from .packs import METADATA, differing_parts
+
+def test_workers_render_from_prefetched_inputs(inputs, monkeypatch):
+    serial = BriefingPack(*METADATA)
+    for frame in inputs.frames():
+        serial.add_frame(frame)
+    expected = serial.save()
+
+    # Spawned workers inherit nothing from this process, so they can only read the inputs they are sent
+    monkeypatch.setattr("src.presentation.ProcessPoolExecutor", partial(ProcessPoolExecutor, mp_context = multiprocessing.get_context("spawn")))
+    frames = inputs.frames()
+    with prefetch_inputs(frames):
+        for name in os.listdir(inputs.directory):
+            os.remove(os.path.join(inputs.directory, name))
+
+        briefing_pack = BriefingPack(*METADATA)
+        briefing_pack.add_frames(frames, max_workers = 2, chunk_size = 2)
+        assert differing_parts(expected, briefing_pack.save()) == []
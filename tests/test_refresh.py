@@ -0,0 +1,75 @@
+import io
+import zipfile
+
+import pytest
+
+from src.presentation import BriefingPack
+from src.refresh import PackMismatchError, refresh_pack
+
+from .packs import METADATA, differing_parts
+
+NEW_METADATA = ("REF2", "SECRET", "5.0.1", "job-2")
+
+PACK_SETTINGS = [{}, {"chrome_in_layout": True}, {"shared_styles": True}]
+
+def build(frames, metadata = METADATA, **settings) -> bytes:
+    briefing_pack = BriefingPack(*metadata, refreshable = True, **settings)
+    for frame in frames:
+        briefing_pack.add_frame(frame)
+    return briefing_pack.save()
+
+def changed_frames(inputs):
+    return inputs.frames(chart = True, changed_value = 5, summary_title = "Another summary", summary_image = inputs.jpg)
+
+def stored_members(blob: bytes) -> dict:
+    """Each member of a saved pack as it is stored: compressed the same way, to the same size, with the same CRC."""
+
+    return {info.filename: (info.compress_type, info.CRC, info.compress_size) for info in zipfile.ZipFile(io.BytesIO(blob)).infolist()}
+
+@pytest.mark.parametrize("settings", PACK_SETTINGS, ids=["default", "chrome_in_layout", "shared_styles"])
+def test_refresh_without_changes_leaves_pack_as_it_was(inputs, settings):
+    base = build(inputs.frames(chart = True), **settings)
+    refreshed = refresh_pack(base, inputs.frames(chart = True), *METADATA)
+    assert refreshed.changed_slides == []
+    assert differing_parts(refreshed.save(), base) == []
+
+@pytest.mark.parametrize("settings", PACK_SETTINGS, ids=["default", "chrome_in_layout", "shared_styles"])
+def test_refresh_matches_fresh_build(inputs, settings):
+    base = build(inputs.frames(chart = True), **settings)
+    frames = changed_frames(inputs)
+    refreshed = refresh_pack(base, frames, *METADATA)
+    output = refreshed.save()
+
+    assert refreshed.changed_slides == [2]
+    assert differing_parts(output, build(frames, **settings)) == []
+
+    # Slides that did not change are copied from the original as they were stored
+    before, after = stored_members(base), stored_members(output)
+    untouched = [name for name in before if name.startswith("ppt/slides/slide") and name != "ppt/slides/slide3.xml"]
+    assert untouched and all(before[name] == after[name] for name in untouched)
+
+@pytest.mark.parametrize("settings", PACK_SETTINGS, ids=["default", "chrome_in_layout", "shared_styles"])
+def test_refresh_with_new_metadata_matches_fresh_build(inputs, settings):
+    base = build(inputs.frames(chart = True), **settings)
+    refreshed = refresh_pack(base, inputs.frames(chart = True), *NEW_METADATA)
+    output = refreshed.save()
+    assert differing_parts(output, build(inputs.frames(chart = True), NEW_METADATA, **settings)) == []
+
+    # A refreshed pack can be refreshed again
+    chained = refresh_pack(output, changed_frames(inputs), *NEW_METADATA).save()
+    assert differing_parts(chained, build(changed_frames(inputs), NEW_METADATA, **settings)) == []
+
+def test_frames_of_another_structure_are_rejected(inputs):
+    base = build(inputs.frames())
+    frames = inputs.frames()
+    with pytest.raises(PackMismatchError):
+        refresh_pack(base, frames[:3], *METADATA)
+    with pytest.raises(PackMismatchError):
+        refresh_pack(base, [frames[1], frames[0], *frames[2:]], *METADATA)
+
+def test_packs_not_built_refreshable_are_rejected(inputs):
+    briefing_pack = BriefingPack(*METADATA)
+    for frame in inputs.frames():
+        briefing_pack.add_frame(frame)
+    with pytest.raises(PackMismatchError):
+        refresh_pack(briefing_pack.save(), inputs.frames(), *METADATA)
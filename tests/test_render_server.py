@@ -0,0 +1,40 @@
+import os
+import threading
+
+import pytest
+
+from src.batch import assemble_pack, pack_spec_from_dict
+from src.render_server import RenderServer, render_bytes, send_request
+
+from .packs import differing_parts
+
+@pytest.fixture
+def server(tmp_path):
+    render_server = RenderServer(str(tmp_path / "render.sock"), max_workers = 1)
+    thread = threading.Thread(target=render_server.serve_forever, daemon=True)
+    thread.start()
+    yield render_server
+    render_server.shutdown()
+    thread.join(timeout=30)
+    assert not os.path.exists(render_server.socket_path)
+
+def test_ping_render_and_reload_round_trip(server, inputs):
+    pack = {
+        "reference_number": "REF1", "classification": "OFFICIAL", "code_version": "5.0.0", "job_id": "job-1",
+        "frames": [{"type": "TitleSlide", "slide_title": "Title", "issue_date": "1 Jan", "image_path": inputs.png}],
+    }
+    expected = assemble_pack(pack_spec_from_dict({"output_path": "", **pack})).save()
+
+    assert send_request(server.socket_path, {"command": "ping"}, timeout = 30) == {"ok": True}
+    assert differing_parts(render_bytes(server.socket_path, pack, timeout = 60), expected) == []
+
+    # Packs rendered after a reload come from the new pool and are unchanged
+    assert send_request(server.socket_path, {"command": "reload"}, timeout = 60) == {"ok": True, "reloads": 1}
+    assert differing_parts(render_bytes(server.socket_path, pack, timeout = 60), expected) == []
+
+    failed = send_request(server.socket_path, {"command": "render"}, timeout = 30)
+    assert not failed["ok"] and "has no \"pack\"" in failed["error"]
+    assert send_request(server.socket_path, {"command": "nope"}, timeout = 30) == {"ok": False, "error": "Unknown command: nope"}
+
+    stats = send_request(server.socket_path, {"command": "stats"}, timeout = 30)
+    assert (stats["requests"], stats["errors"], stats["reloads"]) == (3, 1, 1)
@@ -0,0 +1,82 @@
+import io
+import os
+
+import numpy as np
+
+from PIL import Image
+from pptx import Presentation
+from pptx.opc.constants import RELATIONSHIP_TYPE as RT
+
+from src.frame.title import TitleSlide
+from src.presentation import BriefingPack
+from src.slide_cache import SlideCache, SlideParts, attach_slide, detach_slide
+
+from .packs import METADATA, differing_parts
+
+def build(frames, slide_cache = None) -> bytes:
+    briefing_pack = BriefingPack(*METADATA, slide_cache = slide_cache)
+    for frame in frames:
+        briefing_pack.add_frame(frame)
+    return briefing_pack.save()
+
+def touch(path: str) -> None:
+    # Move the modification time on, so the rewrite is seen even on file systems with coarse timestamps
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+def slide_count(blob: bytes) -> int:
+    return len(Presentation(io.BytesIO(blob)).slides)
+
+def test_warm_build_hits_every_slide_and_matches_a_rendered_pack(inputs, tmp_path):
+    rendered = build(inputs.frames())
+    slides = slide_count(rendered)
+
+    cold = SlideCache(str(tmp_path / "cache"))
+    assert differing_parts(build(inputs.frames(), cold), rendered) == []
+    assert (cold.hits, cold.misses) == (0, slides)
+
+    warm = SlideCache(str(tmp_path / "cache"))
+    assert differing_parts(build(inputs.frames(), warm), rendered) == []
+    assert (warm.hits, warm.misses) == (slides, 0)
+
+def test_rewritten_csv_misses_the_slides_that_read_it(inputs, tmp_path):
+    build(inputs.frames(), SlideCache(str(tmp_path / "cache")))
+
+    inputs.table(changed_value = 100).to_csv(inputs.csv, index=False)
+    touch(inputs.csv)
+    cache = SlideCache(str(tmp_path / "cache"))
+    cached = build(inputs.frames(), cache)
+
+    # The new and summary slides both show the CSV
+    assert cache.misses == 2
+    assert differing_parts(cached, build(inputs.frames())) == []
+
+def test_rewritten_image_misses_the_slides_that_show_it(inputs, tmp_path):
+    build(inputs.frames(), SlideCache(str(tmp_path / "cache")))
+
+    pixels = np.random.default_rng(1).integers(0, 255, (120, 160, 3), dtype=np.uint8)
+    Image.fromarray(pixels).save(inputs.png)
+    touch(inputs.png)
+    cache = SlideCache(str(tmp_path / "cache"))
+    cached = build(inputs.frames(), cache)
+
+    # The title and summary slides both show the PNG
+    assert cache.misses == 2
+    assert differing_parts(cached, build(inputs.frames())) == []
+
+def test_attach_slide_renumbers_relationship_ids(inputs):
+    source = BriefingPack(*METADATA)
+    source.add_frame(TitleSlide("Title", "1 Jan", inputs.png))
+    media = {}
+    parts = detach_slide(source.prs.slides[0], media)
+    (rId, name), = parts.images
+
+    # As if the slide had been rendered in a pack that gave its image a later id
+    moved = SlideParts(parts.xml.replace(f'r:embed="{rId}"'.encode(), b'r:embed="rId9"'), [("rId9", name)])
+    target = BriefingPack(*METADATA)
+    slide = attach_slide(target, moved, media)
+
+    blips = slide._element.xpath(".//a:blip/@r:embed")
+    assert blips and set(blips) == {rId}
+    relationship = slide.part.rels[rId]
+    assert relationship.reltype == RT.IMAGE and relationship.target_part.blob == media[name]
@@ -0,0 +1,55 @@
+import io
+
+from pptx import Presentation
+from pptx.opc.constants import RELATIONSHIP_TYPE as RT
+from pptx.util import Inches
+
+from src.helper.style_helpers import SHARED_TABLE_STYLE_ID, register_shared_styles, shared_font_size
+from src.helper.text_helpers import add_textbox
+from src.presentation import SHARED_STYLE_FONT_SIZE, BriefingPack
+from src.refresh import refresh_pack
+
+from .packs import METADATA, differing_parts
+
+def reopen(blob: bytes) -> Presentation:
+    return Presentation(io.BytesIO(blob))
+
+def run_sizes(prs: Presentation, font_size: int) -> list:
+    slide = prs.slides.add_slide(prs.slide_layouts[6])
+    _, text_frame = add_textbox(slide, Inches(1), Inches(1), Inches(2), Inches(0.5), "Text", font_size)
+    return [run.font.size for run in text_frame.paragraphs[0].runs]
+
+def test_shared_font_size_is_recovered_from_a_saved_pack():
+    assert shared_font_size(reopen(BriefingPack(*METADATA, shared_styles = True).save()).part) == SHARED_STYLE_FONT_SIZE
+    assert shared_font_size(reopen(BriefingPack(*METADATA).save()).part) is None
+
+def test_text_in_a_reopened_pack_relies_on_its_shared_styles():
+    assert run_sizes(reopen(BriefingPack(*METADATA, shared_styles = True).save()), SHARED_STYLE_FONT_SIZE) == [None]
+    assert run_sizes(reopen(BriefingPack(*METADATA).save()), SHARED_STYLE_FONT_SIZE)[0].pt == SHARED_STYLE_FONT_SIZE
+
+def test_registering_after_a_lookup_and_again_keeps_one_table_style():
+    prs = Presentation()
+    assert shared_font_size(prs.part) is None
+    register_shared_styles(prs, 9)
+    register_shared_styles(prs, 9)
+    assert shared_font_size(prs.part) == 9
+
+    reopened = reopen(_save(prs))
+    assert shared_font_size(reopened.part) == 9
+    assert reopened.part.part_related_by(RT.TABLE_STYLES).blob.count(SHARED_TABLE_STYLE_ID.encode()) == 1
+
+def test_refreshed_shared_pack_matches_a_fresh_build(inputs):
+    def build(frames) -> bytes:
+        briefing_pack = BriefingPack(*METADATA, shared_styles = True, refreshable = True)
+        for frame in frames:
+            briefing_pack.add_frame(frame)
+        return briefing_pack.save()
+
+    frames = inputs.frames(changed_value = 5, summary_title = "Another summary")
+    refreshed = refresh_pack(build(inputs.frames()), frames, *METADATA).save()
+    assert differing_parts(refreshed, build(frames)) == []
+
+def _save(prs: Presentation) -> bytes:
+    stream = io.BytesIO()
+    prs.save(stream)
+    return stream.getvalue()
@@ -0,0 +1,58 @@
+import math
+
+import pandas as pd
+import pytest
+
+from lxml import etree
+from pptx import Presentation
+from pptx.util import Inches
+
+from src.helper.table_helpers import add_table, fit_table_data, load_table_data
+from src.helper.table_style_helpers import ColumnStyle, ColourScale, rag
+
+from .packs import CELL_COLOURS
+
+TABLE_WIDTH = Inches(3)
+
+def make_table(rows: int) -> pd.DataFrame:
+    return pd.DataFrame({
+        "Name": [f"Item {i}" for i in range(rows)],
+        "Description": [f"Description of item {i}\nover two lines" if i % 4 == 0 else f"Item {i} & <more>" for i in range(rows)],
+        "Value": [i * 10 for i in range(rows)],
+        "Share": [math.nan if i == 2 else round(i / 3, 2) for i in range(rows)],
+    })
+
+STYLE = {
+    "Value": ColumnStyle("%.0f", colour = rag(30, 60)),
+    "Share": ColumnStyle("%.0f%%", scale = 100, colour = ColourScale(0, 2, CELL_COLOURS[2], CELL_COLOURS[0]), colour_rows = True),
+}
+
+def slide_xml(source, backend: str, style = None, autofit: bool = False) -> bytes:
+    prs = Presentation()
+    slide = prs.slides.add_slide(prs.slide_layouts[6])
+    fit = fit_table_data(load_table_data(source), TABLE_WIDTH, style) if autofit else None
+    add_table(slide, "Table", source, CELL_COLOURS, Inches(1), Inches(0.2), TABLE_WIDTH, backend = backend, style = style, fit = fit)
+    return etree.tostring(slide._element)
+
+@pytest.mark.parametrize("rows", [1, 3, 40])
+@pytest.mark.parametrize("style", [None, STYLE], ids=["plain", "styled"])
+@pytest.mark.parametrize("autofit", [False, True], ids=["fixed", "autofit"])
+def test_backends_produce_identical_xml(rows, style, autofit):
+    table = make_table(rows)
+    assert slide_xml(table, "xml", style, autofit) == slide_xml(table, "pptx", style, autofit)
+
+@pytest.mark.parametrize("kind", ["csv", "rows", "records"])
+def test_backends_agree_for_every_table_source(tmp_path, kind):
+    table = make_table(6)
+    if kind == "csv":
+        source = str(tmp_path / "table.csv")
+        table.to_csv(source, index=False)
+    elif kind == "rows":
+        source = [list(table.columns)] + table.values.tolist()
+    else:
+        source = table.to_dict("records")
+    assert slide_xml(source, "xml") == slide_xml(source, "pptx")
+
+def test_unknown_backend_is_rejected():
+    with pytest.raises(ValueError, match="Unknown table backend"):
+        slide_xml(make_table(2), "html")
@@ -0,0 +1,53 @@
+import pandas as pd
+import pytest
+
+from pptx.util import Inches
+
+from src.helper.measurement_helpers import count_lines, line_height
+from src.helper.table_helpers import CELL_VERTICAL_MARGINS, MARKER_COLUMN_WIDTH, fit_table, fit_table_data, measure_table_row, table_row_height
+from src.helper.table_style_helpers import ColumnStyle
+
+HEADER = ["Name", "Note"]
+ROWS = [["Item 1", "Short"], ["Item 2", "A much longer note that has to wrap over several lines of the cell"], ["Item 3", "Two\nlines"]]
+
+def measured_heights(header, rows, fit, font_size) -> list:
+    """The height of each row measured at the fitted column widths, in EMU as the fit gives it."""
+
+    return [round(measure_table_row(row, fit.column_widths[1:], font_size) * Inches(1)) for row in [header, *rows]]
+
+def test_wide_table_keeps_every_cell_on_its_lines():
+    fit = fit_table(HEADER, ROWS, Inches(9))
+
+    assert fit.width == Inches(9) and fit.column_widths[0] == MARKER_COLUMN_WIDTH
+    # The note column is wider, as it has the longer lines
+    assert fit.column_widths[2] > fit.column_widths[1]
+    single = round(table_row_height(7) * Inches(1))
+    assert fit.row_heights == (single, single, single, round((2 * line_height(7) + CELL_VERTICAL_MARGINS) * Inches(1)))
+
+@pytest.mark.parametrize("font_size", [7, 12])
+def test_narrow_table_wraps_rows_without_breaking_words(font_size):
+    fit = fit_table(HEADER, ROWS, Inches(2.5), font_size)
+
+    assert fit.width == Inches(2.5)
+    for column, width in zip(zip(HEADER, *ROWS), fit.column_widths[1:]):
+        words = [word for cell in column for word in cell.split()]
+        assert all(count_lines(word, font_size, width / Inches(1)) == 1 for word in words)
+
+    assert fit.row_heights == tuple(measured_heights(HEADER, ROWS, fit, font_size))
+    # The long note wraps, while the header stays on one line
+    assert fit.row_heights[2] == max(fit.row_heights) > fit.row_heights[0] == round(table_row_height(font_size) * Inches(1))
+
+def test_larger_font_needs_taller_rows():
+    small, large = fit_table(HEADER, ROWS, Inches(2.5), 7), fit_table(HEADER, ROWS, Inches(2.5), 12)
+    assert all(large_height > small_height for small_height, large_height in zip(small.row_heights, large.row_heights))
+
+def test_fit_table_data_measures_cells_as_they_are_shown():
+    data = pd.DataFrame({"Name": ["Item 1", "Item 2"], "Share": [0.123456789, 0.5]})
+
+    assert fit_table_data(data, Inches(4)) == fit_table(["Name", "Share"], [["Item 1", "0.123456789"], ["Item 2", "0.5"]], Inches(4))
+    styled = fit_table_data(data, Inches(4), {"Share": ColumnStyle("%.0f%%", 100)})
+    assert styled == fit_table(["Name", "Share"], [["Item 1", "12%"], ["Item 2", "50%"]], Inches(4))
+
+def test_header_only_table_has_one_row():
+    fit = fit_table(HEADER, [], Inches(3))
+    assert fit.width == Inches(3) and len(fit.row_heights) == 1
@@ -0,0 +1,28 @@
+import io
+
+import pytest
+
+from src.frame.summary import SummarySlide
+from src.helper.table_helpers import has_table_data
+from src.presentation import BriefingPack
+
+from .packs import CELL_COLOURS, METADATA
+
+EMPTY_SOURCES = [None, "", b"", bytearray(), memoryview(b""), memoryview(b"Name,Value\n")[:0], io.BytesIO()]
+EMPTY_IDS = ["none", "path", "bytes", "bytearray", "memoryview", "memoryview-slice", "bytesio"]
+
+@pytest.mark.parametrize("source", EMPTY_SOURCES, ids=EMPTY_IDS)
+def test_empty_sources_hold_no_table(source):
+    assert not has_table_data(source)
+
+@pytest.mark.parametrize("source", ["table.csv", b"Name,Value\n", bytearray(b"Name,Value\n"), memoryview(b"Name,Value\n"), io.BytesIO(b"Name,Value\n")], ids=["path", "bytes", "bytearray", "memoryview", "bytesio"])
+def test_sources_with_content_hold_a_table(source):
+    assert has_table_data(source)
+
+@pytest.mark.parametrize("table2", EMPTY_SOURCES, ids=EMPTY_IDS)
+def test_summary_slide_leaves_out_an_empty_second_table(inputs, table2):
+    briefing_pack = BriefingPack(*METADATA)
+    briefing_pack.add_frame(SummarySlide(
+        "Summary", "summary", "Some comments", "Table 1", inputs.csv, CELL_COLOURS, "Table 2", table2, CELL_COLOURS, inputs.png, inputs.jpg, inputs.store,
+    ))
+    assert sum(shape.has_table for shape in briefing_pack.prs.slides[0].shapes) == 1
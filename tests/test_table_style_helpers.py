@@ -0,0 +1,56 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from pptx.dml.color import RGBColor
+
+from src.helper.table_style_helpers import AMBER, GREEN, RED, ColourScale, ColumnStyle, Thresholds, rag, style_cells, table_style_from_dict
+
+from .packs import CELL_COLOURS
+
+def test_thresholds_colour_from_each_boundary_up():
+    fills = Thresholds((0, 10), (GREEN, AMBER, RED)).fills(np.array([-1, 0, 9.9, 10, np.nan]))
+    assert fills.tolist() == ["00B050", "FFC000", "FFC000", "C00000", ""]
+
+def test_thresholds_reject_mismatched_or_unordered_boundaries():
+    with pytest.raises(ValueError, match="one more colour than boundaries"):
+        Thresholds((0, 10), (GREEN, RED))
+    with pytest.raises(ValueError, match="ascending order"):
+        Thresholds((10, 0), (GREEN, AMBER, RED))
+
+def test_rag_bands_in_both_directions():
+    values = np.array([40, 50, 79, 80, np.nan])
+    assert rag(50, 80).fills(values).tolist() == ["00B050", "FFC000", "FFC000", "C00000", ""]
+    assert rag(80, 50, higher_is_worse = False).fills(values).tolist() == ["C00000", "FFC000", "FFC000", "00B050", ""]
+
+def test_colour_scale_is_linear_and_clamped():
+    scale = ColourScale(0, 100, RGBColor(0, 0, 0), RGBColor(0xFF, 0xFF, 0xFF))
+    assert scale.fills(np.array([-5, 50, 100, 150, np.nan])).tolist() == ["000000", "808080", "FFFFFF", "FFFFFF", ""]
+
+def test_style_cells_formats_numbers_and_colours_cells_and_row_markers():
+    data = pd.DataFrame({"Name": ["a", "b", "c"], "Share": [0.1, 0.5, np.nan], "Count": [1, 12, "x"]})
+    style = {
+        "Share": ColumnStyle("%.0f%%", 100, rag(0.25, 0.5)),
+        "Count": ColumnStyle("%.1f", colour = Thresholds((10,), (GREEN, RED)), colour_rows = True),
+    }
+
+    texts, fills = style_cells(data, style, CELL_COLOURS)
+
+    # Cells that are not numbers keep their text and get no fill, and the marker of their row is left alone
+    assert texts == [("a", "10%", "1.0"), ("b", "50%", "12.0"), ("c", "nan", "x")]
+    assert fills == [
+        ["00B050", "FFFFFF", "00B050", "FFFFFF"],
+        ["C00000", "FFFFFF", "C00000", "FFFFFF"],
+        ["FFFF00", "FFFFFF", "FFFFFF", "FFFFFF"],
+    ]
+
+def test_table_style_from_dict():
+    style = table_style_from_dict({
+        "Share": {"number_format": "%.0f%%", "scale": 100, "colour": {"type": "rag", "amber_from": 0.25, "red_from": 0.5}},
+        "Count": {"colour": {"type": "scale", "low": 0, "high": 10, "low_colour": "000000", "high_colour": "FFFFFF"}},
+    })
+
+    assert style == {
+        "Share": ColumnStyle("%.0f%%", 100, rag(0.25, 0.5)),
+        "Count": ColumnStyle(colour = ColourScale(0, 10, RGBColor(0, 0, 0), RGBColor(0xFF, 0xFF, 0xFF))),
+    }
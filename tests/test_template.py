@@ -0,0 +1,43 @@
+import pytest
+
+from src.helper.record_helpers import RECORD_NAMESPACE
+from src.presentation import BriefingPack
+from src.template import PackTemplate, TemplateMismatchError
+
+from .packs import package_parts
+
+METADATA = ("REF2", "SECRET", "6.0.0", "job-2")
+
+def slide_contents(briefing_pack: BriefingPack) -> list:
+    """Each slide's shapes as where they are and the text they hold."""
+
+    return [
+        [(shape.left, shape.top, shape.width, shape.height, shape.text_frame.text if shape.has_text_frame else None) for shape in slide.shapes]
+        for slide in briefing_pack.prs.slides
+    ]
+
+@pytest.mark.parametrize("chrome_in_layout", [False, True])
+def test_stamped_pack_looks_like_a_built_one(inputs, chrome_in_layout):
+    template = PackTemplate(inputs.frames(), chrome_in_layout = chrome_in_layout)
+    frames = inputs.frames(changed_value = 5, summary_title = "Another summary", summary_image = inputs.jpg)
+    stamped = template.stamp(frames, *METADATA)
+
+    built = BriefingPack(*METADATA, chrome_in_layout = chrome_in_layout)
+    for frame in frames:
+        built.add_frame(frame)
+
+    stamped.number_slides()
+    built.number_slides()
+    assert slide_contents(stamped) == slide_contents(built)
+
+def test_template_leaves_no_records_in_stamped_packs(inputs):
+    blob = PackTemplate(inputs.frames()).stamp(inputs.frames(), *METADATA).save()
+    assert not any(RECORD_NAMESPACE.encode() in data for data in package_parts(blob).values())
+
+def test_frames_of_another_structure_are_rejected(inputs):
+    template = PackTemplate(inputs.frames())
+    frames = inputs.frames()
+    with pytest.raises(TemplateMismatchError, match="does not match the template"):
+        template.stamp([frames[1], frames[0], *frames[2:]], *METADATA)
+    with pytest.raises(TemplateMismatchError, match="slides"):
+        template.stamp(frames[:2], *METADATA)
@@ -0,0 +1,55 @@
+import os
+
+from pptx import Presentation
+from pptx.util import Inches
+
+from src.helper.table_helpers import add_table
+from src.presentation import BriefingPack, _render_detached
+from src.tracing import Tracer
+
+from .packs import CELL_COLOURS, METADATA
+
+PER_CELL_HELPERS = {"table_helpers.has_table_data", "table_helpers.table_row_height", "table_helpers.table_column_widths", "table_helpers.set_cell_colour"}
+
+def test_traced_build_records_slide_table_and_save_spans(inputs):
+    with Tracer() as tracer:
+        briefing_pack = BriefingPack(*METADATA)
+        for frame in inputs.frames():
+            briefing_pack.add_frame(frame)
+        briefing_pack.save()
+
+    names = {span.name for span in tracer.spans}
+    assert {"add_frame TitleSlide", "add_frame NewSlide", "add_frame SummarySlide", "add_frame TablePageSlide", "table_helpers.add_table", "save"} <= names
+    assert not names & PER_CELL_HELPERS
+
+def test_per_cell_helpers_are_not_traced(inputs):
+    prs = Presentation()
+    slide = prs.slides.add_slide(prs.slide_layouts[6])
+    with Tracer() as tracer:
+        add_table(slide, "Table", inputs.csv, CELL_COLOURS, Inches(1), Inches(0.2), Inches(3), backend = "pptx")
+
+    assert [span.name for span in tracer.spans if span.name.startswith("table_helpers.")].count("table_helpers.add_table") == 1
+    assert not {span.name for span in tracer.spans} & PER_CELL_HELPERS
+
+def test_parallel_build_merges_worker_spans(inputs):
+    with Tracer() as tracer:
+        briefing_pack = BriefingPack(*METADATA)
+        briefing_pack.add_frames(inputs.frames(), max_workers = 2, chunk_size = 2)
+
+    parent = os.getpid()
+    worker_spans = [span for span in tracer.spans if span.process_id != parent]
+    renders = [span for span in worker_spans if span.name.startswith("render_page ")]
+    assert {span.name for span in renders} == {"render_page TitleSlide", "render_page NewSlide", "render_page SummarySlide", "render_page TablePageSlide"}
+    assert all(span.args["shapes"] > 0 for span in renders)
+    assert "table_helpers.add_table" in {span.name for span in worker_spans}
+
+    # Worker spans are placed on the parent's clock, inside the add_frames span that waited for them
+    add_frames = next(span for span in tracer.spans if span.name == "add_frames")
+    assert all(add_frames.start <= span.start and span.start + span.duration <= add_frames.start + add_frames.duration for span in worker_spans)
+
+    events = tracer.chrome_trace()["traceEvents"]
+    assert {event["pid"] for event in events if event["name"] == "process_name"} == {span.process_id for span in tracer.spans}
+
+def test_untraced_parallel_build_sends_back_no_spans(inputs):
+    _, _, spans = _render_detached(BriefingPack(*METADATA)._render_settings(), inputs.frames()[:1])
+    assert spans == []